@@ -0,0 +1,135 @@
+"""
+Benchmark for the handling of blocks by processors.
+
+Generates Markdown documents with a configurable number of sections, each with
+paragraphs, a ::cards:: block whose content spans several blocks, and a span
+table, then measures the time spent converting them to HTML. The time per block
+should stay constant as the size of the documents grows. Results are written in
+JSON format.
+
+Each run starts with empty caches of parsed values and rendered fragments (cold),
+so that the cost of consuming blocks is measured, and the same document is then
+converted again with the caches filled by the first conversion (warm).
+
+python -m benchmarks.blocks --sections 100 --sections 1000 --output results.json
+"""
+
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import click
+import markdown
+
+from neoteroi.mkdocs.cards import CardsExtension
+from neoteroi.mkdocs.markdown.data.cache import ParseCache
+from neoteroi.mkdocs.markdown.fragments import FragmentCache
+from neoteroi.mkdocs.markdown.processors import BaseProcessor
+from neoteroi.mkdocs.spantable import SpanTableExtension
+
+SECTION = """
+## Section {index}
+
+Lorem ipsum dolor sit amet, consectetur adipiscing elit.
+
+::cards::
+
+- title: First card {index}
+  content: Lorem ipsum dolor sit amet.
+
+- title: Second card {index}
+  content: Consectetur adipiscing elit.
+
+- title: Third card {index}
+  content: Sed do eiusmod tempor.
+
+::/cards::
+
+::spantable::
+
+| Country | City   |
+| ------- | ------ |
+| Italy   | Rome   |
+| Poland  | Warsaw |
+
+::end-spantable::
+
+Ut enim ad minim veniam, quis nostrud exercitation.
+"""
+
+
+def create_document(sections: int) -> str:
+    return "\n".join(SECTION.format(index=index) for index in range(sections))
+
+
+def count_blocks(text: str) -> int:
+    return len(text.split("\n\n"))
+
+
+def convert(text: str) -> float:
+    md = markdown.Markdown(extensions=[CardsExtension(), SpanTableExtension()])
+
+    start = time.perf_counter()
+    md.convert(text)
+    return time.perf_counter() - start
+
+
+def run_size(sections: int, repeat: int) -> Dict[str, float]:
+    text = create_document(sections)
+    blocks = count_blocks(text)
+    cold_timings: List[float] = []
+    warm_timings: List[float] = []
+    parse_cache = BaseProcessor.parse_cache
+    fragment_cache = BaseProcessor.fragment_cache
+
+    try:
+        for _ in range(repeat):
+            # new caches in memory only, large enough to hold all values of a document
+            BaseProcessor.parse_cache = ParseCache(max_size=blocks)
+            BaseProcessor.fragment_cache = FragmentCache(max_size=blocks)
+
+            cold_timings.append(convert(text))
+            warm_timings.append(convert(text))
+    finally:
+        BaseProcessor.parse_cache = parse_cache
+        BaseProcessor.fragment_cache = fragment_cache
+
+    best = min(cold_timings)
+    return {
+        "sections": sections,
+        "blocks": blocks,
+        "best_seconds": best,
+        "mean_seconds": statistics.mean(cold_timings),
+        "block_us": best / blocks * 1_000_000,
+        "warm_best_seconds": min(warm_timings),
+        "warm_block_us": min(warm_timings) / blocks * 1_000_000,
+    }
+
+
+@click.command()
+@click.option(
+    "--sections",
+    "sizes",
+    multiple=True,
+    type=int,
+    help="Number of sections of the documents (default: 100, 500, 1000, 2000).",
+)
+@click.option("--repeat", default=3, show_default=True, help="Runs for each size.")
+@click.option("--output", "-o", default="", help="File to write results to.")
+def main(sizes, repeat, output):
+    """Measures the cost of converting documents with many processors' blocks."""
+    results = [
+        run_size(sections, repeat) for sections in sizes or (100, 500, 1000, 2000)
+    ]
+
+    text = json.dumps({"parameters": {"repeat": repeat}, "results": results}, indent=2)
+
+    if output:
+        Path(output).write_text(text, encoding="utf8")
+    click.echo(text)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,213 @@
+"""
+Benchmark for the contribs plugin.
+
+Builds a throwaway Git repository of configurable size (files, commits, authors,
+renames) using plain Git commands, then measures the time spent by
+ContribsPlugin.on_page_markdown for all pages, for each strategy used to read
+contributors' information. Results are written in JSON format.
+
+python -m benchmarks.contribs --files 200 --commits 1000 --output results.json
+"""
+
+import json
+import os
+import random
+import statistics
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import click
+from mkdocs.structure.files import File
+from mkdocs.structure.pages import Page
+
+from neoteroi.mkdocs.contribs import ContribsPlugin, DefaultContributionsReader
+from neoteroi.mkdocs.contribs.domain import ContributionsReader
+from neoteroi.mkdocs.contribs.git import GitContributionsReader
+from neoteroi.mkdocs.contribs.txt import TXTContributionsReader
+
+PLUGIN_CONFIG = {
+    "contributors_label": "Contributors",
+    "last_modified_label": "Last modified on",
+    "show_last_modified_time": True,
+    "show_contributors_title": False,
+    "time_format": "%Y-%m-%d %H:%M:%S",
+}
+
+
+class SyntheticRepository:
+    """
+    Creates a Git repository with synthetic history, with a docs folder.
+    """
+
+    def __init__(self, path: Path, seed: int = 0) -> None:
+        self.path = path
+        self.random = random.Random(seed)
+        self.pages: List[str] = []
+
+    def git(self, *args: str, author: str = "") -> None:
+        env = dict(os.environ)
+        if author:
+            email = author.lower().replace(" ", ".") + "@example.org"
+            env.update(
+                GIT_AUTHOR_NAME=author,
+                GIT_AUTHOR_EMAIL=email,
+                GIT_COMMITTER_NAME=author,
+                GIT_COMMITTER_EMAIL=email,
+            )
+        subprocess.check_call(
+            ["git", *args], cwd=str(self.path), env=env, stdout=subprocess.DEVNULL
+        )
+
+    def _write_page(self, page: str, revision: int) -> None:
+        file_path = self.path / "docs" / page
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(
+            f"# {page}\n\n"
+            + "Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n" * 20
+            + f"\nRevision {revision}\n",
+            encoding="utf8",
+        )
+
+    def create(self, files: int, commits: int, authors: int, renames: int) -> None:
+        names = [f"Author {i}" for i in range(authors)]
+        self.git("init", "-q")
+
+        self.pages = [f"section-{i % 10}/page-{i}.md" for i in range(files)]
+        for page in self.pages:
+            self._write_page(page, 0)
+        self.git("add", "--all")
+        self.git("commit", "-q", "-m", "Initial commit", author=names[0])
+
+        rename_at = set(self.random.sample(range(commits), min(renames, commits)))
+
+        for revision in range(1, commits + 1):
+            author = self.random.choice(names)
+            index = self.random.randrange(files)
+            page = self.pages[index]
+
+            if revision - 1 in rename_at:
+                new_page = page.replace(".md", f"-r{revision}.md")
+                self.git("mv", f"docs/{page}", f"docs/{new_page}")
+                self.pages[index] = new_page
+                page = new_page
+
+            self._write_page(page, revision)
+            self.git("add", "--all")
+            self.git("commit", "-q", "-m", f"Edit {page}", author=author)
+
+    def write_contribs_txt_files(self) -> None:
+        for page in self.pages:
+            (self.path / "docs" / page.replace(".md", ".contribs.txt")).write_text(
+                "Charlie Brown <charlie.brown@example.org> (3)\n"
+                "Last modified time: 2022-10-04 21:01:05\n",
+                encoding="utf8",
+            )
+
+
+@contextmanager
+def cwd(path: Path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def get_page(page: str) -> Page:
+    return Page(page, File(page, "docs", "site", True), {})
+
+
+def run_strategy(
+    pages: List[str], create_plugin: Callable[[], ContribsPlugin]
+) -> Dict[str, float]:
+    plugin = create_plugin()
+
+    start = time.perf_counter()
+    plugin.on_pre_build(config={})
+    setup_time = time.perf_counter() - start
+
+    timings = []
+    for page in pages:
+        start = time.perf_counter()
+        plugin.on_page_markdown("# Example\n", page=get_page(page))
+        timings.append(time.perf_counter() - start)
+
+    timings.sort()
+    return {
+        "pages": len(pages),
+        "setup_seconds": setup_time,
+        "total_seconds": setup_time + sum(timings),
+        "page_mean_ms": statistics.mean(timings) * 1000,
+        "page_p50_ms": timings[len(timings) // 2] * 1000,
+        "page_p95_ms": timings[int(len(timings) * 0.95)] * 1000,
+        "page_max_ms": timings[-1] * 1000,
+    }
+
+
+def plugin_factory(reader: Callable[[], ContributionsReader], **config):
+    def create_plugin() -> ContribsPlugin:
+        plugin = ContribsPlugin(reader_factory=reader)
+        plugin.config = dict(PLUGIN_CONFIG, **config)
+        return plugin
+
+    return create_plugin
+
+
+STRATEGIES = {
+    "git": plugin_factory(GitContributionsReader),
+    "txt": plugin_factory(TXTContributionsReader),
+    "default": plugin_factory(DefaultContributionsReader),
+    "history": plugin_factory(DefaultContributionsReader, mode="history"),
+    "blame": plugin_factory(DefaultContributionsReader, mode="blame", cache_dir=""),
+}
+
+
+@click.command()
+@click.option("--files", default=100, show_default=True, help="Number of pages.")
+@click.option("--commits", default=300, show_default=True, help="Number of commits.")
+@click.option("--authors", default=10, show_default=True, help="Number of authors.")
+@click.option("--renames", default=20, show_default=True, help="Number of renames.")
+@click.option(
+    "--strategy",
+    "strategies",
+    multiple=True,
+    type=click.Choice(list(STRATEGIES)),
+    help="Strategies to measure (default: all).",
+)
+@click.option("--seed", default=0, show_default=True, help="Random seed.")
+@click.option("--output", "-o", default="", help="File to write results to.")
+def main(files, commits, authors, renames, strategies, seed, output):
+    """Measures the cost of the contribs plugin on a synthetic repository."""
+    parameters = {
+        "files": files,
+        "commits": commits,
+        "authors": authors,
+        "renames": renames,
+        "seed": seed,
+    }
+    results = []
+
+    with tempfile.TemporaryDirectory(prefix="contribs-bench-") as temp_dir:
+        repo = SyntheticRepository(Path(temp_dir), seed)
+        repo.create(files, commits, authors, renames)
+        repo.write_contribs_txt_files()
+
+        with cwd(repo.path):
+            for name in strategies or STRATEGIES:
+                result = run_strategy(repo.pages, STRATEGIES[name])
+                results.append({"strategy": name, **result})
+
+    text = json.dumps({"parameters": parameters, "results": results}, indent=2)
+
+    if output:
+        Path(output).write_text(text, encoding="utf8")
+    click.echo(text)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -9,20 +9,61 @@ contributors list for each page, assuming that:
 
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from datetime import datetime
 from fnmatch import fnmatch
 from pathlib import Path
-from subprocess import CalledProcessError
-from typing import List
+from subprocess import CalledProcessError, TimeoutExpired
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from mkdocs.config import config_options as c
 from mkdocs.plugins import BasePlugin
-from mkdocs.structure.files import File
+from mkdocs.structure.files import File, Files
 from mkdocs.structure.pages import Page
 
+from neoteroi.mkdocs.contribs.blame import (
+    BlameCache,
+    BlameContributionsReader,
+    build_blame_index,
+)
+from neoteroi.mkdocs.contribs.cache import (
+    CachedContributionsReader,
+    ContributionsCache,
+)
 from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
-from neoteroi.mkdocs.contribs.git import GitContributionsReader
-from neoteroi.mkdocs.contribs.html import ContribsViewOptions, render_contribution_stats
+from neoteroi.mkdocs.contribs.fallback import (
+    FallbackContributionsReader,
+    TimeBudget,
+)
+from neoteroi.mkdocs.contribs.git import (
+    AsyncGitContributionsReader,
+    GitContributionsReader,
+)
+from neoteroi.mkdocs.contribs.history import (
+    HistoryCache,
+    HistoryContributionsReader,
+    HistoryIndex,
+    build_history_index,
+    read_head_commit,
+    update_history_index,
+)
+from neoteroi.mkdocs.contribs.html import (
+    ContribsViewOptions,
+    ContributionStatsRenderer,
+    render_site_overview,
+)
+from neoteroi.mkdocs.contribs.identities import IdentityResolver, Mailmap
+from neoteroi.mkdocs.contribs.manifest import ManifestContributionsReader
+from neoteroi.mkdocs.contribs.overview import (
+    OVERVIEW_TAG_RX,
+    SiteOverview,
+    build_site_overview,
+)
+from neoteroi.mkdocs.contribs.rollup import (
+    RollupContributionsReader,
+    build_path_trie,
+)
 from neoteroi.mkdocs.contribs.txt import TXTContributionsReader
 
 logger = logging.getLogger("MARKDOWN")
@@ -31,16 +72,113 @@ logger = logging.getLogger("MARKDOWN")
 class DefaultContributionsReader(ContributionsReader):
     """
     Supports both contributors obtained from Git history and from configuration files.
+
+    Counts in .contribs.txt files are numbers of commits: if the Git reader counts
+    something else (like the lines obtained by git blame), txt_counts must be
+    False, so that contributors from configuration files are listed with a count of
+    zero, instead of mixing units that cannot be converted.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        git_reader: Optional[ContributionsReader] = None,
+        txt_counts: bool = True,
+    ) -> None:
         super().__init__()
-        self._git_reader = GitContributionsReader()
+        self._git_reader = git_reader or GitContributionsReader()
         self._txt_reader = TXTContributionsReader()
+        self._txt_counts = txt_counts
+        self._git_info: Dict[Path, Tuple[List[Contributor], datetime]] = {}
+        # Git commands that timed out while prefetching, by file: they are not run
+        # again when pages are rendered
+        self._timeouts: Dict[Path, TimeoutExpired] = {}
+
+    @property
+    def git_reader(self) -> ContributionsReader:
+        return self._git_reader
+
+    def _read_git_info(
+        self, file_path: Path
+    ) -> Optional[Tuple[List[Contributor], datetime]]:
+        try:
+            return (
+                self._git_reader.get_contributors(file_path),
+                self._git_reader.get_last_modified_date(file_path),
+            )
+        except (CalledProcessError, TimeoutExpired, ValueError) as operation_error:
+            # the error is logged again when the page is rendered
+            logger.debug(
+                "Failed to read contributors for file: %s",
+                file_path,
+                exc_info=operation_error,
+            )
+            if isinstance(operation_error, TimeoutExpired):
+                self._timeouts[file_path] = operation_error
+            return None
+
+    def _check_timeout(self, file_path: Path) -> None:
+        timeout_error = self._timeouts.get(file_path)
+
+        if timeout_error is not None:
+            raise TimeoutExpired(timeout_error.cmd, timeout_error.timeout)
+
+    def prefetch(
+        self,
+        file_paths: Iterable[Path],
+        max_workers: int,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        Reads the Git information of the given files in advance, using a bounded pool
+        of threads. Git commands are bound to I/O and process creation, so running
+        them concurrently is much faster than running them for each page.
+        If the Git reader supports asyncio, a single event loop is used instead.
+        If given, is_cancelled is called before reading each file, to stop reading.
+        Files whose Git commands timed out are handled as timed out when their
+        information is requested, without running the commands again.
+        """
+        file_paths = list(file_paths)
+
+        if isinstance(self._git_reader, AsyncGitContributionsReader):
+            errors: Dict[Path, BaseException] = {}
+            self._git_info.update(
+                self._git_reader.read_many(
+                    file_paths, max_workers, is_cancelled, errors
+                )
+            )
+            self._timeouts.update(
+                (file_path, error)
+                for file_path, error in errors.items()
+                if isinstance(error, TimeoutExpired)
+            )
+            return
+
+        def read(file_path: Path) -> Optional[Tuple[List[Contributor], datetime]]:
+            if is_cancelled is not None and is_cancelled():
+                return None
+            return self._read_git_info(file_path)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for file_path, git_info in zip(file_paths, executor.map(read, file_paths)):
+                if git_info is not None:
+                    self._git_info[file_path] = git_info
+
+    def _get_git_contributors(self, file_path: Path) -> List[Contributor]:
+        try:
+            contributors, _ = self._git_info[file_path]
+        except KeyError:
+            self._check_timeout(file_path)
+            return self._git_reader.get_contributors(file_path)
+        # return copies, since contributors objects are modified by the plugin
+        return [replace(contributor) for contributor in contributors]
 
     def get_contributors(self, file_path: Path) -> List[Contributor]:
-        git_history_contributors = self._git_reader.get_contributors(file_path)
+        git_history_contributors = self._get_git_contributors(file_path)
         configured_contributors = self._txt_reader.get_contributors(file_path)
+        if not self._txt_counts:
+            configured_contributors = [
+                replace(contributor, count=0) for contributor in configured_contributors
+            ]
         return list(
             {
                 item.email: item
@@ -49,7 +187,12 @@ class DefaultContributionsReader(ContributionsReader):
         )
 
     def get_last_modified_date(self, file_path: Path) -> datetime:
-        return self._git_reader.get_last_modified_date(file_path)
+        try:
+            _, last_modified_date = self._git_info[file_path]
+        except KeyError:
+            self._check_timeout(file_path)
+            return self._git_reader.get_last_modified_date(file_path)
+        return last_modified_date
 
 
 class ContribsPlugin(BasePlugin):
@@ -63,92 +206,55 @@ class ContribsPlugin(BasePlugin):
         ("show_contributors_title", c.Type(bool, default=False)),
         ("enabled_by_env", c.Type(str, default="")),
         ("exclude", c.Type(list, default=[])),
+        ("mode", c.Choice(("default", "history", "blame"), default="default")),
+        ("cache_dir", c.Type(str, default=".cache/neoteroi-contribs")),
+        ("max_workers", c.Type(int, default=0)),
+        ("executor", c.Choice(("threads", "asyncio"), default="threads")),
+        ("manifest", c.Type(str, default="")),
+        ("serve_cache", c.Type(bool, default=True)),
+        ("section_rollup", c.Type(bool, default=False)),
+        # timeout and time_budget bound the Git commands run for each page, they
+        # do not apply to the history and blame modes
+        ("timeout", c.Type((int, float), default=0)),
+        ("time_budget", c.Type((int, float), default=0)),
+        ("overview_recent_pages", c.Type(int, default=10)),
     )
 
-    def __init__(self) -> None:
-        super().__init__()
-        self._contribs_reader = DefaultContributionsReader()
-
-    def _merge_contributor_by_email(
-        self,
-        contributors: List[Contributor],
-        contributor: Contributor,
-        contributor_info: dict,
-    ) -> bool:
+    def __init__(
+        self, reader_factory: Optional[Callable[[], ContributionsReader]] = None
+    ) -> None:
         """
-        Handles an optional "merge_with" property in the contributor info object
-        (from configuration), returning true if the given contributor (from repo
-        information) should be discarded (its commits count was merged with another
-        one).
+        Optionally, reader_factory creates the reader used at the start of each
+        build, when the configured mode and options do not require a different
+        reader (by default, a DefaultContributionsReader).
         """
-        assert contributor.email == contributor_info.get(
-            "email"
-        ), "The contributor info object must match the contributor object."
-        merge_with = contributor_info.get("merge_with")
-
-        if merge_with:
-            parent = next(
-                (item for item in contributors if item.email == merge_with),
-                None,
-            )
-            if parent:
-                parent.count += contributor.count
-                return True
-
-        return False
+        super().__init__()
+        self._reader_factory: Callable[[], ContributionsReader] = (
+            reader_factory or DefaultContributionsReader
+        )
+        self._contribs_reader = self._reader_factory()
+        self._identity_resolver: Optional[IdentityResolver] = None
+        self._renderer = ContributionStatsRenderer()
+        self._serving = False
+        self._cache = ContributionsCache()
+        self._head_commit: Optional[str] = None
+        self._history_index: Optional[HistoryIndex] = None
+        self._budget = TimeBudget()
+        self._fallback_reader: Optional[FallbackContributionsReader] = None
+        self._overview: Optional[SiteOverview] = None
+        self._pages_paths: Optional[List[Path]] = None
+
+    def _get_identity_resolver(self) -> IdentityResolver:
+        if self._identity_resolver is None:
+            # on_config was not called: resolve using the current configuration
+            return IdentityResolver(self.config.get("contributors") or [])
+        return self._identity_resolver
 
     def _get_contributors(self, page_file: File) -> List[Contributor]:
-        results = []
         contributors = self._contribs_reader.get_contributors(
             Path("docs") / page_file.src_path
         )
-        info = self.config.get("contributors")
-
-        if not info:
-            return contributors
-
-        for contributor in contributors:
-            contributor_info = next(
-                (item for item in info if item.get("email") == contributor.email), None
-            )
-
-            if contributor_info:
-                contributor.image = contributor_info.get("image")
-                contributor.key = contributor_info.get("key")
-
-                if contributor_info.get("ignore"):
-                    # ignore the contributor's information (can be useful for bots)
-                    continue
-
-                if (
-                    "name" in contributor_info
-                    and contributor_info["name"] != contributor.name
-                ):
-                    parent = next(
-                        (
-                            other
-                            for other in contributors
-                            if other.name == contributor_info["name"]
-                        ),
-                        None,
-                    )
-                    if parent:
-                        parent.count += contributor.count
-                        continue
-                    else:
-                        # use configured name
-                        contributor.name = contributor_info["name"]
-
-                # should contributor information be merged with another object?
-                if self._merge_contributor_by_email(
-                    contributors, contributor, contributor_info
-                ):
-                    # skip this item as it was merged with another one
-                    continue
-
-            results.append(contributor)
-
-        return results
+        return self._get_identity_resolver().resolve(contributors)
 
     def _get_last_commit_date(self, page_file: File) -> datetime:
         return self._contribs_reader.get_last_modified_date(
@@ -167,25 +273,76 @@ class ContribsPlugin(BasePlugin):
         return (
             markdown
             + "\n\n"
-            + render_contribution_stats(
+            + self._renderer.render(
                 contributors,
                 last_commit_date,
-                ContribsViewOptions(
-                    self.config["contributors_label"],
-                    self.config["last_modified_label"],
-                    self.config["show_last_modified_time"],
-                    self.config["show_contributors_title"],
-                    self.config["time_format"],
-                ),
+                self._get_view_options(),
+            )
+        )
+
+    def _get_view_options(self) -> ContribsViewOptions:
+        return ContribsViewOptions(
+            self.config["contributors_label"],
+            self.config["last_modified_label"],
+            self.config["show_last_modified_time"],
+            self.config["show_contributors_title"],
+            self.config["time_format"],
+        )
+
+    def _get_overview(self) -> SiteOverview:
+        if self._overview is None:
+            index = self._history_index
+            if index is None:
+                index = self._get_history_index()
+            self._overview = build_site_overview(
+                index,
+                self._pages_paths,
+                self.config.get("overview_recent_pages", 10),
             )
+        return self._overview
+
+    def _render_overview(self, page: Page) -> str:
+        overview = self._get_overview()
+        options = self._get_view_options()
+        page_folder = os.path.dirname(Path("docs") / page.file.src_path)
+
+        recent_pages = []
+
+        for file_path, date in overview.recent_pages:
+            title = Path(file_path).relative_to("docs").as_posix()
+            link = Path(os.path.relpath(file_path, page_folder)).as_posix()
+            recent_pages.append(
+                f"- [{title}]({link}) ({date.strftime(options.time_format)})"
+            )
+        return (
+            render_site_overview(
+                overview, options, self._get_identity_resolver().resolve
+            )
+            + "\n\n"
+            + "\n".join(recent_pages)
         )
 
+    def _set_overview(self, markdown: str, page: Page) -> str:
+        try:
+            overview = self._render_overview(page)
+        except (CalledProcessError, OSError, ValueError) as operation_error:
+            logger.error(
+                "Failed to display the contributions overview in page: %s",
+                page.title,
+                exc_info=operation_error,
+            )
+            overview = ""
+        return OVERVIEW_TAG_RX.sub(lambda _: overview, markdown)
+
     def _is_ignored_page(self, page: Page) -> bool:
+        return self._is_ignored_file(page.file)
+
+    def _is_ignored_file(self, page_file: File) -> bool:
         if not self.config.get("exclude"):
             return False
 
         return any(
-            fnmatch(page.file.src_path, ignored_pattern)
+            fnmatch(page_file.src_path, ignored_pattern)
             for ignored_pattern in self.config["exclude"]
         )
 
@@ -205,14 +362,241 @@ class ContribsPlugin(BasePlugin):
             return env_var.lower() in {"1", "true"}
         return True  # enabled since the user did not specify `enabled_by_env` setting
 
+    def _get_history_index(self) -> HistoryIndex:
+        """
+        Returns an index of the Git history, built with a single git log command.
+        If a cache folder is configured, the index is stored on disk and following
+        builds only read the commits added since then.
+        """
+        docs_path = Path("docs")
+        cache_dir = self.config.get("cache_dir")
+
+        if self._serving and self._history_index is not None:
+            # the index is kept in memory across rebuilds until HEAD moves
+            index = self._history_index
+        elif cache_dir:
+            index = update_history_index(docs_path, HistoryCache(Path(cache_dir)))
+        else:
+            index = build_history_index(docs_path)
+        logger.debug("Read the Git history of %s files.", len(index))
+        self._history_index = index
+        return index
+
+    def _get_history_reader(self) -> ContributionsReader:
+        """
+        Returns a ContributionsReader that reads contributors' information from an
+        index of the Git history.
+        """
+        return DefaultContributionsReader(
+            HistoryContributionsReader(self._get_history_index())
+        )
+
+    def _get_blame_reader(self) -> ContributionsReader:
+        """
+        Returns a ContributionsReader that weights contributors by the lines they
+        authored that survive in each page. Blame information is cached by path and
+        blob hash, in the cache folder if configured. Counts are lines, therefore the
+        commits counts of .contribs.txt files are ignored.
+        """
+        cache_dir = self.config.get("cache_dir")
+        index = build_blame_index(
+            Path("docs"),
+            BlameCache(Path(cache_dir)) if cache_dir else None,
+            self.config.get("max_workers") or None,
+        )
+        logger.debug("Read the blame information of %s files.", len(index))
+        return DefaultContributionsReader(
+            BlameContributionsReader(
+                index, HistoryContributionsReader(self._get_history_index())
+            ),
+            txt_counts=False,
+        )
+
+    def on_startup(self, *, command, dirty):
+        # Defining this method keeps the same instance of the plugin across the
+        # rebuilds of mkdocs serve, which enables caching information in memory.
+        self._serving = command == "serve"
+
+    def on_config(self, *args, **kwargs):
+        self._identity_resolver = IdentityResolver(
+            self.config.get("contributors") or [], Mailmap.from_file(Path(".mailmap"))
+        )
+
+    def _set_history_reader(self, mode: str) -> None:
+        try:
+            if mode == "blame":
+                self._contribs_reader = self._get_blame_reader()
+            else:
+                self._contribs_reader = self._get_history_reader()
+        except (CalledProcessError, OSError, ValueError) as operation_error:
+            logger.warning(
+                "Failed to read the Git history, falling back to reading "
+                "contributors' information for each page.",
+                exc_info=operation_error,
+            )
+
+    def _set_manifest_reader(self, manifest: str) -> bool:
+        """
+        Configures the plugin to read contributors' information from a manifest
+        exported in advance, returning false if the manifest cannot be read.
+        """
+        try:
+            self._contribs_reader = ManifestContributionsReader.from_file(
+                Path(manifest)
+            )
+        except (OSError, ValueError, RuntimeError) as read_error:
+            logger.warning(
+                "Failed to read the contributions manifest %s, falling back to "
+                "reading the Git history.",
+                manifest,
+                exc_info=read_error,
+            )
+            return False
+        return True
+
+    def on_pre_build(self, *args, **kwargs):
+        self._renderer = ContributionStatsRenderer()
+        self._budget = TimeBudget(self.config.get("time_budget") or 0)
+        self._fallback_reader = None
+        self._overview = None
+
+        if not self._is_enabled_by_env():
+            return
+
+        self._reset_build_state()
+        use_serve_cache = (
+            self._serving
+            and self.config.get("serve_cache", True)
+            and self._head_commit is not None
+        )
+
+        self._set_reader()
+
+        if self.config.get("mode") in ("history", "blame") and (
+            self.config.get("timeout") or self.config.get("time_budget")
+        ):
+            logger.info(
+                "The timeout and time_budget options of the contribs plugin are "
+                "ignored in %s mode.",
+                self.config.get("mode"),
+            )
+
+        reads_git_by_page = isinstance(
+            self._contribs_reader, DefaultContributionsReader
+        ) and isinstance(self._contribs_reader.git_reader, GitContributionsReader)
+
+        if use_serve_cache:
+            self._contribs_reader = CachedContributionsReader(
+                self._contribs_reader, self._cache, self._head_commit
+            )
+
+        if reads_git_by_page and (
+            self.config.get("timeout") or self.config.get("time_budget")
+        ):
+            self._fallback_reader = FallbackContributionsReader(
+                self._contribs_reader,
+                self._budget,
+                self._cache if use_serve_cache else None,
+            )
+            self._contribs_reader = self._fallback_reader
+
+    def _reset_build_state(self) -> None:
+        """
+        Resets the state of previous builds, since mkdocs serve keeps the same
+        instance of the plugin across rebuilds. The index of the Git history, and
+        information of pages cached by previous builds, stay valid until HEAD moves
+        (cached information also until .contribs.txt files change).
+        """
+        head_commit = read_head_commit()
+
+        if head_commit is None or head_commit != self._head_commit:
+            if self._head_commit is not None:
+                logger.debug(
+                    "HEAD moved to %s, reading the Git history again.", head_commit
+                )
+            self._history_index = None
+        self._head_commit = head_commit
+
+        # readers of previous builds hold state that is not valid anymore
+        self._contribs_reader = self._reader_factory()
+
+    def _set_reader(self) -> None:
+        manifest = self.config.get("manifest")
+        if manifest and self._set_manifest_reader(manifest):
+            return
+        mode = self.config.get("mode")
+        if mode in ("history", "blame"):
+            self._set_history_reader(mode)
+        elif self.config.get("executor") == "asyncio" or self.config.get("timeout"):
+            self._contribs_reader = DefaultContributionsReader(self._get_git_reader())
+
+    def _get_git_reader(self) -> GitContributionsReader:
+        timeout = self.config.get("timeout") or None
+
+        if self.config.get("executor") == "asyncio":
+            return AsyncGitContributionsReader(timeout)
+        return GitContributionsReader(timeout)
+
+    def on_files(self, files: Files, *args, **kwargs):
+        """
+        If max_workers is configured, reads the contributors' information of all
+        pages in advance, concurrently. This is not necessary in history and blame
+        modes.
+        If section_rollup is enabled, aggregates the information of all pages by
+        folder, for section index pages.
+        """
+        if not self._is_enabled_by_env():
+            return files
+
+        file_paths = [
+            Path("docs") / page_file.src_path
+            for page_file in files.documentation_pages()
+            if not self._is_ignored_file(page_file)
+        ]
+        self._pages_paths = file_paths
+
+        if isinstance(self._contribs_reader, RollupContributionsReader):
+            # the information of sections is always aggregated from the information
+            # of single pages, never from a previous aggregation
+            self._contribs_reader = self._contribs_reader.reader
+
+        max_workers = self.config.get("max_workers")
+
+        if (
+            max_workers
+            and self.config.get("mode") not in ("history", "blame")
+            and isinstance(
+                self._contribs_reader,
+                (
+                    DefaultContributionsReader,
+                    CachedContributionsReader,
+                    FallbackContributionsReader,
+                ),
+            )
+        ):
+            self._contribs_reader.prefetch(
+                file_paths,
+                max_workers,
+                is_cancelled=lambda: self._budget.exceeded,
+            )
+
+        if self.config.get("section_rollup"):
+            self._contribs_reader = RollupContributionsReader(
+                self._contribs_reader,
+                build_path_trie(self._contribs_reader, file_paths),
+            )
+        return files
+
     def on_page_markdown(self, markdown, *args, **kwargs):
         if not self._is_enabled_by_env():
             return
+        if OVERVIEW_TAG_RX.search(markdown):
+            markdown = self._set_overview(markdown, kwargs["page"])
         if self._is_ignored_page(kwargs["page"]):
             return markdown
         try:
             markdown = self._set_contributors(markdown, kwargs["page"])
-        except (CalledProcessError, ValueError) as operation_error:
+        except (CalledProcessError, TimeoutExpired, ValueError) as operation_error:
             logger.error(
                 "Failed to display contributors list for page: %s",
                 kwargs["page"].title,
@@ -220,3 +604,17 @@ class ContribsPlugin(BasePlugin):
             )
             pass
         return markdown
+
+    def on_post_build(self, *args, **kwargs):
+        self._renderer.log_stats()
+
+        if self._fallback_reader is not None:
+            self._fallback_reader.log_summary()
+
+        if self._serving and self.config.get("serve_cache", True):
+            logger.debug(
+                "Contributors' information cache: %s hits, %s misses, %s pages.",
+                self._cache.hits,
+                self._cache.misses,
+                len(self._cache),
+            )
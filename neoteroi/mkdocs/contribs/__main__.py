@@ -0,0 +1,91 @@
+"""
+Command line interface for the contribs plugin.
+
+python -m neoteroi.mkdocs.contribs export --output contribs.json
+"""
+
+from pathlib import Path
+
+import click
+
+from neoteroi.mkdocs.contribs import DefaultContributionsReader
+from neoteroi.mkdocs.contribs.domain import ContributionsReader
+from neoteroi.mkdocs.contribs.git import AsyncGitContributionsReader
+from neoteroi.mkdocs.contribs.history import (
+    HistoryCache,
+    HistoryContributionsReader,
+    build_history_index,
+    get_head_commit,
+    update_history_index,
+)
+from neoteroi.mkdocs.contribs.manifest import (
+    create_manifest,
+    get_pages_paths,
+    write_manifest,
+)
+
+
+@click.group()
+def cli():
+    """Tools for the neoteroi.contribs MkDocs plugin."""
+
+
+@cli.command()
+@click.option(
+    "--docs-dir",
+    default="docs",
+    show_default=True,
+    help="The folder containing the documentation pages.",
+)
+@click.option(
+    "--output",
+    "-o",
+    default="contribs.json",
+    show_default=True,
+    help="The manifest file to write (.json or .msgpack).",
+)
+@click.option(
+    "--mode",
+    type=click.Choice(["history", "default"]),
+    default="history",
+    show_default=True,
+    help="Whether to read the Git history in a single pass, or for each page.",
+)
+@click.option(
+    "--cache-dir",
+    default="",
+    help="Folder used to cache the Git history index, in history mode.",
+)
+@click.option(
+    "--max-workers",
+    default=8,
+    show_default=True,
+    help="Maximum number of concurrent Git commands, in default mode.",
+)
+def export(docs_dir: str, output: str, mode: str, cache_dir: str, max_workers: int):
+    """
+    Exports the contributors and last modified dates of all pages to a manifest,
+    which can be read by the plugin using the `manifest` option.
+    """
+    docs_path = Path(docs_dir)
+    file_paths = get_pages_paths(docs_path)
+    reader: ContributionsReader
+
+    if mode == "history":
+        if cache_dir:
+            index = update_history_index(docs_path, HistoryCache(Path(cache_dir)))
+        else:
+            index = build_history_index(docs_path)
+        reader = DefaultContributionsReader(HistoryContributionsReader(index))
+    else:
+        reader = DefaultContributionsReader(AsyncGitContributionsReader())
+        reader.prefetch(file_paths, max_workers)
+
+    manifest = create_manifest(reader, file_paths, get_head_commit())
+    write_manifest(manifest, Path(output))
+
+    click.echo(f"Exported {len(manifest['files'])} pages to {output}")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    cli()
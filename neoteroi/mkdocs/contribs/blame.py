@@ -0,0 +1,240 @@
+"""
+This module defines a ContributionsReader that weights contributors by the number of
+lines they authored that survive in the current version of each page, using:
+
+git blame --porcelain --incremental HEAD -- <file>
+
+instead of counting commits, which over-credits trivial edits.
+
+Blaming files is expensive, therefore results are stored by path and blob hash: a
+file is blamed again only when its contents change, and the cache can be stored on
+disk.
+Files that need to be blamed are processed in parallel by a pool of threads.
+"""
+
+import json
+import logging
+import os
+import re
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from mkdocs.utils import markdown_extensions
+
+from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
+from neoteroi.mkdocs.contribs.git import GitContributionsReader, decode
+
+logger = logging.getLogger("MARKDOWN")
+
+_GROUP_HEADER_RX = re.compile(r"^([0-9a-f]{40}) \d+ \d+ (\d+)$")
+
+# name, email, lines count
+BlameInfo = List[Tuple[str, str, int]]
+
+
+def _norm_path(file_path) -> str:
+    return Path(file_path).as_posix()
+
+
+def read_blame(lines: Iterable[str]) -> BlameInfo:
+    """
+    Parses the output of git blame --porcelain --incremental, returning the number
+    of lines attributed to each author, sorted by lines count.
+    """
+    authors: Dict[str, Tuple[str, str]] = {}
+    lines_by_commit: Dict[str, int] = {}
+    sha = ""
+    group_lines = 0
+
+    for line in lines:
+        match = _GROUP_HEADER_RX.match(line)
+
+        if match:
+            sha, group_lines = match.group(1), int(match.group(2))
+            continue
+
+        if line.startswith("author "):
+            name = line[7:]
+            authors[sha] = (name, authors.get(sha, ("", ""))[1])
+        elif line.startswith("author-mail "):
+            email = line[12:].strip("<>")
+            authors[sha] = (authors.get(sha, ("", ""))[0], email)
+        elif line.startswith("filename "):
+            # the last line of each group
+            lines_by_commit[sha] = lines_by_commit.get(sha, 0) + group_lines
+
+    lines_by_author: Dict[Tuple[str, str], int] = {}
+
+    for sha, count in lines_by_commit.items():
+        author = authors.get(sha, ("", ""))
+        lines_by_author[author] = lines_by_author.get(author, 0) + count
+
+    return sorted(
+        ((name, email, count) for (name, email), count in lines_by_author.items()),
+        key=lambda item: (-item[2], item[0]),
+    )
+
+
+def get_blame_command(file_path: Path, revision: str = "HEAD") -> List[str]:
+    return [
+        "git",
+        "blame",
+        "--porcelain",
+        "--incremental",
+        revision,
+        "--",
+        str(file_path),
+    ]
+
+
+def blame_file(file_path: Path, revision: str = "HEAD") -> BlameInfo:
+    result = subprocess.run(
+        get_blame_command(file_path, revision), capture_output=True, check=True
+    )
+    return read_blame(decode(result.stdout).splitlines())
+
+
+def get_blobs(docs_path: Path, revision: str = "HEAD") -> Dict[str, str]:
+    """
+    Returns the hashes of the blobs of the Markdown files in the given folder, at
+    the given revision, by path.
+    """
+    result = subprocess.run(
+        ["git", "ls-tree", "-r", "-z", revision, "--", str(docs_path)],
+        capture_output=True,
+        check=True,
+    )
+    blobs = {}
+
+    for entry in decode(result.stdout).split("\0"):
+        if not entry:
+            continue
+        info, _, file_path = entry.partition("\t")
+        _, object_type, sha = info.split()
+        if object_type == "blob" and file_path.endswith(markdown_extensions):
+            blobs[file_path] = sha
+
+    return blobs
+
+
+class BlameCache:
+    """
+    Stores the blame information of files by path and blob hash, on disk.
+    """
+
+    version = 2
+
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        self.cache_dir = cache_dir
+
+    def _get_file_path(self) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / "blame.json"
+
+    def load(self) -> Dict[Tuple[str, str], BlameInfo]:
+        if self.cache_dir is None:
+            return {}
+
+        try:
+            with open(self._get_file_path(), mode="rt", encoding="utf8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as read_error:
+            logger.warning("Failed to read the blame cache.", exc_info=read_error)
+            return {}
+
+        if data.get("version") != self.version:
+            return {}
+
+        return {
+            (path, sha): [tuple(item) for item in info]
+            for path, sha, info in data["files"]
+        }
+
+    def save(self, files: Dict[Tuple[str, str], BlameInfo]) -> None:
+        if self.cache_dir is None:
+            return
+
+        file_path = self._get_file_path()
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = file_path.with_suffix(".tmp")
+
+        with open(temp_path, mode="wt", encoding="utf8") as file:
+            json.dump(
+                {
+                    "version": self.version,
+                    "files": [[path, sha, info] for (path, sha), info in files.items()],
+                },
+                file,
+            )
+
+        os.replace(temp_path, file_path)
+
+
+def build_blame_index(
+    docs_path: Path,
+    cache: Optional[BlameCache] = None,
+    max_workers: Optional[int] = None,
+) -> Dict[str, BlameInfo]:
+    """
+    Returns the blame information of all files in the given folder, by path.
+    Only files that are not in the cache with the same blob are blamed, in
+    parallel. Blame information is cached by path and blob hash, since files with
+    the same contents can have different histories.
+    """
+    cache = cache or BlameCache()
+    keys = list(get_blobs(docs_path).items())
+    cached = cache.load()
+    missing = [key for key in keys if key not in cached]
+
+    if missing:
+        logger.debug("Blaming %s files.", len(missing))
+
+        with ThreadPoolExecutor(max_workers=max_workers or None) as executor:
+            for key, info in zip(
+                missing,
+                executor.map(lambda key: blame_file(Path(key[0])), missing),
+            ):
+                cached[key] = info
+
+    used = {key: cached[key] for key in keys}
+
+    if missing or len(used) != len(cached):
+        # entries of files and blobs that do not exist anymore are discarded
+        cache.save(used)
+
+    return {path: info for (path, _), info in used.items()}
+
+
+class BlameContributionsReader(ContributionsReader):
+    """
+    A ContributionsReader that obtains contributors from the blame information of
+    files, with the lines count of each contributor as count. Last modified dates
+    are obtained from another reader.
+    """
+
+    def __init__(
+        self,
+        index: Dict[str, BlameInfo],
+        dates_reader: Optional[ContributionsReader] = None,
+    ) -> None:
+        super().__init__()
+        self._index = index
+        self._dates_reader = dates_reader or GitContributionsReader()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get_contributors(self, file_path: Path) -> List[Contributor]:
+        return [
+            Contributor(name, email, count)
+            for name, email, count in self._index.get(_norm_path(file_path), [])
+        ]
+
+    def get_last_modified_date(self, file_path: Path) -> datetime:
+        return self._dates_reader.get_last_modified_date(file_path)
@@ -0,0 +1,166 @@
+"""
+This module defines classes to keep contributors' information of pages in memory
+across rebuilds, when the site is served with mkdocs serve.
+
+Contributors' information only changes when a new commit is checked out, or when the
+.contribs.txt file of a page changes, so results are stored by page together with
+the current commit and the modification time and size of the .contribs.txt file,
+and reused until those change. This way, the time spent by the plugin on reload does
+not scale with the size of the site.
+"""
+
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
+from neoteroi.mkdocs.contribs.txt import TXTContributionsReader
+
+
+class CacheItem:
+    __slots__ = ("state", "contributors", "last_modified_date")
+
+    def __init__(self, state: Hashable) -> None:
+        self.state = state
+        self.contributors: Optional[List[Contributor]] = None
+        self.last_modified_date: Optional[datetime] = None
+
+    def has_data(self) -> bool:
+        return self.contributors is not None or self.last_modified_date is not None
+
+    def is_complete(self) -> bool:
+        return self.contributors is not None and self.last_modified_date is not None
+
+
+class ContributionsCache:
+    """
+    Contributors' information of pages, by path.
+    """
+
+    def __init__(self) -> None:
+        self._items: Dict[Path, CacheItem] = {}
+        # the last items of pages, kept when their state changes
+        self._previous: Dict[Path, CacheItem] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, file_path: Path, state: Hashable) -> CacheItem:
+        """
+        Returns the cache item of the given page, resetting it if it was stored for
+        a different state.
+        """
+        item = self._items.get(file_path)
+
+        if item is None or item.state != state:
+            if item is not None and item.has_data():
+                self._previous[file_path] = item
+            item = self._items[file_path] = CacheItem(state)
+
+        return item
+
+    def _get_last_items(self, file_path: Path) -> Iterable[CacheItem]:
+        for items in (self._items, self._previous):
+            item = items.get(file_path)
+            if item is not None:
+                yield item
+
+    def get_last_contributors(self, file_path: Path) -> Optional[List[Contributor]]:
+        """
+        Returns the last contributors stored for the given page, even if they were
+        stored for a different state, or None. This is used when the current
+        information cannot be read in time.
+        """
+        for item in self._get_last_items(file_path):
+            if item.contributors is not None:
+                return item.contributors
+        return None
+
+    def get_last_modified_date(self, file_path: Path) -> Optional[datetime]:
+        """
+        Returns the last modified date stored for the given page, even if it was
+        stored for a different state, or None.
+        """
+        for item in self._get_last_items(file_path):
+            if item.last_modified_date is not None:
+                return item.last_modified_date
+        return None
+
+
+class CachedContributionsReader(ContributionsReader):
+    """
+    A ContributionsReader that stores the information read by another reader in a
+    cache that can be reused across builds.
+    """
+
+    def __init__(
+        self,
+        reader: ContributionsReader,
+        cache: ContributionsCache,
+        head_commit: Optional[str],
+    ) -> None:
+        super().__init__()
+        self._reader = reader
+        self._cache = cache
+        self._head_commit = head_commit
+        self._txt_reader = TXTContributionsReader()
+
+    @property
+    def reader(self) -> ContributionsReader:
+        return self._reader
+
+    def _get_item(self, file_path: Path) -> CacheItem:
+        state = (self._head_commit, self._txt_reader.get_txt_file_stat(file_path))
+        return self._cache.get(file_path, state)
+
+    @property
+    def cache(self) -> ContributionsCache:
+        return self._cache
+
+    def is_cached(self, file_path: Path) -> bool:
+        return self._get_item(file_path).is_complete()
+
+    def prefetch(
+        self,
+        file_paths: Iterable[Path],
+        max_workers: int,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        Prefetches the information of pages that are not cached, if the inner reader
+        supports prefetching.
+        """
+        prefetch = getattr(self._reader, "prefetch", None)
+
+        if prefetch is not None:
+            prefetch(
+                [
+                    file_path
+                    for file_path in file_paths
+                    if not self.is_cached(file_path)
+                ],
+                max_workers,
+                is_cancelled=is_cancelled,
+            )
+
+    def get_contributors(self, file_path: Path) -> List[Contributor]:
+        item = self._get_item(file_path)
+
+        if item.contributors is None:
+            self._cache.misses += 1
+            item.contributors = self._reader.get_contributors(file_path)
+        else:
+            self._cache.hits += 1
+
+        return [replace(contributor) for contributor in item.contributors]
+
+    def get_last_modified_date(self, file_path: Path) -> datetime:
+        item = self._get_item(file_path)
+
+        if item.last_modified_date is None:
+            item.last_modified_date = self._reader.get_last_modified_date(file_path)
+
+        return item.last_modified_date
@@ -0,0 +1,182 @@
+"""
+This module defines classes to bound the time spent by the contribs plugin reading
+contributors' information.
+
+A TimeBudget describes the time allowed to read contributors' information during a
+build: only the time spent inside the wrapped reader is counted, not the time spent
+rendering pages or by other plugins. When the budget is exhausted, or when a Git
+command times out, the FallbackContributionsReader degrades
+to the last information cached for a page (in mkdocs serve), or to the information
+described in its .contribs.txt file, and keeps track of the pages that fell back.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import replace
+from datetime import datetime
+from pathlib import Path
+from subprocess import TimeoutExpired
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from neoteroi.mkdocs.contribs.cache import ContributionsCache
+from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
+from neoteroi.mkdocs.contribs.txt import TXTContributionsReader
+
+logger = logging.getLogger("MARKDOWN")
+
+
+class TimeBudget:
+    """
+    Time allowed to read contributors' information, in seconds. Only the time
+    measured with measure() is counted; overlapping measurements (e.g. from
+    concurrent threads) count the time they overlap once. A value of 0 means no
+    limit.
+    """
+
+    def __init__(self, seconds: float = 0) -> None:
+        self.seconds = seconds
+        self._spent = 0.0
+        self._running = 0
+        self._start = 0.0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self) -> Iterator[None]:
+        """Counts the time spent in the context against the budget."""
+        with self._lock:
+            if self._running == 0:
+                self._start = time.monotonic()
+            self._running += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._running -= 1
+                if self._running == 0:
+                    self._spent += time.monotonic() - self._start
+
+    @property
+    def elapsed(self) -> float:
+        with self._lock:
+            if self._running:
+                return self._spent + time.monotonic() - self._start
+            return self._spent
+
+    @property
+    def exceeded(self) -> bool:
+        return self.seconds > 0 and self.elapsed > self.seconds
+
+
+class FallbackContributionsReader(ContributionsReader):
+    """
+    A ContributionsReader that stops using another reader when the time budget is
+    exceeded, or when reading the information of a page times out, and returns the
+    last cached information of the page, or the information described in its
+    .contribs.txt file instead.
+    """
+
+    def __init__(
+        self,
+        reader: ContributionsReader,
+        budget: TimeBudget,
+        cache: Optional[ContributionsCache] = None,
+    ) -> None:
+        super().__init__()
+        self._reader = reader
+        self._budget = budget
+        self._cache = cache
+        self._txt_reader = TXTContributionsReader()
+        # reason of the fallback, by page
+        self.fallbacks: Dict[Path, str] = {}
+
+    def _should_fall_back(self, file_path: Path) -> bool:
+        if file_path in self.fallbacks:
+            # use the same source for the contributors and the date of a page
+            return True
+
+        if self._budget.exceeded:
+            self.fallbacks[file_path] = "time budget exceeded"
+            return True
+        return False
+
+    def _on_timeout(self, file_path: Path, timeout_error: TimeoutExpired) -> None:
+        logger.debug("Git command timed out for file: %s", file_path)
+        self.fallbacks[file_path] = f"timed out after {timeout_error.timeout}s"
+
+    def _get_fallback_contributors(self, file_path: Path) -> List[Contributor]:
+        if self._cache is not None:
+            contributors = self._cache.get_last_contributors(file_path)
+
+            if contributors is not None:
+                return [replace(contributor) for contributor in contributors]
+        return self._txt_reader.get_contributors(file_path)
+
+    def _get_fallback_last_modified_date(self, file_path: Path) -> datetime:
+        if self._cache is not None:
+            last_modified_date = self._cache.get_last_modified_date(file_path)
+
+            if last_modified_date is not None:
+                return last_modified_date
+
+        try:
+            return self._txt_reader.get_last_modified_date(file_path)
+        except FileNotFoundError:
+            # no information is available: the page is handled as not committed
+            return datetime.min
+
+    def prefetch(
+        self,
+        file_paths: Iterable[Path],
+        max_workers: int,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+    ) -> None:
+        """
+        Prefetches the information of the given pages with the inner reader, if it
+        supports prefetching, until the time budget is exceeded.
+        """
+        prefetch = getattr(self._reader, "prefetch", None)
+
+        if prefetch is not None:
+            with self._budget.measure():
+                prefetch(
+                    file_paths,
+                    max_workers,
+                    is_cancelled=lambda: self._budget.exceeded
+                    or (is_cancelled is not None and is_cancelled()),
+                )
+
+    def get_contributors(self, file_path: Path) -> List[Contributor]:
+        if not self._should_fall_back(file_path):
+            try:
+                with self._budget.measure():
+                    return self._reader.get_contributors(file_path)
+            except TimeoutExpired as timeout_error:
+                self._on_timeout(file_path, timeout_error)
+        return self._get_fallback_contributors(file_path)
+
+    def get_last_modified_date(self, file_path: Path) -> datetime:
+        if not self._should_fall_back(file_path):
+            try:
+                with self._budget.measure():
+                    return self._reader.get_last_modified_date(file_path)
+            except TimeoutExpired as timeout_error:
+                self._on_timeout(file_path, timeout_error)
+        return self._get_fallback_last_modified_date(file_path)
+
+    def log_summary(self) -> None:
+        if not self.fallbacks:
+            return
+
+        logger.warning(
+            "Contributors' information of %s pages could not be read in time and "
+            "was obtained from the cache or .contribs.txt files (time spent reading: "
+            "%.1fs):\n%s",
+            len(self.fallbacks),
+            self._budget.elapsed,
+            "\n".join(
+                f"  - {file_path.as_posix()}: {reason}"
+                for file_path, reason in sorted(self.fallbacks.items())
+            ),
+        )
@@ -5,26 +5,46 @@ history rewrites or files renamed without keeping contributor's history.
 For this reason, it should be used together with a
 """
 
+import asyncio
+import logging
+import os
 import re
 import subprocess
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from dateutil.parser import ParserError
 from dateutil.parser import parse as parse_date
 
 from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
 
+logger = logging.getLogger("MARKDOWN")
+
+
+def decode(value: bytes) -> str:
+    """Decodes the output of the Git CLI, falling back to Latin-1 if necessary."""
+    try:
+        return value.decode("utf8")
+    except UnicodeDecodeError:
+        return value.decode("ISO-8859-1")
+
 
 class GitContributionsReader(ContributionsReader):
+    """
+    A ContributionsReader that runs Git commands for each file. An optional timeout
+    can be specified for each Git command: when a command times out, its process is
+    killed and subprocess.TimeoutExpired is raised.
+    """
+
     _name_email_rx = re.compile(r"(?P<name>[^\<]+)<(?P<email>[^\>]+)>")
 
+    def __init__(self, timeout: Optional[float] = None) -> None:
+        super().__init__()
+        self.timeout = timeout
+
     def _decode(self, value: bytes) -> str:
-        try:
-            return value.decode("utf8")
-        except UnicodeDecodeError:
-            return value.decode("ISO-8859-1")
+        return decode(value)
 
     def _parse_name_and_email(self, name_and_email) -> Tuple[str, str]:
         match = self._name_email_rx.search(name_and_email)
@@ -41,21 +61,45 @@ class GitContributionsReader(ContributionsReader):
             name, email = self._parse_name_and_email(name_and_email)
             yield Contributor(name, email, int(count))
 
+    def parse_last_modified_date(self, output: str) -> datetime:
+        try:
+            return parse_date(output)
+        except ParserError:
+            return datetime.min
+
+    def get_log_command(self, file_path: Path) -> List[str]:
+        return ["git", "log", "--pretty=short", "--follow", str(file_path)]
+
+    def get_shortlog_command(self) -> List[str]:
+        return ["git", "shortlog", "--summary", "--numbered", "--email"]
+
+    def get_last_commit_command(self, file_path: Path) -> List[str]:
+        return ["git", "log", "-1", "--pretty=format:%ci", str(file_path)]
+
     def get_contributors(self, file_path: Path) -> List[Contributor]:
         """
         Obtains the list of contributors for a file with the given path,
         using the Git CLI.
         """
         in_process = subprocess.Popen(
-            ["git", "log", "--pretty=short", "--follow", str(file_path)],
+            self.get_log_command(file_path),
             stdout=subprocess.PIPE,
         )
-        result = self._decode(
-            subprocess.check_output(
-                ["git", "shortlog", "--summary", "--numbered", "--email"],
-                stdin=in_process.stdout,
+        try:
+            result = self._decode(
+                subprocess.check_output(
+                    self.get_shortlog_command(),
+                    stdin=in_process.stdout,
+                    timeout=self.timeout,
+                )
             )
-        )
+        except subprocess.TimeoutExpired:
+            in_process.kill()
+            raise
+        finally:
+            assert in_process.stdout is not None
+            in_process.stdout.close()
+            in_process.wait()
 
         return list(self.parse_committers(result))
 
@@ -63,10 +107,141 @@ class GitContributionsReader(ContributionsReader):
         """Reads the last commit on a file."""
         result = self._decode(
             subprocess.check_output(
-                ["git", "log", "-1", "--pretty=format:%ci", str(file_path)]
+                self.get_last_commit_command(file_path), timeout=self.timeout
             )
         )
+        return self.parse_last_modified_date(result)
+
+
+class AsyncGitContributionsReader(GitContributionsReader):
+    """
+    A GitContributionsReader that runs the Git CLI using asyncio subprocesses, to read
+    the information of many files concurrently in a single event loop, with a
+    limited number of concurrent operations.
+
+    An optional timeout can be specified for each Git command, so that a single
+    pathological file cannot stall the build. When a command times out, its process
+    is killed and subprocess.TimeoutExpired is raised.
+    """
+
+    async def _communicate(
+        self, process: asyncio.subprocess.Process, args: Sequence[str]
+    ) -> bytes:
         try:
-            return parse_date(result)
-        except ParserError:
-            return datetime.min
+            stdout, _ = await asyncio.wait_for(process.communicate(), self.timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise subprocess.TimeoutExpired(list(args), self.timeout or 0)
+
+        if process.returncode:
+            raise subprocess.CalledProcessError(process.returncode, list(args))
+        return stdout
+
+    async def get_contributors_async(self, file_path: Path) -> List[Contributor]:
+        """
+        Obtains the list of contributors for a file with the given path, piping the
+        output of git log into git shortlog.
+        """
+        read_fd, write_fd = os.pipe()
+        try:
+            log_process = await asyncio.create_subprocess_exec(
+                *self.get_log_command(file_path), stdout=write_fd
+            )
+            shortlog_args = self.get_shortlog_command()
+            shortlog_process = await asyncio.create_subprocess_exec(
+                *shortlog_args, stdin=read_fd, stdout=asyncio.subprocess.PIPE
+            )
+        finally:
+            # the child processes own the pipe now
+            os.close(write_fd)
+            os.close(read_fd)
+
+        try:
+            output = await self._communicate(shortlog_process, shortlog_args)
+        except subprocess.TimeoutExpired:
+            if log_process.returncode is None:
+                log_process.kill()
+            raise
+        finally:
+            await log_process.wait()
+
+        return list(self.parse_committers(self._decode(output)))
+
+    async def get_last_modified_date_async(self, file_path: Path) -> datetime:
+        """Reads the last commit on a file."""
+        args = self.get_last_commit_command(file_path)
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.PIPE
+        )
+        output = await self._communicate(process, args)
+        return self.parse_last_modified_date(self._decode(output))
+
+    async def read_all(
+        self,
+        file_paths: Iterable[Path],
+        max_concurrency: int,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        errors: Optional[Dict[Path, BaseException]] = None,
+    ) -> Dict[Path, Tuple[List[Contributor], datetime]]:
+        """
+        Reads the contributors and the last modified date of all the given files,
+        running at most max_concurrency operations at the same time. Files whose
+        information could not be read are not included in the result, if given,
+        errors is updated with their exceptions. If given, is_cancelled is called
+        before reading each file, to stop reading files.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def read(
+            file_path: Path,
+        ) -> Optional[Tuple[List[Contributor], datetime]]:
+            async with semaphore:
+                if is_cancelled is not None and is_cancelled():
+                    return None
+                return (
+                    await self.get_contributors_async(file_path),
+                    await self.get_last_modified_date_async(file_path),
+                )
+
+        file_paths = list(file_paths)
+        results = await asyncio.gather(
+            *(read(file_path) for file_path in file_paths), return_exceptions=True
+        )
+        git_info = {}
+
+        for file_path, result in zip(file_paths, results):
+            if isinstance(result, BaseException):
+                logger.debug(
+                    "Failed to read contributors for file: %s",
+                    file_path,
+                    exc_info=result,
+                )
+                if errors is not None:
+                    errors[file_path] = result
+                continue
+            if result is not None:
+                git_info[file_path] = result
+
+        return git_info
+
+    def read_many(
+        self,
+        file_paths: Iterable[Path],
+        max_concurrency: int,
+        is_cancelled: Optional[Callable[[], bool]] = None,
+        errors: Optional[Dict[Path, BaseException]] = None,
+    ) -> Dict[Path, Tuple[List[Contributor], datetime]]:
+        """
+        Synchronous version of read_all, that runs all operations inside a single
+        event loop.
+        """
+        return asyncio.run(
+            self.read_all(file_paths, max_concurrency, is_cancelled, errors)
+        )
+
+    def get_contributors(self, file_path: Path) -> List[Contributor]:
+        return asyncio.run(self.get_contributors_async(file_path))
+
+    def get_last_modified_date(self, file_path: Path) -> datetime:
+        return asyncio.run(self.get_last_modified_date_async(file_path))
@@ -0,0 +1,485 @@
+"""
+This module defines a ContributionsReader that obtains contributors' information for
+all pages from a single pass over the Git history, instead of spawning Git processes
+for each page.
+
+The history is read once using:
+
+git log --name-status --format=...
+
+and stored in an in-memory index of authors' commits count and last commit date by
+file path, so that reading the information of a single page has constant cost.
+
+Renames are detected while reading the history, so that the commits made on a file
+when it had a different name are attributed to its current name, like with
+git log --follow, but without running a command for each file.
+
+The index can be stored on disk together with the commit it was computed at, so that
+the next build only needs to read the commits added since then.
+"""
+
+import json
+import logging
+import os
+import subprocess
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
+from neoteroi.mkdocs.contribs.git import decode
+
+_COMMIT_MARK = "\x1e"
+_FIELDS_SEP = "\x1f"
+_LOG_FORMAT = "--format=%x1e%H%x1f%cI%x1f%aN%x1f%aE"
+
+logger = logging.getLogger("MARKDOWN")
+
+
+def _norm_path(file_path) -> str:
+    return Path(file_path).as_posix()
+
+
+@dataclass
+class Commit:
+    sha: str
+    date: datetime
+    author_name: str
+    author_email: str
+
+
+@dataclass
+class FileHistory:
+    """
+    Describes the history of a single file: commits count by author, the date of
+    the last commit, and the hashes of commits by author, so that commits that
+    modified several files can be counted once for groups of files.
+    """
+
+    last_modified_date: datetime = datetime.min
+    authors: Dict[Tuple[str, str], int] = field(default_factory=dict)
+    commits: Dict[Tuple[str, str], Set[str]] = field(default_factory=dict)
+
+    def add_commit(self, commit: Commit) -> None:
+        """
+        Adds a commit to the history of the file. Commits are expected to be added
+        in the same order returned by git log (most recent first).
+        """
+        if self.last_modified_date == datetime.min:
+            self.last_modified_date = commit.date
+
+        key = (commit.author_name, commit.author_email)
+        self.authors[key] = self.authors.get(key, 0) + 1
+        self.commits.setdefault(key, set()).add(commit.sha)
+
+    def get_contributors(self) -> List[Contributor]:
+        """
+        Returns the list of contributors of the file, sorted like the output of
+        git shortlog --numbered.
+        """
+        return [
+            Contributor(name, email, count)
+            for (name, email), count in sorted(
+                self.authors.items(), key=lambda item: (-item[1], item[0][0])
+            )
+        ]
+
+    def merge(self, newer: "FileHistory") -> None:
+        """
+        Merges the history of the same file obtained from more recent commits into
+        this object.
+        """
+        if newer.last_modified_date != datetime.min:
+            self.last_modified_date = newer.last_modified_date
+
+        for key, count in newer.authors.items():
+            self.authors[key] = self.authors.get(key, 0) + count
+
+        for key, hashes in newer.commits.items():
+            self.commits.setdefault(key, set()).update(hashes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "last_modified_date": self.last_modified_date.isoformat(),
+            "authors": [
+                [name, email, count] for (name, email), count in self.authors.items()
+            ],
+            "commits": [
+                [name, email, sorted(hashes)]
+                for (name, email), hashes in self.commits.items()
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileHistory":
+        return cls(
+            datetime.fromisoformat(data["last_modified_date"]),
+            {(name, email): count for name, email, count in data["authors"]},
+            {(name, email): set(hashes) for name, email, hashes in data["commits"]},
+        )
+
+
+class PathAliases:
+    """
+    Resolves the names files had in the past to their current names, following the
+    renames found in the Git history. The history is read from the most recent commit
+    to the oldest, so each rename maps the old name to the current name of the file,
+    and releases the new name, which before the rename belonged to a different file,
+    if any.
+    """
+
+    def __init__(self) -> None:
+        self._aliases: Dict[str, Optional[str]] = {}
+        self._pending: List[Tuple[str, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._aliases)
+
+    def __contains__(self, file_path: str) -> bool:
+        return file_path in self._aliases
+
+    def resolve(self, file_path: str) -> Optional[str]:
+        """
+        Returns the current name of a file, given the name it had at the point of
+        the history being read, or None if the name belonged to a file whose history
+        is not followed.
+        """
+        return self._aliases.get(file_path, file_path)
+
+    def add_rename(self, old_path: str, new_path: str) -> None:
+        # renames are applied when the whole commit has been read, since a single
+        # commit can swap the names of two files
+        self._pending.append((old_path, new_path))
+
+    def end_commit(self) -> None:
+        renames = [
+            (old_path, self.resolve(new_path)) for old_path, new_path in self._pending
+        ]
+
+        for _, new_path in self._pending:
+            self._aliases[new_path] = None
+
+        for old_path, current_path in renames:
+            self._aliases[old_path] = current_path
+
+        self._pending.clear()
+
+
+class HistoryIndex:
+    """
+    An in-memory index of the Git history of files, by path. The commit property
+    describes the commit at which the index was computed, if known. The aliases
+    property describes the names files had at the oldest commit that was read.
+    """
+
+    def __init__(self, commit: Optional[str] = None) -> None:
+        self.commit = commit
+        self.aliases = PathAliases()
+        self._files: Dict[str, FileHistory] = {}
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def __contains__(self, file_path) -> bool:
+        return _norm_path(file_path) in self._files
+
+    def __iter__(self):
+        yield from self._files.items()
+
+    def get(self, file_path) -> Optional[FileHistory]:
+        return self._files.get(_norm_path(file_path))
+
+    def add_commit(self, file_path: str, commit: Commit) -> None:
+        try:
+            file_history = self._files[file_path]
+        except KeyError:
+            file_history = self._files[file_path] = FileHistory()
+        file_history.add_commit(commit)
+
+    def merge(self, newer: "HistoryIndex") -> None:
+        """
+        Merges an index obtained from more recent commits into this one. Files
+        renamed in the more recent commits are stored by their current name.
+        """
+        files: Dict[str, FileHistory] = {}
+
+        for file_path, file_history in self._files.items():
+            current_path = newer.aliases.resolve(file_path)
+
+            if current_path is None:
+                continue
+
+            if current_path in files:
+                files[current_path].merge(file_history)
+            else:
+                files[current_path] = file_history
+
+        for file_path, newer_history in newer:
+            if file_path in files:
+                files[file_path].merge(newer_history)
+            else:
+                files[file_path] = newer_history
+
+        self._files = files
+        self.commit = newer.commit
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "commit": self.commit,
+            "files": {
+                file_path: file_history.to_dict()
+                for file_path, file_history in self._files.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "HistoryIndex":
+        index = cls(data["commit"])
+        index._files = {
+            file_path: FileHistory.from_dict(item)
+            for file_path, item in data["files"].items()
+        }
+        return index
+
+
+def parse_commit(line: str) -> Commit:
+    sha, date, name, email = line.lstrip(_COMMIT_MARK).split(_FIELDS_SEP)
+    return Commit(sha, datetime.fromisoformat(date), name.strip(), email.strip())
+
+
+def read_history(lines: Iterable[str], head: Optional[str] = None) -> HistoryIndex:
+    """
+    Reads the output of git log --name-status obtained with the format used by this
+    module, returning an index of files' history. The head parameter describes the
+    commit from which the history was read.
+    """
+    index = HistoryIndex(head)
+    aliases = index.aliases
+    commit: Optional[Commit] = None
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+
+        if not line:
+            continue
+
+        if line.startswith(_COMMIT_MARK):
+            aliases.end_commit()
+            commit = parse_commit(line)
+            continue
+
+        if commit is None:
+            continue
+
+        # M\tpath, A\tpath, D\tpath, R100\told_path\tnew_path, ...
+        status, _, file_path = line.partition("\t")
+
+        if status[:1] in {"R", "C"}:
+            old_path, _, file_path = file_path.partition("\t")
+
+            if status[0] == "R":
+                aliases.add_rename(old_path, file_path)
+
+        current_path = aliases.resolve(file_path)
+
+        if current_path:
+            index.add_commit(current_path, commit)
+
+    aliases.end_commit()
+    return index
+
+
+def get_history_command(docs_path: Path, revision: str = "HEAD") -> List[str]:
+    return [
+        "git",
+        "-c",
+        "core.quotepath=off",
+        "log",
+        "-M",
+        "--name-status",
+        "--relative",
+        _LOG_FORMAT,
+        revision,
+        "--",
+        str(docs_path),
+    ]
+
+
+def get_head_commit() -> str:
+    """Returns the hash of the commit currently checked out."""
+    return decode(subprocess.check_output(["git", "rev-parse", "HEAD"])).strip()
+
+
+def read_head_commit(git_dir: Path = Path(".git")) -> Optional[str]:
+    """
+    Returns the hash of the commit currently checked out, reading the HEAD file and
+    the reference it points to without running Git, if possible. Otherwise falls
+    back to git rev-parse HEAD, returning None if it fails.
+    """
+    try:
+        head = (git_dir / "HEAD").read_text("utf8").strip()
+        if not head.startswith("ref: "):
+            return head
+        return (git_dir / head[5:]).read_text("utf8").strip()
+    except OSError:
+        # e.g. packed references, or .git is a file (worktrees, submodules)
+        pass
+
+    try:
+        # e.g. outside of a Git repository, Git would print an error at each build
+        output = subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL
+        )
+    except (subprocess.CalledProcessError, OSError):
+        return None
+    return decode(output).strip() or None
+
+
+def is_ancestor(commit: str, descendant: str) -> bool:
+    """
+    Returns a value indicating whether a commit is an ancestor of another commit.
+    Returns false also if the commit does not exist anymore (e.g. after a history
+    rewrite).
+    """
+    return (
+        subprocess.call(
+            ["git", "merge-base", "--is-ancestor", commit, descendant],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        == 0
+    )
+
+
+def build_history_index(
+    docs_path: Path, head: Optional[str] = None, since: Optional[str] = None
+) -> HistoryIndex:
+    """
+    Builds an index of files' history under the given path, streaming the output of
+    a single git log command. If a since commit is specified, only commits added
+    after it are read.
+    """
+    if head is None:
+        head = get_head_commit()
+
+    args = get_history_command(docs_path, f"{since}..{head}" if since else head)
+
+    with subprocess.Popen(args, stdout=subprocess.PIPE) as process:
+        assert process.stdout is not None
+        index = read_history((decode(line) for line in process.stdout), head)
+
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, args)
+
+    return index
+
+
+class HistoryCache:
+    """
+    Stores a history index on disk, together with the commit it was computed at.
+    """
+
+    version = 3
+
+    def __init__(self, cache_dir: Path) -> None:
+        self.cache_dir = cache_dir
+
+    def _get_file_path(self) -> Path:
+        return self.cache_dir / "history.json"
+
+    def load(self, docs_path: Path) -> Optional[HistoryIndex]:
+        """
+        Loads the history index stored on disk, returning None if it does not
+        exist or if it was stored by a different version, or for a different path.
+        """
+        try:
+            with open(self._get_file_path(), mode="rt", encoding="utf8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as read_error:
+            logger.warning(
+                "Failed to read the contributions cache.", exc_info=read_error
+            )
+            return None
+
+        if data.get("version") != self.version:
+            return None
+
+        if data.get("path") != _norm_path(docs_path):
+            return None
+
+        return HistoryIndex.from_dict(data["index"])
+
+    def save(self, docs_path: Path, index: HistoryIndex) -> None:
+        file_path = self._get_file_path()
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        temp_path = file_path.with_suffix(".tmp")
+
+        with open(temp_path, mode="wt", encoding="utf8") as file:
+            json.dump(
+                {
+                    "version": self.version,
+                    "path": _norm_path(docs_path),
+                    "index": index.to_dict(),
+                },
+                file,
+            )
+
+        os.replace(temp_path, file_path)
+
+
+def update_history_index(docs_path: Path, cache: HistoryCache) -> HistoryIndex:
+    """
+    Returns an index of files' history under the given path, reading only the commits
+    added since the index stored in cache was computed. The whole history is read
+    if there is no cache, or if the cached commit is not an ancestor of the current
+    commit (e.g. the history was rewritten).
+    """
+    head = get_head_commit()
+    index = cache.load(docs_path)
+
+    if index is not None and index.commit == head:
+        return index
+
+    if index is not None and index.commit and is_ancestor(index.commit, head):
+        logger.debug("Reading the Git history since commit %s.", index.commit)
+        index.merge(build_history_index(docs_path, head, since=index.commit))
+    else:
+        index = build_history_index(docs_path, head)
+
+    cache.save(docs_path, index)
+    return index
+
+
+class HistoryContributionsReader(ContributionsReader):
+    """
+    A ContributionsReader that obtains contributors' information from a history index
+    built in advance, for example when the build starts.
+    """
+
+    def __init__(self, index: HistoryIndex) -> None:
+        super().__init__()
+        self._index = index
+
+    @property
+    def index(self) -> HistoryIndex:
+        return self._index
+
+    def get_contributors(self, file_path: Path) -> List[Contributor]:
+        file_history = self._index.get(file_path)
+
+        if file_history is None:
+            return []
+
+        return file_history.get_contributors()
+
+    def get_last_modified_date(self, file_path: Path) -> datetime:
+        file_history = self._index.get(file_path)
+
+        if file_history is None:
+            return datetime.min
+
+        return file_history.last_modified_date
@@ -2,13 +2,17 @@
 This module contains methods to render the contributions stats.
 """
 
+import logging
 import xml.etree.ElementTree as etree
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass, replace
 from datetime import datetime
-from typing import List
+from typing import Callable, Dict, Hashable, List, Optional
 from xml.etree.ElementTree import tostring as xml_to_str
 
 from neoteroi.mkdocs.contribs.domain import Contributor
+from neoteroi.mkdocs.contribs.overview import ContributionsSummary, SiteOverview
+
+logger = logging.getLogger("MARKDOWN")
 
 
 def _get_initials(value: str) -> str:
@@ -92,3 +96,117 @@ def render_contribution_stats(
     return xml_to_str(
         contribution_stats_to_element(contributors, last_commit_date, options)
     ).decode("utf8")
+
+
+def _summary_to_element(
+    summary: ContributionsSummary,
+    options: ContribsViewOptions,
+    resolve: Optional[Callable[[List[Contributor]], List[Contributor]]],
+) -> etree.Element:
+    contributors = summary.get_contributors()
+    return contribution_stats_to_element(
+        resolve(contributors) if resolve else contributors,
+        summary.last_modified_date or datetime.min,
+        options,
+    )
+
+
+def site_overview_to_element(
+    overview: SiteOverview,
+    options: ContribsViewOptions,
+    resolve: Optional[Callable[[List[Contributor]], List[Contributor]]] = None,
+) -> etree.Element:
+    """
+    Returns an element describing the contributors of the whole site and of each
+    section, using the same structure of the contribution stats of pages.
+    """
+    options = replace(options, show_contributors_title=True)
+    element = etree.Element("div", {"class": "nt-contribs-overview"})
+
+    total_el = etree.SubElement(element, "div", {"class": "nt-contribs-total"})
+    total_el.append(_summary_to_element(overview.total, options, resolve))
+
+    for section, summary in overview.sections.items():
+        section_el = etree.SubElement(element, "div", {"class": "nt-contribs-section"})
+        title_el = etree.SubElement(
+            section_el, "p", {"class": "nt-contribs-section-title"}
+        )
+        title_el.text = f"{section or '/'} ({summary.pages_count})"
+        section_el.append(_summary_to_element(summary, options, resolve))
+
+    return element
+
+
+def render_site_overview(
+    overview: SiteOverview,
+    options: ContribsViewOptions,
+    resolve: Optional[Callable[[List[Contributor]], List[Contributor]]] = None,
+) -> str:
+    return xml_to_str(site_overview_to_element(overview, options, resolve)).decode(
+        "utf8"
+    )
+
+
+class ContributionStatsRenderer:
+    """
+    Renders contribution stats like render_contribution_stats, serializing identical
+    elements only once. On large sites, most pages in a section share the same
+    contributors and formatting options, so the same HTML is reused for them.
+    """
+
+    def __init__(self) -> None:
+        self._cache: Dict[Hashable, str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get_key(
+        self,
+        contributors: List[Contributor],
+        last_commit_date: datetime,
+        options: ContribsViewOptions,
+    ) -> Hashable:
+        return (
+            tuple(
+                (item.name, item.email, item.count, item.image, item.key)
+                for item in contributors
+            ),
+            (
+                last_commit_date.strftime(options.time_format)
+                if options.show_last_modified_time
+                else None
+            ),
+            astuple(options),
+        )
+
+    def render(
+        self,
+        contributors: List[Contributor],
+        last_commit_date: datetime,
+        options: ContribsViewOptions,
+    ) -> str:
+        key = self._get_key(contributors, last_commit_date, options)
+
+        try:
+            html = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            html = self._cache[key] = render_contribution_stats(
+                contributors, last_commit_date, options
+            )
+        else:
+            self.hits += 1
+
+        return html
+
+    def log_stats(self) -> None:
+        total = self.hits + self.misses
+
+        if total:
+            logger.debug(
+                "Rendered %s contribution stats: %s cache hits, %s misses "
+                "(%.1f%% hit rate).",
+                total,
+                self.hits,
+                self.misses,
+                100 * self.hits / total,
+            )
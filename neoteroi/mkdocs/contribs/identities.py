@@ -0,0 +1,298 @@
+"""
+This module defines classes to resolve the identities of contributors, handling
+the contributors' information configured for the plugin and the repository's .mailmap
+file.
+
+The configuration is compiled once into indexes by email and by name, and aliases
+(configured "name" and "merge_with" properties) are resolved using a union-find
+structure, so that resolving the contributors of a page requires only constant-time
+lookups for each contributor.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from neoteroi.mkdocs.contribs.domain import Contributor
+
+_MAILMAP_LINE_RX = re.compile(
+    r"^\s*(?P<name>[^<#]*?)\s*<(?P<email>[^>]*)>"
+    r"(?:\s*(?P<commit_name>[^<#]*?)\s*<(?P<commit_email>[^>]*)>)?"
+)
+
+
+class UnionFind:
+    """
+    Disjoint sets of hashable items, with path compression and union by size.
+    """
+
+    def __init__(self) -> None:
+        self._parents: Dict[Hashable, Hashable] = {}
+        self._sizes: Dict[Hashable, int] = {}
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._parents
+
+    def add(self, item: Hashable) -> None:
+        if item not in self._parents:
+            self._parents[item] = item
+            self._sizes[item] = 1
+
+    def find(self, item: Hashable) -> Hashable:
+        """
+        Returns the representative item of the set containing the given item.
+        Items that were never added are considered sets of a single item.
+        """
+        parents = self._parents
+        if item not in parents:
+            return item
+
+        root = item
+        while parents[root] != root:
+            root = parents[root]
+
+        while parents[item] != root:
+            parents[item], item = root, parents[item]
+
+        return root
+
+    def union(self, a: Hashable, b: Hashable) -> Hashable:
+        self.add(a)
+        self.add(b)
+        root_a, root_b = self.find(a), self.find(b)
+
+        if root_a == root_b:
+            return root_a
+
+        if self._sizes[root_a] < self._sizes[root_b]:
+            root_a, root_b = root_b, root_a
+
+        self._parents[root_b] = root_a
+        self._sizes[root_a] += self._sizes[root_b]
+        return root_a
+
+
+class Mailmap:
+    """
+    Maps the names and emails used in commits to canonical names and emails, like
+    described in a .mailmap file:
+
+    Proper Name <commit@email.xx>
+    <proper@email.xx> <commit@email.xx>
+    Proper Name <proper@email.xx> <commit@email.xx>
+    Proper Name <proper@email.xx> Commit Name <commit@email.xx>
+
+    Names and emails are compared case-insensitively, like Git does.
+    """
+
+    def __init__(self) -> None:
+        self._by_email: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+        self._by_name_and_email: Dict[
+            Tuple[str, str], Tuple[Optional[str], Optional[str]]
+        ] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_email) + len(self._by_name_and_email)
+
+    def add(
+        self,
+        proper_name: Optional[str],
+        proper_email: Optional[str],
+        commit_email: str,
+        commit_name: Optional[str] = None,
+    ) -> None:
+        if commit_name:
+            entries: dict = self._by_name_and_email
+            key: Hashable = (commit_name.lower(), commit_email.lower())
+        else:
+            entries = self._by_email
+            key = commit_email.lower()
+
+        name, email = entries.get(key, (None, None))
+        entries[key] = (proper_name or name, proper_email or email)
+
+    def parse(self, text: str) -> None:
+        for line in text.splitlines():
+            match = _MAILMAP_LINE_RX.match(line)
+            if not match:
+                continue
+
+            name, email, commit_name, commit_email = match.groups()
+
+            if commit_email is None:
+                # Proper Name <commit@email.xx>
+                self.add(name, None, email)
+            else:
+                self.add(name, email, commit_email, commit_name)
+
+    @classmethod
+    def from_file(cls, file_path: Path) -> "Mailmap":
+        mailmap = cls()
+        try:
+            mailmap.parse(file_path.read_text("utf8"))
+        except FileNotFoundError:
+            pass
+        return mailmap
+
+    def resolve(self, name: str, email: str) -> Tuple[str, str]:
+        """Returns the canonical name and email for the given name and email."""
+        try:
+            proper_name, proper_email = self._by_name_and_email[
+                (name.lower(), email.lower())
+            ]
+        except KeyError:
+            try:
+                proper_name, proper_email = self._by_email[email.lower()]
+            except KeyError:
+                return name, email
+
+        return proper_name or name, proper_email or email
+
+
+class IdentityResolver:
+    """
+    Resolves the contributors of a page using the contributors' information
+    configured for the plugin, which can describe for each email:
+
+    - name: the name to be displayed; contributors with the same name are merged
+    - merge_with: the email of another contributor, to merge commits count
+    - image, key: properties used to display the contributor
+    - ignore: whether the contributor should be ignored (e.g. bots)
+    """
+
+    def __init__(
+        self, contributors_info: Iterable[dict], mailmap: Optional[Mailmap] = None
+    ) -> None:
+        self._mailmap = mailmap if mailmap else None
+        self._info_by_email: Dict[str, dict] = {}
+        self._aliases = UnionFind()
+        self._merge_targets: Set[str] = set()
+        self._keys: Dict[Tuple[str, str], Tuple[Hashable, ...]] = {}
+        self._compile(contributors_info)
+
+    def _compile(self, contributors_info: Iterable[dict]) -> None:
+        for info in contributors_info:
+            email = info.get("email")
+            if not email or email in self._info_by_email:
+                continue
+
+            self._info_by_email[email] = info
+            self._aliases.add(("email", email))
+
+            if info.get("name"):
+                self._aliases.union(("email", email), ("name", info["name"]))
+
+            if info.get("merge_with"):
+                self._aliases.union(("email", email), ("email", info["merge_with"]))
+
+        # the emails that others are merged with, and that are not merged with other
+        # emails themselves, are preferred to represent a group of contributors
+        self._merge_targets = {
+            info["merge_with"]
+            for info in self._info_by_email.values()
+            if info.get("merge_with")
+            and not self._info_by_email.get(info["merge_with"], {}).get("merge_with")
+        }
+
+    def _get_keys(self, contributor: Contributor) -> Tuple[Hashable, ...]:
+        """
+        Returns the keys of the groups of aliases the given contributor belongs to,
+        by email and by name.
+        """
+        try:
+            return self._keys[(contributor.name, contributor.email)]
+        except KeyError:
+            pass
+
+        keys = tuple(
+            self._aliases.find(node)
+            for node in (("email", contributor.email), ("name", contributor.name))
+            if node in self._aliases
+        ) or (
+            ("contributor", contributor.name, contributor.email),
+        )
+
+        self._keys[(contributor.name, contributor.email)] = keys
+        return keys
+
+    def _group(self, contributors: List[Contributor]) -> List[List[Contributor]]:
+        """
+        Groups the contributors of a page that represent the same person.
+        A contributor can be linked to two groups of aliases (by email and by name),
+        in which case the two groups are merged for this page.
+        """
+        page_groups = UnionFind()
+        first_key: Dict[int, Hashable] = {}
+
+        for index, contributor in enumerate(contributors):
+            keys = self._get_keys(contributor)
+            first_key[index] = keys[0]
+            page_groups.add(keys[0])
+
+            for key in keys[1:]:
+                page_groups.union(keys[0], key)
+
+        groups: Dict[Hashable, List[Contributor]] = {}
+
+        for index, contributor in enumerate(contributors):
+            root = page_groups.find(first_key[index])
+            groups.setdefault(root, []).append(contributor)
+
+        return list(groups.values())
+
+    def _merge(self, group: List[Contributor]) -> Contributor:
+        infos = [self._info_by_email.get(item.email) or {} for item in group]
+        # contributors are merged with the contributors whose name is configured
+        # for other emails, or with the emails configured with merge_with
+        names = {item_info["name"] for item_info in infos if item_info.get("name")}
+        representative = next(
+            (item for item in group if item.name in names),
+            next(
+                (item for item in group if item.email in self._merge_targets),
+                group[0],
+            ),
+        )
+        info = self._info_by_email.get(representative.email) or {}
+
+        name = next(
+            (item_info["name"] for item_info in infos if item_info.get("name")),
+            representative.name,
+        )
+
+        return Contributor(
+            info.get("name") or name,
+            representative.email,
+            sum(item.count for item in group),
+            info.get("image"),
+            info.get("key"),
+        )
+
+    def resolve(self, contributors: List[Contributor]) -> List[Contributor]:
+        """
+        Returns the list of contributors to be displayed, applying the .mailmap and
+        the configured contributors' information. The given objects are not modified.
+        """
+        if not self._info_by_email and not self._mailmap:
+            return contributors
+
+        if self._mailmap:
+            contributors = [
+                Contributor(
+                    *self._mailmap.resolve(item.name, item.email),
+                    item.count,
+                    item.image,
+                    item.key,
+                )
+                for item in contributors
+            ]
+
+        if not self._info_by_email:
+            return contributors
+
+        contributors = [
+            item
+            for item in contributors
+            if not self._info_by_email.get(item.email, {}).get("ignore")
+        ]
+
+        return [self._merge(group) for group in self._group(contributors)]
@@ -0,0 +1,151 @@
+"""
+This module defines functions to export contributors' information of all pages to a
+manifest file, and a ContributionsReader that reads information from such file.
+
+This is useful when the same documentation is built by several jobs: one job pays
+the cost of reading the Git history and exports a manifest, the other jobs read the
+manifest (this works also in shallow clones).
+
+The manifest is written in JSON format, or in MessagePack format if the file name
+ends with .msgpack (this requires the msgpack package).
+"""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from mkdocs.utils import markdown_extensions
+
+from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+MANIFEST_VERSION = 1
+
+
+def _is_msgpack(file_path: Path) -> bool:
+    return Path(file_path).suffix.lower() == ".msgpack"
+
+
+def _ensure_msgpack() -> None:
+    if msgpack is None:
+        raise RuntimeError(
+            "The msgpack package is required to handle .msgpack manifest files. "
+            "Install it with: pip install msgpack"
+        )
+
+
+def get_pages_paths(docs_path: Path) -> List[Path]:
+    """
+    Returns the paths of the Markdown pages in the given folder, recursively.
+    """
+    return sorted(
+        Path(root) / file_name
+        for root, _, files in os.walk(docs_path)
+        for file_name in files
+        if file_name.endswith(markdown_extensions)
+    )
+
+
+def create_manifest(
+    reader: ContributionsReader,
+    file_paths: Iterable[Path],
+    commit: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Creates a manifest of contributors and last modified dates of the given files,
+    using the given ContributionsReader.
+    """
+    files = {}
+
+    for file_path in file_paths:
+        last_modified_date = reader.get_last_modified_date(file_path)
+
+        if last_modified_date.replace(tzinfo=None) == datetime.min:
+            # never committed
+            continue
+
+        files[Path(file_path).as_posix()] = {
+            "last_modified_date": last_modified_date.isoformat(),
+            "contributors": [
+                [item.name, item.email, item.count]
+                for item in reader.get_contributors(file_path)
+            ],
+        }
+
+    return {"version": MANIFEST_VERSION, "commit": commit, "files": files}
+
+
+def write_manifest(manifest: Dict[str, Any], file_path: Path) -> None:
+    file_path = Path(file_path)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if _is_msgpack(file_path):
+        _ensure_msgpack()
+        file_path.write_bytes(msgpack.packb(manifest))
+        return
+
+    with open(file_path, mode="wt", encoding="utf8") as file:
+        json.dump(manifest, file, separators=(",", ":"), ensure_ascii=False)
+
+
+def read_manifest(file_path: Path) -> Dict[str, Any]:
+    file_path = Path(file_path)
+
+    if _is_msgpack(file_path):
+        _ensure_msgpack()
+        manifest = msgpack.unpackb(file_path.read_bytes())
+    else:
+        with open(file_path, mode="rt", encoding="utf8") as file:
+            manifest = json.load(file)
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        raise ValueError(
+            f"Unsupported contributions manifest version: {manifest.get('version')}"
+        )
+    return manifest
+
+
+class ManifestContributionsReader(ContributionsReader):
+    """
+    A ContributionsReader that reads contributors' information from a manifest
+    exported in advance.
+    """
+
+    def __init__(self, manifest: Dict[str, Any]) -> None:
+        super().__init__()
+        self.commit: Optional[str] = manifest.get("commit")
+        self._files: Dict[str, Tuple[datetime, List[Tuple[str, str, int]]]] = {
+            file_path: (
+                datetime.fromisoformat(item["last_modified_date"]),
+                [tuple(contributor) for contributor in item["contributors"]],
+            )
+            for file_path, item in manifest["files"].items()
+        }
+
+    @classmethod
+    def from_file(cls, file_path: Path) -> "ManifestContributionsReader":
+        return cls(read_manifest(file_path))
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def get_contributors(self, file_path: Path) -> List[Contributor]:
+        try:
+            _, contributors = self._files[Path(file_path).as_posix()]
+        except KeyError:
+            return []
+        return [Contributor(name, email, count) for name, email, count in contributors]
+
+    def get_last_modified_date(self, file_path: Path) -> datetime:
+        try:
+            last_modified_date, _ = self._files[Path(file_path).as_posix()]
+        except KeyError:
+            return datetime.min
+        return last_modified_date
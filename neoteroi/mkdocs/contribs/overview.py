@@ -0,0 +1,116 @@
+"""
+This module defines functions to compute a site-wide overview of contributions:
+contributors of the whole site, contributors of each section, and the pages that
+were modified most recently.
+
+The overview is computed with a single pass over the index of the Git history,
+without reading again the information of each page.
+"""
+
+import heapq
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from neoteroi.mkdocs.contribs.domain import Contributor
+from neoteroi.mkdocs.contribs.history import HistoryIndex
+
+# the tag that is replaced with the site-wide overview, in Markdown pages
+OVERVIEW_TAG_RX = re.compile(r"^::contribs-overview::[ \t]*$", re.MULTILINE)
+
+
+@dataclass
+class ContributionsSummary:
+    """
+    Describes the contributions to a group of pages. Commits are counted by hash,
+    so that a commit that modified several pages of the group is counted once.
+    """
+
+    commits: Dict[Tuple[str, str], Set[str]] = field(default_factory=dict)
+    last_modified_date: Optional[datetime] = None
+    pages_count: int = 0
+
+    def add(self, commits: Dict[Tuple[str, str], Set[str]], date: datetime) -> None:
+        for key, hashes in commits.items():
+            self.commits.setdefault(key, set()).update(hashes)
+
+        if self.last_modified_date is None or date > self.last_modified_date:
+            self.last_modified_date = date
+        self.pages_count += 1
+
+    def get_contributors(self) -> List[Contributor]:
+        return [
+            Contributor(name, email, len(hashes))
+            for (name, email), hashes in sorted(
+                self.commits.items(), key=lambda item: (-len(item[1]), item[0][0])
+            )
+        ]
+
+
+@dataclass
+class SiteOverview:
+    """
+    Describes the contributions to the whole site, by section, and the pages that
+    were modified most recently (path and date).
+    """
+
+    total: ContributionsSummary
+    sections: Dict[str, ContributionsSummary]
+    recent_pages: List[Tuple[str, datetime]]
+
+
+def get_section(file_path: str) -> str:
+    """
+    Returns the name of the top level folder of a page in the docs folder, or an
+    empty string for pages in the root of the docs folder.
+    """
+    parts = file_path.split("/")
+    return parts[1] if len(parts) > 2 else ""
+
+
+def build_site_overview(
+    index: HistoryIndex,
+    file_paths: Optional[Iterable[Path]] = None,
+    recent_pages_count: int = 10,
+) -> SiteOverview:
+    """
+    Computes an overview of the contributions to the files in the given history
+    index, in a single pass. If file_paths is specified, only those files are
+    included (e.g. to exclude files that were deleted or that are not pages).
+    """
+    included = (
+        {Path(file_path).as_posix() for file_path in file_paths}
+        if file_paths is not None
+        else None
+    )
+    total = ContributionsSummary()
+    sections: Dict[str, ContributionsSummary] = {}
+    dates: List[Tuple[datetime, str]] = []
+
+    for file_path, file_history in index:
+        if included is not None and file_path not in included:
+            continue
+
+        if file_history.last_modified_date.replace(tzinfo=None) == datetime.min:
+            continue
+
+        date = file_history.last_modified_date
+        total.add(file_history.commits, date)
+
+        section = get_section(file_path)
+        if section not in sections:
+            sections[section] = ContributionsSummary()
+        sections[section].add(file_history.commits, date)
+
+        dates.append((date, file_path))
+
+    return SiteOverview(
+        total,
+        dict(sorted(sections.items())),
+        [
+            (file_path, date)
+            for date, file_path in heapq.nlargest(recent_pages_count, dates)
+        ],
+    )
@@ -0,0 +1,196 @@
+"""
+This module defines classes to display on section index pages the contributors of
+all pages in the section, and the date of the latest modification.
+
+Contributors' information of all pages is read once per build and stored in a trie
+of paths, then summed bottom-up in a single pass, so that the information of any
+section can be obtained with a single lookup, instead of reading again the
+information of all pages it contains.
+"""
+
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from subprocess import CalledProcessError
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
+
+logger = logging.getLogger("MARKDOWN")
+
+# the names of Markdown files that MkDocs uses as index pages of sections
+INDEX_PAGES_NAMES = {"index", "README"}
+
+
+def _get_parts(file_path) -> Tuple[str, ...]:
+    return Path(file_path).parts
+
+
+def _is_newer(value: datetime, other: Optional[datetime]) -> bool:
+    if other is None:
+        return True
+    if (value.tzinfo is None) != (other.tzinfo is None):
+        # compare naive dates (e.g. from .contribs.txt files) as UTC
+        value = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        other = other if other.tzinfo else other.replace(tzinfo=timezone.utc)
+    return value > other
+
+
+def is_index_page(file_path: Path) -> bool:
+    return Path(file_path).stem in INDEX_PAGES_NAMES
+
+
+class PathTrieNode:
+    __slots__ = ("children", "contributors", "last_modified_date")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "PathTrieNode"] = {}
+        # contributors by email
+        self.contributors: Dict[str, Contributor] = {}
+        self.last_modified_date: Optional[datetime] = None
+
+    def add(self, contributors: Iterable[Contributor], date: datetime) -> None:
+        for contributor in contributors:
+            try:
+                item = self.contributors[contributor.email]
+            except KeyError:
+                self.contributors[contributor.email] = Contributor(
+                    contributor.name,
+                    contributor.email,
+                    max(contributor.count, 0),
+                    contributor.image,
+                    contributor.key,
+                )
+            else:
+                item.count += max(contributor.count, 0)
+
+        if _is_newer(date, self.last_modified_date):
+            self.last_modified_date = date
+
+    def get_contributors(self) -> List[Contributor]:
+        return [
+            Contributor(item.name, item.email, item.count, item.image, item.key)
+            for item in sorted(
+                self.contributors.values(), key=lambda item: (-item.count, item.name)
+            )
+        ]
+
+
+class PathTrie:
+    """
+    A trie of paths, storing contributors' information of files in leaves. Once all
+    files are added, aggregate() sums the information of each folder.
+    """
+
+    def __init__(self) -> None:
+        self.root = PathTrieNode()
+
+    def add(
+        self,
+        file_path: Path,
+        contributors: Iterable[Contributor],
+        last_modified_date: datetime,
+    ) -> None:
+        node = self.root
+        for part in _get_parts(file_path):
+            node = node.children.setdefault(part, PathTrieNode())
+        node.add(contributors, last_modified_date)
+
+    def get(self, path: Path) -> Optional[PathTrieNode]:
+        node: Optional[PathTrieNode] = self.root
+        for part in _get_parts(path):
+            if node is None:
+                return None
+            node = node.children.get(part)
+        return node
+
+    def aggregate(self) -> None:
+        """
+        Sums the information of all nodes bottom-up, visiting each node once.
+        """
+        # iterative post-order visit, to support deep folders structures
+        stack = [(self.root, False)]
+
+        while stack:
+            node, visited = stack.pop()
+
+            if not node.children:
+                continue
+
+            if not visited:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children.values())
+                continue
+
+            for child in node.children.values():
+                if child.last_modified_date is not None:
+                    node.add(child.contributors.values(), child.last_modified_date)
+
+
+def build_path_trie(
+    reader: ContributionsReader, file_paths: Iterable[Path]
+) -> PathTrie:
+    """
+    Reads the contributors' information of the given files with the given reader,
+    and returns a trie with the information aggregated by folder. Files that were
+    never committed are ignored.
+    """
+    trie = PathTrie()
+
+    for file_path in file_paths:
+        try:
+            last_modified_date = reader.get_last_modified_date(file_path)
+
+            if last_modified_date.replace(tzinfo=None) == datetime.min:
+                continue
+
+            contributors = reader.get_contributors(file_path)
+        except (CalledProcessError, ValueError) as operation_error:
+            logger.debug(
+                "Failed to read contributors for file: %s",
+                file_path,
+                exc_info=operation_error,
+            )
+            continue
+
+        trie.add(file_path, contributors, last_modified_date)
+
+    trie.aggregate()
+    return trie
+
+
+class RollupContributionsReader(ContributionsReader):
+    """
+    A ContributionsReader that returns, for section index pages, the contributors
+    of all pages in the section, and the date of the latest modification. The
+    information of other pages is returned as is.
+    """
+
+    def __init__(self, reader: ContributionsReader, trie: PathTrie) -> None:
+        super().__init__()
+        self._reader = reader
+        self._trie = trie
+
+    @property
+    def reader(self) -> ContributionsReader:
+        """Returns the reader of the information of single pages."""
+        return self._reader
+
+    def _get_node(self, file_path: Path) -> Optional[PathTrieNode]:
+        if is_index_page(file_path):
+            return self._trie.get(Path(file_path).parent)
+        return self._trie.get(file_path)
+
+    def get_contributors(self, file_path: Path) -> List[Contributor]:
+        node = self._get_node(file_path)
+
+        if node is None:
+            return self._reader.get_contributors(file_path)
+        return node.get_contributors()
+
+    def get_last_modified_date(self, file_path: Path) -> datetime:
+        node = self._get_node(file_path)
+
+        if node is None or node.last_modified_date is None:
+            return self._reader.get_last_modified_date(file_path)
+        return node.last_modified_date
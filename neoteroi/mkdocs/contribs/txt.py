@@ -1,25 +1,47 @@
 import os
 import re
+from dataclasses import dataclass, replace
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from dateutil.parser import parse
 
 from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
 
+_COMMENT_RX = re.compile("#.+$")
+_TXT_SUFFIX = ".contribs.txt"
 
-def _read_lines_strip_comments(file_path: Path):
-    with open(str(file_path), mode="rt", encoding="utf8") as file:
-        lines = file.readlines()
-    lines = (re.sub("#.+$", "", x).strip() for x in lines)
+
+def _strip_comments(lines: Iterable[str]) -> List[str]:
+    lines = (_COMMENT_RX.sub("", x).strip() for x in lines)
     return [line for line in lines if line]
 
 
+@dataclass
+class ContribsFile:
+    """
+    Describes the parsed contents of a .contribs.txt file.
+    """
+
+    contributors: List[Contributor]
+    last_modified_time: Optional[str] = None
+
+
+# Parsed .contribs.txt files by absolute path, with the modification time and the
+# size of the file when it was parsed. This cache is shared by all instances of
+# TXTContributionsReader, so that files are not parsed again when the site is
+# rebuilt by mkdocs serve, unless they change.
+_parsed_files: Dict[str, Tuple[Tuple[int, int], ContribsFile]] = {}
+
+
 class TXTContributionsReader(ContributionsReader):
     """
     A ContributionsReader that can read contributors information described in .txt
     files.
+
+    The presence of .contribs.txt files is checked scanning each folder once, and
+    parsed files are cached until their modification time or size changes.
     """
 
     _contrib_rx = re.compile(
@@ -30,6 +52,10 @@ class TXTContributionsReader(ContributionsReader):
         r"^\s*Last\smodified\stime:\s(?P<value>.+)$", re.IGNORECASE | re.MULTILINE
     )
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._folders: Dict[str, Dict[str, Tuple[int, int]]] = {}
+
     def _parse_value(self, value: str) -> Tuple[str, str, int]:
         match = self._contrib_rx.search(value)
         if match:
@@ -43,13 +69,72 @@ class TXTContributionsReader(ContributionsReader):
 
     def _get_txt_file_path(self, file_path: Path) -> Path:
         path_without_extension = os.path.splitext(file_path)[0]
-        return Path(path_without_extension + ".contribs.txt")
+        return Path(path_without_extension + _TXT_SUFFIX)
 
-    def _get_contributors_from_txt_file(self, file_path: Path) -> Iterable[Contributor]:
-        for line in _read_lines_strip_comments(file_path):
+    def _scan_folder(self, folder: str) -> Dict[str, Tuple[int, int]]:
+        """
+        Returns the modification time and size of the .contribs.txt files in the
+        given folder, by name, scanning the folder only once.
+        """
+        try:
+            return self._folders[folder]
+        except KeyError:
+            pass
+
+        files = {}
+        try:
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.name.endswith(_TXT_SUFFIX) and entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+
+        self._folders[folder] = files
+        return files
+
+    def _parse_txt_file(self, txt_path: Path) -> ContribsFile:
+        text = txt_path.read_text("utf8")
+        contributors = []
+
+        for line in _strip_comments(text.splitlines()):
             name, email, count = self._parse_value(line)
             if name and email:
-                yield Contributor(name, email, count)
+                contributors.append(Contributor(name, email, count))
+
+        match = self._last_mod_time_rx.search(text)
+        return ContribsFile(contributors, match.groups()[0] if match else None)
+
+    def get_txt_file_stat(self, file_path: Path) -> Optional[Tuple[int, int]]:
+        """
+        Returns the modification time and size of the .contribs.txt file of the
+        given page, or None if it does not exist.
+        """
+        txt_path = self._get_txt_file_path(file_path)
+        folder, name = os.path.split(os.path.abspath(txt_path))
+        return self._scan_folder(folder).get(name)
+
+    def _get_txt_file(self, file_path: Path) -> Optional[ContribsFile]:
+        stat = self.get_txt_file_stat(file_path)
+
+        if stat is None:
+            return None
+
+        txt_path = self._get_txt_file_path(file_path)
+        key = os.path.abspath(txt_path)
+
+        try:
+            cached_stat, txt_file = _parsed_files[key]
+        except KeyError:
+            pass
+        else:
+            if cached_stat == stat:
+                return txt_file
+
+        txt_file = self._parse_txt_file(txt_path)
+        _parsed_files[key] = (stat, txt_file)
+        return txt_file
 
     def get_contributors(self, file_path: Path) -> List[Contributor]:
         """
@@ -65,23 +150,22 @@ class TXTContributionsReader(ContributionsReader):
         and supporting comments using hashes:
         # Example comment
         """
-        txt_path = self._get_txt_file_path(file_path)
+        txt_file = self._get_txt_file(file_path)
 
-        if not txt_path.exists():
+        if txt_file is None:
             return []
 
-        return list(self._get_contributors_from_txt_file(txt_path))
+        # return copies, since cached objects are shared
+        return [replace(contributor) for contributor in txt_file.contributors]
 
     def get_last_modified_date(self, file_path: Path) -> datetime:
         """Reads the last commit date of a file."""
-        txt_path = self._get_txt_file_path(file_path)
+        txt_file = self._get_txt_file(file_path)
 
-        if not txt_path.exists():
+        if txt_file is None:
             raise FileNotFoundError()
 
-        match = self._last_mod_time_rx.search(txt_path.read_text("utf8"))
-
-        if match:
-            return parse(match.groups()[0])
+        if txt_file.last_modified_time:
+            return parse(txt_file.last_modified_time)
 
         return datetime.min
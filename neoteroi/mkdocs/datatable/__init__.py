@@ -0,0 +1,113 @@
+"""
+This module provides an extension for a component to display large tabular datasets,
+like CSV files or lists of objects, in paginated tables.
+
+neoteroi.datatable
+
+MIT License
+Copyright (c) 2022 to present, Roberto Prevato
+"""
+
+from markdown import Extension
+
+from neoteroi.mkdocs.markdown.processors import (
+    EmbeddedBlockProcessor,
+    SourceBlockProcessor,
+)
+from neoteroi.mkdocs.markdown.tables import table_from_items
+from neoteroi.mkdocs.markdown.utils import create_instance
+
+from .html import DataTableHTMLBuilder, DataTableViewOptions
+
+
+class BaseDataTableProcessor:
+    @property
+    def name(self) -> str:
+        return "datatable"
+
+    def _norm_props(self, props):
+        if self.root_config:
+            new_props = dict(**self.root_config)
+            new_props.update(props)
+            props = new_props
+
+        if "class" in props:
+            props["class_name"] = props["class"]
+        return props
+
+    def render(self, parent, data, props):
+        props = self._norm_props(props)
+
+        try:
+            options = create_instance(DataTableViewOptions, props)
+        except ValueError as value_error:
+            self.render_courtesy_error(parent, str(value_error))
+            return
+
+        if "limit" not in props:
+            # read only the rows that can be displayed, and one more to know if
+            # the source contains more rows
+            props["limit"] = str(options.max_rows + 1)
+
+        super().render(parent, data, props)
+
+    def build_html(self, parent, obj, props) -> None:
+        """Builds the HTML for the given input object."""
+        if not isinstance(obj, list):
+            raise TypeError("Expected a list of items describing table rows.")
+
+        builder = DataTableHTMLBuilder(create_instance(DataTableViewOptions, props))
+        builder.build_html(parent, table_from_items(obj))
+
+
+class DataTableEmbeddedProcessor(BaseDataTableProcessor, EmbeddedBlockProcessor):
+    """
+    Block processor that can render a data table using data embedded in the
+    Markdown.
+    """
+
+
+class DataTableSourceProcessor(BaseDataTableProcessor, SourceBlockProcessor):
+    """
+    Block processor that can render a data table using data from a source outside
+    of the Markdown (e.g. file, URL, database).
+    """
+
+
+class DataTableExtension(Extension):
+    """Extension that includes data tables."""
+
+    def __init__(self, *args, **kwargs):
+        self.config = {
+            "priority": [12, "The priority to be configured for the extension."],
+            "page_size": [50, "The default number of rows of each page."],
+            "max_pages": [20, "The default maximum number of pages rendered."],
+            "pagination": [
+                "server",
+                'How pages are rendered: "server" or "client" (JSON data island).',
+            ],
+        }
+        super().__init__(*args, **kwargs)
+
+    def extendMarkdown(self, md):
+        md.registerExtension(self)
+        priority = self.getConfig("priority")
+
+        configs = self.getConfigs()
+        del configs["priority"]
+
+        md.parser.blockprocessors.register(
+            DataTableEmbeddedProcessor(md.parser).with_root_config(configs),
+            "datatable",
+            priority + 0.1,
+        )
+
+        md.parser.blockprocessors.register(
+            DataTableSourceProcessor(md.parser).with_root_config(configs),
+            "datatable-from-source",
+            priority,
+        )
+
+
+def make_extension(*args, **kwargs):
+    return DataTableExtension(*args, **kwargs)
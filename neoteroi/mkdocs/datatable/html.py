@@ -0,0 +1,206 @@
+import json
+import xml.etree.ElementTree as etree
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+from markdown.util import AtomicString
+
+from neoteroi.mkdocs.markdown.tables import Table
+
+PAGINATION_MODES = ("server", "client")
+
+# Script that handles the pager of a table. Pages are either <tbody> elements
+# rendered at build time (server pagination), or rows read from a JSON data island
+# (client pagination), in which case only the first page is rendered at build time.
+PAGER_SCRIPT = """(function () {
+  var root = document.currentScript.parentElement;
+  var pagesCount = parseInt(root.dataset.pages, 10);
+  var pageSize = parseInt(root.dataset.pageSize, 10);
+  var island = root.querySelector("script.nt-datatable-data");
+  var rows = island ? JSON.parse(island.textContent) : null;
+  var bodies = root.querySelectorAll("tbody");
+  var firstPage = bodies[0].innerHTML;
+  var info = root.querySelector(".nt-datatable-page-info");
+  var current = 0;
+
+  function show(index) {
+    current = Math.max(0, Math.min(index, pagesCount - 1));
+    if (rows === null) {
+      for (var i = 0; i < bodies.length; i++) {
+        bodies[i].hidden = i !== current;
+      }
+    } else if (current === 0) {
+      bodies[0].innerHTML = firstPage;
+    } else {
+      bodies[0].innerHTML = "";
+      rows.slice((current - 1) * pageSize, current * pageSize).forEach(function (row) {
+        var tr = bodies[0].insertRow();
+        row.forEach(function (value) {
+          tr.insertCell().textContent = value;
+        });
+      });
+    }
+    info.textContent = current + 1 + " / " + pagesCount;
+  }
+
+  root.querySelector(".nt-datatable-prev").onclick = function () {
+    show(current - 1);
+  };
+  root.querySelector(".nt-datatable-next").onclick = function () {
+    show(current + 1);
+  };
+})();"""
+
+
+@dataclass
+class DataTableViewOptions:
+    id: str = ""
+    class_name: str = ""
+    caption: str = ""
+    page_size: int = 50
+    max_pages: int = 20
+    pagination: str = "server"
+
+    def __post_init__(self):
+        if isinstance(self.page_size, str):
+            self.page_size = int(self.page_size)
+        if isinstance(self.max_pages, str):
+            self.max_pages = int(self.max_pages)
+
+        if self.page_size < 1 or self.max_pages < 1:
+            raise ValueError("The page size and the max pages must be positive.")
+
+        if self.pagination not in PAGINATION_MODES:
+            raise ValueError(
+                f"Invalid pagination: {self.pagination}, "
+                f"expected one of: {', '.join(PAGINATION_MODES)}."
+            )
+
+    @property
+    def max_rows(self) -> int:
+        return self.page_size * self.max_pages
+
+
+class DataTableHTMLBuilder:
+    def __init__(self, options: DataTableViewOptions) -> None:
+        self.options = options
+
+    def _get_root_props(self, pages_count: int) -> Dict[str, str]:
+        props = {"class": "nt-datatable"}
+
+        if self.options.class_name:
+            props["class"] = f"nt-datatable {self.options.class_name}"
+        if self.options.id:
+            props["id"] = self.options.id
+
+        props["data-page-size"] = str(self.options.page_size)
+        props["data-pages"] = str(pages_count)
+        return props
+
+    def _get_pages(self, records: Sequence[Sequence[str]]) -> List[Sequence]:
+        page_size = self.options.page_size
+        return [
+            records[index : index + page_size]
+            for index in range(0, len(records), page_size)
+        ] or [records]
+
+    def build_html(self, parent, table: Table):
+        """
+        Builds the HTML of the given table, rendering at most max_rows rows. With
+        server pagination, rows are rendered in a <tbody> element for each page;
+        with client pagination, only the first page is rendered and the other rows
+        are stored in a JSON data island.
+        """
+        records = table.records[: self.options.max_rows]
+        pages = self._get_pages(records)
+
+        root_element = etree.SubElement(parent, "div", self._get_root_props(len(pages)))
+        table_element = etree.SubElement(
+            root_element, "table", {"class": "nt-datatable-table"}
+        )
+
+        if self.options.caption:
+            caption = etree.SubElement(table_element, "caption")
+            caption.text = self.options.caption
+
+        self.build_headers_html(table_element, table.headers)
+
+        if self.options.pagination == "server":
+            for index, page in enumerate(pages):
+                self.build_page_html(table_element, page, index)
+        else:
+            self.build_page_html(table_element, pages[0], 0)
+
+            if len(pages) > 1:
+                self.build_data_island_html(root_element, records[len(pages[0]) :])
+
+        if len(pages) > 1:
+            self.build_pager_html(root_element, len(pages))
+
+        if len(table.records) > len(records):
+            note = etree.SubElement(root_element, "p", {"class": "nt-datatable-note"})
+            note.text = f"Only the first {len(records)} rows are displayed."
+
+    def build_headers_html(self, parent, headers: Sequence[str]):
+        thead = etree.SubElement(parent, "thead")
+        tr = etree.SubElement(thead, "tr")
+
+        for header in headers:
+            th = etree.SubElement(tr, "th")
+            th.text = AtomicString(header)
+
+    def build_page_html(self, parent, records: Sequence[Sequence[str]], index: int):
+        props = {"class": "nt-datatable-page", "data-page": str(index + 1)}
+        if index > 0:
+            props["hidden"] = "hidden"
+
+        tbody = etree.SubElement(parent, "tbody", props)
+
+        for record in records:
+            tr = etree.SubElement(tbody, "tr")
+
+            for value in record:
+                td = etree.SubElement(tr, "td")
+                # data is displayed as is, like in pages rendered by the pager
+                td.text = AtomicString(value)
+
+    def build_data_island_html(self, parent, records: Sequence[Sequence[str]]):
+        script = etree.SubElement(
+            parent,
+            "script",
+            {"type": "application/json", "class": "nt-datatable-data"},
+        )
+        data = json.dumps(
+            [list(record) for record in records],
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        # prevent the data from closing the script element
+        script.text = AtomicString(data.replace("</", "<\\/"))
+
+    def build_pager_html(self, parent, pages_count: int):
+        nav = etree.SubElement(parent, "nav", {"class": "nt-datatable-pager"})
+
+        previous_button = etree.SubElement(
+            nav,
+            "button",
+            {
+                "type": "button",
+                "class": "nt-datatable-prev",
+                "aria-label": "Previous page",
+            },
+        )
+        previous_button.text = "‹"
+
+        info = etree.SubElement(nav, "span", {"class": "nt-datatable-page-info"})
+        info.text = f"1 / {pages_count}"
+
+        next_button = etree.SubElement(
+            nav,
+            "button",
+            {"type": "button", "class": "nt-datatable-next", "aria-label": "Next page"},
+        )
+        next_button.text = "›"
+
+        script = etree.SubElement(parent, "script")
+        script.text = AtomicString(PAGER_SCRIPT)
@@ -0,0 +1,298 @@
+"""
+This module defines a cache for the results of parsing text into Python objects, so
+that identical payloads (e.g. the same data file referenced by many pages, or the
+same pages rebuilt by mkdocs serve) are parsed only once.
+
+Results are stored by SHA-256 hash of the text and parser, in memory with LRU
+eviction bounded by the number and total size of results, and optionally on disk
+to be reused across builds. Results are stored serialized as JSON, with tags for
+the values that JSON cannot describe (e.g. dates read from YAML), and deserialized
+on every read, so callers always receive new objects that they can modify without
+corrupting the cache. Unlike pickle, reading cached files cannot run code.
+
+The disk tier is enabled by the NEOTEROI_CACHE_DIR environment variable, read when
+caches are created, and bounded by the same total size of the memory tier: the
+least recently used files are deleted first.
+
+BaseCache implements the memory and disk tiers for caches of other kinds of
+values, which define how values are serialized.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+logger = logging.getLogger("MARKDOWN")
+
+# key of JSON objects describing values that JSON cannot represent
+TYPE_KEY = "__nt_type__"
+
+
+def get_default_cache_dir(name: str) -> Optional[Path]:
+    """
+    Returns the folder used to store cached items of the given kind on disk, if
+    the NEOTEROI_CACHE_DIR environment variable is set.
+    """
+    cache_dir = os.environ.get("NEOTEROI_CACHE_DIR", "")
+    return Path(cache_dir) / name if cache_dir else None
+
+
+class BaseCache(ABC):
+    """
+    Stores serialized values by key, in memory with LRU eviction, and optionally on
+    disk. The memory tier is bounded by number of items, and optionally by their
+    total size in bytes, which bounds also the disk tier.
+    """
+
+    suffix = "cache"
+
+    def __init__(
+        self,
+        max_size: int = 256,
+        cache_dir: Optional[Path] = None,
+        max_bytes: int = 0,
+    ) -> None:
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.cache_dir = cache_dir
+        self._items: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        # total size of the files of the disk tier, computed on the first write
+        self._disk_size: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @abstractmethod
+    def dumps(self, value: Any) -> Optional[bytes]:
+        """Serializes a value, returning None if it cannot be cached."""
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """Deserializes a value."""
+
+    def get_key(self, text: str, parser_key: str) -> str:
+        digest = hashlib.sha256(text.encode("utf8", "surrogatepass")).hexdigest()
+        return hashlib.sha256(f"{digest}:{parser_key}".encode("utf8")).hexdigest()
+
+    def _get_file_path(self, key: str) -> Path:
+        assert self.cache_dir is not None
+        return self.cache_dir / f"{key}.{self.suffix}"
+
+    def _read_file(self, key: str) -> Optional[bytes]:
+        if self.cache_dir is None:
+            return None
+
+        file_path = self._get_file_path(key)
+        try:
+            data = file_path.read_bytes()
+            # the modification time describes when files were last used
+            os.utime(file_path)
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as read_error:
+            logger.debug("Failed to read a cached item.", exc_info=read_error)
+            return None
+
+    def _write_file(self, key: str, data: bytes) -> None:
+        if self.cache_dir is None:
+            return
+
+        file_path = self._get_file_path(key)
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = file_path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_bytes(data)
+            os.replace(temp_path, file_path)
+        except OSError as write_error:
+            logger.debug("Failed to write a cached item.", exc_info=write_error)
+            return
+
+        if self.max_bytes > 0:
+            if self._disk_size is None:
+                self.prune()
+            else:
+                self._disk_size += len(data)
+                if self._disk_size > self.max_bytes:
+                    self.prune()
+
+    def _get_files(self) -> List[Tuple[int, int, Path]]:
+        assert self.cache_dir is not None
+        files = []
+
+        for file_path in self.cache_dir.glob(f"*.{self.suffix}"):
+            try:
+                file_stat = file_path.stat()
+            except OSError:
+                continue
+            files.append((file_stat.st_mtime_ns, file_stat.st_size, file_path))
+        return files
+
+    def prune(self) -> None:
+        """
+        Deletes the least recently used files of the disk tier, until their total
+        size does not exceed max_bytes.
+        """
+        if self.cache_dir is None or self.max_bytes <= 0:
+            return
+
+        files = sorted(self._get_files())
+        total = sum(size for _, size, _ in files)
+
+        for _, size, file_path in files:
+            if total <= self.max_bytes:
+                break
+            try:
+                file_path.unlink()
+            except OSError as delete_error:
+                logger.debug("Failed to delete a cached item.", exc_info=delete_error)
+                continue
+            total -= size
+
+        self._disk_size = total
+
+    def _store(self, key: str, data: bytes) -> None:
+        previous = self._items.pop(key, None)
+        if previous is not None:
+            self._size -= len(previous)
+
+        self._items[key] = data
+        self._size += len(data)
+
+        while len(self._items) > self.max_size or (
+            self.max_bytes > 0 and self._size > self.max_bytes and len(self._items) > 1
+        ):
+            _, evicted = self._items.popitem(last=False)
+            self._size -= len(evicted)
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Returns a tuple (found, value) with a new copy of the value stored with the
+        given key, if any.
+        """
+        data = self._items.get(key)
+
+        if data is not None:
+            self._items.move_to_end(key)
+        else:
+            data = self._read_file(key)
+            if data is None:
+                self.misses += 1
+                return False, None
+            self._store(key, data)
+
+        try:
+            value = self.loads(data)
+        except Exception as load_error:  # pragma: no cover
+            # e.g. a file written by a different version of a library
+            logger.debug("Failed to load a cached item.", exc_info=load_error)
+            removed = self._items.pop(key, None)
+            if removed is not None:
+                self._size -= len(removed)
+            self.misses += 1
+            return False, None
+
+        self.hits += 1
+        return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        data = self.dumps(value)
+
+        if data is None:
+            return
+
+        self._store(key, data)
+        self._write_file(key, data)
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._size = 0
+
+
+_JSON_TYPES = (str, int, float, bool, type(None))
+
+
+def _encode(value: Any) -> Any:
+    """
+    Returns an object that JSON can describe for the given value, raising TypeError
+    for values that cannot be cached.
+    """
+    value_type = type(value)
+
+    if value_type in _JSON_TYPES:
+        return value
+    if value_type is list:
+        return [_encode(item) for item in value]
+    if value_type is dict:
+        if TYPE_KEY not in value and all(type(key) is str for key in value):
+            return {key: _encode(item) for key, item in value.items()}
+        # e.g. YAML mappings with keys that are not strings
+        return {
+            TYPE_KEY: "dict",
+            "items": [[_encode(key), _encode(item)] for key, item in value.items()],
+        }
+    if value_type is tuple:
+        return {TYPE_KEY: "tuple", "items": [_encode(item) for item in value]}
+    if value_type is set:
+        return {TYPE_KEY: "set", "items": [_encode(item) for item in value]}
+    if value_type is datetime:
+        return {TYPE_KEY: "datetime", "value": value.isoformat()}
+    if value_type is date:
+        return {TYPE_KEY: "date", "value": value.isoformat()}
+    if value_type is bytes:
+        return {TYPE_KEY: "bytes", "value": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Cannot cache values of type {value_type.__name__}.")
+
+
+def _decode_object(obj: dict) -> Any:
+    value_type = obj.get(TYPE_KEY)
+
+    if value_type is None:
+        return obj
+    if value_type == "dict":
+        return {key: item for key, item in obj["items"]}
+    if value_type == "tuple":
+        return tuple(obj["items"])
+    if value_type == "set":
+        return set(obj["items"])
+    if value_type == "datetime":
+        return datetime.fromisoformat(obj["value"])
+    if value_type == "date":
+        return date.fromisoformat(obj["value"])
+    if value_type == "bytes":
+        return base64.b64decode(obj["value"])
+    raise ValueError(f"Invalid type of cached value: {value_type}.")
+
+
+class ParseCache(BaseCache):
+    """
+    Stores the results of parsing text, in memory with LRU eviction, and optionally
+    on disk. Values are stored as JSON.
+    """
+
+    suffix = "json"
+
+    def dumps(self, value: Any) -> Optional[bytes]:
+        try:
+            return json.dumps(_encode(value), separators=(",", ":")).encode("utf8")
+        except (TypeError, ValueError, RecursionError) as dump_error:
+            logger.debug("Cannot cache a parsed value.", exc_info=dump_error)
+            return None
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data, object_hook=_decode_object)
+
+
+default_parse_cache = ParseCache(
+    cache_dir=get_default_cache_dir("parse"), max_bytes=64 * 1024 * 1024
+)
@@ -1,21 +1,197 @@
+"""
+This module defines a DataReader that reads text from files.
+
+Relative paths are resolved against the current working directory, then against
+the folder of the page being rendered and the docs folder, when they are set with
+set_page_context (e.g. by the neoteroi.sources plugin, before rendering each
+page).
+
+Between calls to start_build and end_build, the results of stat calls are cached,
+so that each path is checked once per build. Contents of files are cached until
+their modification time or size change, and large files are decoded directly from
+a memory map, without copying their bytes first.
+"""
+
+import mmap
+import os
+import stat
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any
+from typing import Any, Dict, Iterable, Optional, Tuple
 
 from .source import DataReader
 
+# files of this size or larger are read with mmap, in bytes
+MMAP_THRESHOLD = 2 * 1024 * 1024
+
 
 def read_file(file_path: Path, encoding: str = "utf-8") -> str:
     with open(file_path, "rt", encoding=encoding) as source_file:
         return source_file.read()
 
 
+def read_mapped_file(file_path: Path, encoding: str = "utf-8") -> str:
+    """
+    Reads a file decoding its bytes directly from a memory map. Line endings are
+    normalized like when reading files in text mode.
+    """
+    with open(file_path, "rb") as source_file, mmap.mmap(
+        source_file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped_file:
+        text = str(mapped_file, encoding)
+
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+class StatCache:
+    """
+    Caches the results of stat calls, while enabled.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._items: Dict[Path, Optional[os.stat_result]] = {}
+
+    def stat(self, path: Path) -> Optional[os.stat_result]:
+        """Returns the stat result of the given path, or None if it does not exist."""
+        if self.enabled:
+            try:
+                return self._items[path]
+            except KeyError:
+                pass
+
+        try:
+            result: Optional[os.stat_result] = os.stat(path)
+        except (OSError, ValueError):
+            result = None
+
+        if self.enabled:
+            self._items[path] = result
+        return result
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+class ContentCache:
+    """
+    Stores the contents of files, with LRU eviction, until their modification time
+    or size change.
+    """
+
+    def __init__(self, max_size: int = 64) -> None:
+        self.max_size = max_size
+        self._items: "OrderedDict[Path, Tuple[int, int, str]]" = OrderedDict()
+
+    def get(self, path: Path, file_stat: os.stat_result) -> Optional[str]:
+        item = self._items.get(path)
+
+        if item is None:
+            return None
+
+        mtime, size, text = item
+        if mtime != file_stat.st_mtime_ns or size != file_stat.st_size:
+            del self._items[path]
+            return None
+
+        self._items.move_to_end(path)
+        return text
+
+    def set(self, path: Path, file_stat: os.stat_result, text: str) -> None:
+        self._items[path] = (file_stat.st_mtime_ns, file_stat.st_size, text)
+        self._items.move_to_end(path)
+
+        while len(self._items) > self.max_size:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+class PageContext:
+    """
+    Describes the folders against which relative paths of files are resolved.
+    """
+
+    def __init__(self) -> None:
+        self.page_dir: Optional[Path] = None
+        self.docs_dir: Optional[Path] = None
+
+    def get_candidates(self, source: str) -> Iterable[Path]:
+        source_path = Path(source)
+        yield source_path
+
+        if source_path.is_absolute():
+            return
+
+        for base_dir in (self.page_dir, self.docs_dir):
+            if base_dir is not None:
+                yield base_dir / source_path
+
+
+stat_cache = StatCache()
+content_cache = ContentCache()
+page_context = PageContext()
+
+
+def set_page_context(
+    page_path: Optional[Path] = None, docs_dir: Optional[Path] = None
+) -> None:
+    """
+    Sets the page being rendered and the docs folder, to resolve relative paths of
+    files referenced in the page.
+    """
+    page_context.page_dir = Path(page_path).parent if page_path else None
+    page_context.docs_dir = Path(docs_dir) if docs_dir else None
+
+
+def start_build() -> None:
+    """Enables the cache of stat results, clearing results of previous builds."""
+    stat_cache.clear()
+    stat_cache.enabled = True
+
+
+def end_build() -> None:
+    """Disables the cache of stat results, and resets the page context."""
+    stat_cache.enabled = False
+    stat_cache.clear()
+    set_page_context()
+
+
 class FileReader(DataReader):
     encoding = "utf-8"
 
+    def resolve(self, source: str) -> Optional[Tuple[Path, os.stat_result]]:
+        """
+        Returns the path of the file described by the given source, and its stat
+        result, or None if it does not exist.
+        """
+        for file_path in page_context.get_candidates(source):
+            file_stat = stat_cache.stat(file_path)
+
+            if file_stat is not None and stat.S_ISREG(file_stat.st_mode):
+                return file_path, file_stat
+        return None
+
     def test(self, source: str) -> bool:
-        source_path = Path(source)
-        return source_path.exists() and source_path.is_file()
+        return self.resolve(source) is not None
 
     def read(self, source: str) -> Any:
-        assert self.test(source)
-        return read_file(Path(source), encoding=self.encoding)
+        resolved = self.resolve(source)
+        assert resolved is not None
+        file_path, file_stat = resolved
+        key = file_path.absolute()
+
+        text = content_cache.get(key, file_stat)
+        if text is not None:
+            return text
+
+        if file_stat.st_size >= MMAP_THRESHOLD:
+            text = read_mapped_file(file_path, encoding=self.encoding)
+        else:
+            text = read_file(file_path, encoding=self.encoding)
+
+        content_cache.set(key, file_stat, text)
+        return text
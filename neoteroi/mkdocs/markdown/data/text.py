@@ -1,16 +1,119 @@
 """
 This module defines a base class for types that can deserialize text into Python
 objects, and implementations for common formats.
+
+Parsers are registered by format name, so that faster optional backends can replace
+the default ones (e.g. orjson for JSON, if installed), and the format of a text can
+be detected from the extension of its source or from its first character.
 """
 
 import csv
 import json
+import os
+import re
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from io import StringIO
-from typing import Any
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import urlparse
 
 import yaml
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+# the first non-whitespace character of a text, matched without copying the text
+_FIRST_CHAR_RX = re.compile(r"\s*(\S)")
+
+# use libyaml bindings when available, which are much faster
+_YAMLSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _parse_int(props, name: str, default: Optional[int]) -> Optional[int]:
+    value = props.get(name)
+
+    if value is None:
+        return default
+
+    try:
+        # bare properties (e.g. limit without a value) are parsed as True
+        number = None if isinstance(value, bool) else int(value)
+    except (TypeError, ValueError):
+        number = None
+
+    if number is None:
+        raise ValueError(f"Invalid {name}: {value!r}, expected an integer.")
+
+    if number < 0:
+        raise ValueError(f"Invalid {name}: {value!r}, expected a positive integer.")
+    return number
+
+
+@dataclass
+class RowsSelection:
+    """
+    Describes which items of a list to keep: at most limit items after the first
+    offset items, with only the given columns (keys) of each item.
+    """
+
+    offset: int = 0
+    limit: Optional[int] = None
+    columns: Optional[List[str]] = None
+
+    @classmethod
+    def from_props(cls, props) -> Optional["RowsSelection"]:
+        """
+        Returns the selection described by the limit, offset and columns properties
+        of a block, like: limit="50" offset="100" columns="title,url", or None if
+        they are not specified.
+        """
+        if not any(name in props for name in ("limit", "offset", "columns")):
+            return None
+
+        columns = props.get("columns")
+        return cls(
+            _parse_int(props, "offset", 0) or 0,
+            _parse_int(props, "limit", None),
+            (
+                [column.strip() for column in columns.split(",") if column.strip()]
+                if isinstance(columns, str)
+                else None
+            ),
+        )
+
+    @property
+    def stop(self) -> Optional[int]:
+        return None if self.limit is None else self.offset + self.limit
+
+    def select(self, items: Iterable[Any]) -> Iterator[Any]:
+        """
+        Yields the selected items, without consuming the given iterable further
+        than needed.
+        """
+        for item in islice(items, self.offset, self.stop):
+            yield self.project(item)
+
+    def project(self, item: Any) -> Any:
+        if self.columns is None or not isinstance(item, dict):
+            return item
+        return {column: item[column] for column in self.columns if column in item}
+
+    def apply(self, obj: Any) -> Any:
+        """
+        Applies the selection to a list, other objects are returned as-is. Lists of
+        lists describe tables whose first item contains the headers: the headers are
+        always kept, and the selection applies to the following items.
+        """
+        if not isinstance(obj, list):
+            return obj
+
+        if obj and all(isinstance(item, (list, tuple)) for item in obj):
+            return [obj[0]] + list(self.select(islice(obj, 1, None)))
+        return list(self.select(obj))
+
 
 class TextParser(ABC):
     """Base class for classes that can deserialize text into Python objects."""
@@ -19,10 +122,18 @@ class TextParser(ABC):
     def parse(self, text) -> Any:
         """Parses a text into a more complex object."""
 
+    def parse_rows(self, text, selection: RowsSelection) -> Any:
+        """
+        Parses a text, keeping only the selected items if it describes a list.
+        Parsers that can read items one at a time override this method to stop
+        reading once enough items are produced.
+        """
+        return selection.apply(self.parse(text))
+
 
 class YAMLParser(TextParser):
     def parse(self, text) -> Any:
-        return yaml.safe_load(text)
+        return yaml.load(text, Loader=_YAMLSafeLoader)
 
 
 class JSONParser(TextParser):
@@ -38,3 +149,98 @@ class CSVParser(TextParser):
         with StringIO(text) as string_io:
             reader = self.get_reader(string_io)
             return [record for record in reader]
+
+    def iter_rows(self, text, selection: Optional[RowsSelection] = None):
+        """
+        Yields the records of a CSV text lazily. If a selection is specified, rows
+        before its offset are skipped without creating records, reading stops
+        once enough rows are produced, and records include only its columns.
+        """
+        selection = selection or RowsSelection()
+
+        with StringIO(text) as string_io:
+            reader = self.get_reader(string_io)
+            fieldnames = reader.fieldnames or []
+            # DictReader skips empty rows
+            rows = (row for row in reader.reader if row)
+
+            if selection.columns is None:
+                indexes = list(enumerate(fieldnames))
+            else:
+                indexes = [
+                    (fieldnames.index(column), column)
+                    for column in selection.columns
+                    if column in fieldnames
+                ]
+
+            for row in islice(rows, selection.offset, selection.stop):
+                record = {
+                    name: row[index] if index < len(row) else reader.restval
+                    for index, name in indexes
+                }
+                if selection.columns is None and len(row) > len(fieldnames):
+                    record[reader.restkey] = row[len(fieldnames) :]
+                yield record
+
+    def parse_rows(self, text, selection: RowsSelection) -> Any:
+        return list(self.iter_rows(text, selection))
+
+
+class ORJSONParser(TextParser):
+    """JSON parser using orjson, which is much faster than the json module."""
+
+    def parse(self, text) -> Any:
+        # orjson.JSONDecodeError is a subclass of json.JSONDecodeError
+        return orjson.loads(text)
+
+
+_parsers: Dict[str, TextParser] = {}
+_extensions: Dict[str, str] = {}
+
+
+def register_parser(
+    format_name: str, parser: TextParser, extensions: Iterable[str] = ()
+) -> None:
+    """
+    Registers the parser used for the given format, and the file extensions that
+    identify the format. A parser registered for an existing format replaces the
+    previous one.
+    """
+    _parsers[format_name] = parser
+
+    for extension in extensions:
+        _extensions[extension.lower()] = format_name
+
+
+def get_parser(format_name: str) -> TextParser:
+    return _parsers[format_name]
+
+
+def get_parsers() -> List[TextParser]:
+    """Returns the registered parsers, in the order they were registered."""
+    return list(_parsers.values())
+
+
+def detect_format(text: str, source: Optional[str] = None) -> Optional[str]:
+    """
+    Returns the name of the format of the given text, detected from the extension
+    of its source (file path or URL), or from the first non-whitespace character
+    of the text, or None if the format cannot be detected.
+    """
+    if source:
+        path = urlparse(source).path if "://" in source else source
+        format_name = _extensions.get(os.path.splitext(path)[1].lower())
+
+        if format_name:
+            return format_name
+
+    match = _FIRST_CHAR_RX.match(text)
+
+    if match and match.group(1) in {"{", "["} and "json" in _parsers:
+        return "json"
+    return None
+
+
+register_parser("yaml", YAMLParser(), (".yaml", ".yml"))
+register_parser("json", ORJSONParser() if orjson else JSONParser(), (".json",))
+register_parser("csv", CSVParser(), (".csv",))
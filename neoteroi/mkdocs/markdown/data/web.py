@@ -1,14 +1,39 @@
+import asyncio
+import hashlib
+import json
+import logging
 import os
-from typing import Any
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AsyncExitStack
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import httpx
 
+from .cache import get_default_cache_dir
 from .source import DataReader
 
+logger = logging.getLogger("MARKDOWN")
+
 HTTPX_DISABLE_SSL_VERIFY = bool(os.environ.get("HTTPX_DISABLE_SSL_VERIFY"))
 
 default_http_client = httpx.Client(verify=not HTTPX_DISABLE_SSL_VERIFY, timeout=20)
 
+# seconds during which cached responses are used without revalidation
+NEOTEROI_HTTP_CACHE_TTL = float(os.environ.get("NEOTEROI_HTTP_CACHE_TTL") or 0)
+
+# when set, remote sources are read only from the HTTP cache
+NEOTEROI_OFFLINE = bool(os.environ.get("NEOTEROI_OFFLINE"))
+
+# tags of source block processors that can read data from URLs
+DEFAULT_SOURCE_TAGS = ("cards", "timeline", "gantt", "datatable")
+
+# responses bodies downloaded in advance, by URL
+_prefetched: Dict[str, str] = {}
+
 
 class FailedRequestError(Exception):
     def __init__(self, message) -> None:
@@ -30,22 +55,271 @@ def ensure_success(response: httpx.Response) -> None:
         )
 
 
+@dataclass
+class CachedResponse:
+    url: str
+    body: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    # time when the response was downloaded or revalidated, in seconds since epoch
+    time: float = 0
+
+    def get_conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HTTPCache:
+    """
+    Stores the bodies of responses on disk, with their validators (ETag and
+    Last-Modified headers), so that subsequent builds can send conditional requests
+    and reuse the cached bodies when the server responds with 304 Not Modified.
+
+    Cached responses younger than ttl seconds are used without revalidation. In
+    offline mode, cached responses are always used and no request is sent.
+    """
+
+    def __init__(
+        self, cache_dir: Optional[Path], ttl: float = 0, offline: bool = False
+    ) -> None:
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.offline = offline
+
+    def _get_file_path(self, url: str) -> Path:
+        assert self.cache_dir is not None
+        key = hashlib.sha256(url.encode("utf8")).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, url: str) -> Optional[CachedResponse]:
+        if self.cache_dir is None:
+            return None
+
+        try:
+            data = json.loads(self._get_file_path(url).read_text("utf8"))
+            return CachedResponse(**data)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as read_error:
+            logger.debug("Failed to read a cached response.", exc_info=read_error)
+            return None
+
+    def set(self, item: CachedResponse) -> None:
+        if self.cache_dir is None:
+            return
+
+        file_path = self._get_file_path(item.url)
+        try:
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = file_path.with_suffix(f".{os.getpid()}.tmp")
+            temp_path.write_text(json.dumps(asdict(item)), "utf8")
+            os.replace(temp_path, file_path)
+        except OSError as write_error:
+            logger.debug("Failed to write a cached response.", exc_info=write_error)
+
+    def is_fresh(self, item: CachedResponse) -> bool:
+        return self.offline or time.time() - item.time < self.ttl
+
+    def store(self, url: str, response: httpx.Response) -> None:
+        """
+        Stores the given successful response. Responses without validators are
+        stored too, to be used in offline mode or while fresh: once stale, they are
+        requested again without conditional headers.
+        """
+        self.set(
+            CachedResponse(
+                url,
+                response.text,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                time.time(),
+            )
+        )
+
+    def revalidated(self, item: CachedResponse) -> str:
+        """
+        Updates the time of a cached response confirmed by a 304 response, and
+        returns its body.
+        """
+        item.time = time.time()
+        self.set(item)
+        return item.body
+
+
+default_http_cache = HTTPCache(
+    get_default_cache_dir("http"), NEOTEROI_HTTP_CACHE_TTL, NEOTEROI_OFFLINE
+)
+
+
+def _lookup(
+    http_cache: Optional[HTTPCache], url: str
+) -> Tuple[Optional[CachedResponse], Dict[str, str]]:
+    """
+    Returns the cached response for the given URL, if any, and the headers of the
+    conditional request to revalidate it. Raises FailedRequestError in offline mode,
+    if the URL is not cached.
+    """
+    if http_cache is None:
+        return None, {}
+
+    item = http_cache.get(url)
+
+    if item is None:
+        if http_cache.offline:
+            raise FailedRequestError(f"{url} is not cached and offline mode is on")
+        return None, {}
+    return item, item.get_conditional_headers()
+
+
+def _handle_response(
+    http_cache: Optional[HTTPCache],
+    url: str,
+    item: Optional[CachedResponse],
+    response: httpx.Response,
+) -> str:
+    if response.status_code == 304 and item is not None:
+        assert http_cache is not None
+        return http_cache.revalidated(item)
+
+    ensure_success(response)
+
+    if http_cache is not None:
+        http_cache.store(url, response)
+    return response.text
+
+
 class HTTPDataReader(DataReader):
     http_client: httpx.Client = default_http_client
+    http_cache: Optional[HTTPCache] = default_http_cache
 
     def test(self, source: str) -> bool:
         source_lower = source.lower()
         return source_lower.startswith("http://") or source_lower.startswith("https://")
 
-    def get(self, url: str) -> httpx.Response:
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
         try:
-            return self.http_client.get(url)
+            return self.http_client.get(url, headers=headers)
         except httpx.HTTPError as http_error:  # pragma: no cover
             raise FailedRequestError(str(http_error)) from http_error
 
     def read(self, source: str) -> Any:
         assert self.test(source)
-        response = self.get(source)
 
-        ensure_success(response)
-        return response.text
+        try:
+            return _prefetched[source]
+        except KeyError:
+            pass
+
+        http_cache = self.http_cache
+        item, headers = _lookup(http_cache, source)
+
+        if item is not None and http_cache is not None and http_cache.is_fresh(item):
+            return item.body
+
+        response = self.get(source, headers) if headers else self.get(source)
+        return _handle_response(http_cache, source, item, response)
+
+
+def extract_http_sources(
+    markdown: str, tags: Iterable[str] = DEFAULT_SOURCE_TAGS
+) -> List[str]:
+    """
+    Returns the URLs referenced by source blocks in the given Markdown, like:
+
+    [cards(https://example.com/cards.json)]
+    """
+    pattern = re.compile(
+        r"\[(?:"
+        + "|".join(re.escape(tag) for tag in tags)
+        + r")\s?[^\(\]]*\((?P<source>https?://[^\)\s]+)\)\]",
+        re.IGNORECASE,
+    )
+    return list(
+        dict.fromkeys(match.group("source") for match in pattern.finditer(markdown))
+    )
+
+
+async def fetch_all(
+    urls: Iterable[str],
+    max_concurrency: int = 8,
+    http_cache: Optional[HTTPCache] = None,
+    reader: Optional["HTTPDataReader"] = None,
+) -> Dict[str, str]:
+    """
+    Downloads the given URLs concurrently, running at most max_concurrency requests
+    at the same time. Returns the bodies of successful responses, by URL. If an
+    HTTP cache is specified, fresh cached responses are returned without sending
+    requests, and the others are revalidated.
+
+    If a reader is specified, requests are sent with its HTTP client, in a pool of
+    threads, otherwise with a new httpx.AsyncClient.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+    results: Dict[str, str] = {}
+    loop = asyncio.get_running_loop()
+
+    async with AsyncExitStack() as stack:
+        if reader is None:
+            client = await stack.enter_async_context(
+                httpx.AsyncClient(verify=not HTTPX_DISABLE_SSL_VERIFY, timeout=20)
+            )
+        else:
+            executor = stack.enter_context(
+                ThreadPoolExecutor(max_workers=max_concurrency)
+            )
+
+        async def get(url: str, headers: Dict[str, str]) -> httpx.Response:
+            if reader is None:
+                return await client.get(url, headers=headers)
+            return await loop.run_in_executor(executor, reader.get, url, headers)
+
+        async def fetch(url: str) -> None:
+            async with semaphore:
+                try:
+                    item, headers = _lookup(http_cache, url)
+
+                    if item is not None and http_cache is not None:
+                        if http_cache.is_fresh(item):
+                            results[url] = item.body
+                            return
+
+                    response = await get(url, headers)
+                    results[url] = _handle_response(http_cache, url, item, response)
+                except (httpx.HTTPError, FailedRequestError) as fetch_error:
+                    # the error is raised again when the source is read
+                    logger.debug("Failed to prefetch %s", url, exc_info=fetch_error)
+
+        await asyncio.gather(*(fetch(url) for url in dict.fromkeys(urls)))
+
+    return results
+
+
+def prefetch(
+    urls: Iterable[str],
+    max_concurrency: int = 8,
+    reader: Optional[HTTPDataReader] = None,
+) -> Dict[str, str]:
+    """
+    Downloads the given URLs concurrently, so that HTTPDataReader.read returns
+    their bodies without sending requests. Requests are sent with the HTTP client
+    and the HTTP cache of the given reader, or of a new HTTPDataReader.
+    """
+    urls = [url for url in dict.fromkeys(urls) if url not in _prefetched]
+
+    if not urls:
+        return {}
+
+    reader = reader or HTTPDataReader()
+    results = asyncio.run(
+        fetch_all(urls, max_concurrency, reader.http_cache, reader=reader)
+    )
+    _prefetched.update(results)
+    return results
+
+
+def clear_prefetched() -> None:
+    _prefetched.clear()
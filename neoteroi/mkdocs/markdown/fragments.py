@@ -0,0 +1,89 @@
+"""
+This module defines a cache for the HTML fragments rendered by processors, so that
+identical component blocks (e.g. the same data file included by many pages, or the
+same pages rebuilt by mkdocs serve) are parsed and built only once.
+
+Fragments are stored serialized as XML, by processor, properties, configuration
+and hash of the input text, and a new copy of the elements is returned on every
+read. The memory tier is bounded by the total size of the fragments, the disk tier
+is enabled by the NEOTEROI_CACHE_DIR environment variable.
+"""
+
+import json
+import logging
+import xml.etree.ElementTree as etree
+from typing import Any, List, Optional
+
+from markdown.util import AtomicString
+
+from neoteroi.mkdocs import __version__
+from neoteroi.mkdocs.markdown.data.cache import BaseCache, get_default_cache_dir
+
+logger = logging.getLogger("MARKDOWN")
+
+# the tag of the element wrapping the elements of a serialized fragment
+FRAGMENT_TAG = "nt-fragment"
+
+# attribute marking elements whose text must not be processed by inline patterns
+ATOMIC_TEXT_ATTRIBUTE = "nt-atomic-text"
+
+
+class FragmentCache(BaseCache):
+    """
+    Stores lists of elements rendered by processors, in memory with LRU eviction,
+    and optionally on disk.
+    """
+
+    suffix = "xml"
+
+    def get_fragment_key(
+        self, processor_key: str, text: str, props: dict, config: dict
+    ) -> Optional[str]:
+        """
+        Returns the key of the fragment rendered by a processor for the given text,
+        properties and configuration, or None if they cannot be described as JSON.
+        """
+        try:
+            options = json.dumps([props, config], sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+        return self.get_key(text, f"{processor_key}:{options}:{__version__}")
+
+    def dumps(self, value: Any) -> Optional[bytes]:
+        wrapper = etree.Element(FRAGMENT_TAG)
+        wrapper.extend(value)
+
+        # AtomicString texts are lost in serialization, they are marked with an
+        # attribute only while the fragment is serialized
+        atomic_elements = [
+            element
+            for element in wrapper.iter()
+            if isinstance(element.text, AtomicString)
+        ]
+        for element in atomic_elements:
+            element.set(ATOMIC_TEXT_ATTRIBUTE, "")
+
+        try:
+            return etree.tostring(wrapper, encoding="utf-8")
+        except (TypeError, ValueError) as dump_error:
+            logger.debug("Cannot cache a rendered fragment.", exc_info=dump_error)
+            return None
+        finally:
+            for element in atomic_elements:
+                del element.attrib[ATOMIC_TEXT_ATTRIBUTE]
+
+    def loads(self, data: bytes) -> List[etree.Element]:
+        wrapper = etree.fromstring(data)
+
+        for element in wrapper.iter():
+            if ATOMIC_TEXT_ATTRIBUTE in element.attrib:
+                del element.attrib[ATOMIC_TEXT_ATTRIBUTE]
+                element.text = AtomicString(element.text or "")
+        return list(wrapper)
+
+
+default_fragment_cache = FragmentCache(
+    max_size=1024,
+    cache_dir=get_default_cache_dir("fragments"),
+    max_bytes=32 * 1024 * 1024,
+)
@@ -11,25 +11,29 @@ content
 ::/example::
 """
 
+import bisect
 import logging
 import re
 import textwrap
 import xml.etree.ElementTree as etree
 from abc import ABC, abstractmethod
-from typing import Iterable, List, Optional
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
 
 from markdown.blockprocessors import BlockProcessor
 
 from neoteroi.mkdocs.markdown import parse_props
+from neoteroi.mkdocs.markdown.data.cache import ParseCache, default_parse_cache
 from neoteroi.mkdocs.markdown.data.files import FileReader
 from neoteroi.mkdocs.markdown.data.source import DataReader
 from neoteroi.mkdocs.markdown.data.text import (
-    CSVParser,
-    JSONParser,
+    RowsSelection,
     TextParser,
-    YAMLParser,
+    detect_format,
+    get_parser,
+    get_parsers,
 )
-from neoteroi.mkdocs.markdown.data.web import HTTPDataReader
+from neoteroi.mkdocs.markdown.data.web import FailedRequestError, HTTPDataReader
+from neoteroi.mkdocs.markdown.fragments import FragmentCache, default_fragment_cache
 
 logger = logging.getLogger("MARKDOWN")
 
@@ -43,24 +47,157 @@ def find_closing_fragment_index(pattern: re.Pattern, blocks: List[str]) -> int:
 
 def pop_to_index(items, index):
     """
-    Pops elements from a source list, and yields them up to the given index,
-    included.
+    Removes elements from a source list, and returns them up to the given index,
+    included, with a trailing new line.
 
     Example:
-    pop_to_index([1, 2, 3, 4], 2) -> yields 1, 2, 3,
+    pop_to_index(["1", "2", "3", "4"], 2) -> ["1\n", "2\n", "3\n"],
     removing them from the source list.
     """
-    i = 0
+    popped = items[: index + 1]
+    del items[: index + 1]
+    return [block + "\n" for block in popped]
 
-    while i <= index:
-        block = items.pop(0)
-        yield block + "\n"
-        i += 1
+
+class ClosingTagsIndex:
+    """
+    Positions of the blocks matching a closing tag pattern in a list of blocks, to
+    find closing tags without scanning the blocks every time an opening tag is found.
+
+    Python-Markdown consumes the list of blocks of a document from its start, and
+    block processors insert the text they don't handle back at its start, so
+    positions are stored as distances from the end of the list, which are stable.
+    Blocks inserted after the list was indexed are scanned directly, and the index
+    is rebuilt if it does not match the list anymore.
+    """
+
+    def __init__(self, pattern: re.Pattern) -> None:
+        self.pattern = pattern
+        self._blocks: Optional[List[str]] = None
+        self._length = 0
+        # negative distances from the end of the list, ascending
+        self._positions: List[int] = []
+
+    def _build(self, blocks: List[str]) -> int:
+        self._blocks = blocks
+        self._length = count = len(blocks)
+        self._positions = [
+            index - count
+            for index, block in enumerate(blocks)
+            if self.pattern.search(block)
+        ]
+        return self._positions[0] + count if self._positions else -1
+
+    def find(self, blocks: List[str]) -> int:
+        """
+        Returns the index of the first block matching the pattern, or -1.
+        """
+        if blocks is not self._blocks:
+            return self._build(blocks)
+
+        count = len(blocks)
+
+        # the first block can be modified by other processors, blocks added at
+        # the start of the list after it was indexed are not in the index
+        for index in range(min(max(count - self._length, 1), count)):
+            if self.pattern.search(blocks[index]):
+                return index
+
+        position = bisect.bisect_left(self._positions, 1 - count)
+
+        if position == len(self._positions):
+            return -1
+
+        index = self._positions[position] + count
+        if self.pattern.search(blocks[index]):
+            return index
+        return self._build(blocks)
+
+
+class TagsDispatcher:
+    """
+    Finds which tags handled by processors appear in a block of text, with a single
+    regular expression for all the tags registered in the same Markdown parser,
+    instead of a regular expression for each processor. The result for the last
+    block is stored, so that the test of each processor is a set lookup.
+
+    Tags are described by kind ("source" for [name(...)] and "embedded" for
+    ::name::) and name.
+    """
+
+    def __init__(self) -> None:
+        self._names: Dict[str, Set[str]] = {"source": set(), "embedded": set()}
+        self._pattern: Optional[re.Pattern] = None
+        self._last_block: Optional[str] = None
+        self._last_tags: FrozenSet[Tuple[str, str]] = frozenset()
+
+    @classmethod
+    def of(cls, parser) -> "TagsDispatcher":
+        """Returns the dispatcher of the given parser, creating it if necessary."""
+        dispatcher = getattr(parser, "_tags_dispatcher", None)
+
+        if dispatcher is None:
+            dispatcher = cls()
+            setattr(parser, "_tags_dispatcher", dispatcher)
+        return dispatcher
+
+    def register(self, kind: str, name: str) -> None:
+        self._names[kind].add(name)
+        self._pattern = None
+        self._last_block = None
+
+    @staticmethod
+    def _alternation(names: Set[str]) -> str:
+        # longest names first, for names that are prefixes of other names
+        return "|".join(
+            re.escape(name) for name in sorted(names, key=len, reverse=True)
+        )
+
+    @property
+    def pattern(self) -> re.Pattern:
+        if self._pattern is None:
+            alternatives = []
+            if self._names["embedded"]:
+                alternatives.append(
+                    rf"::(?P<embedded>{self._alternation(self._names['embedded'])})::"
+                )
+            if self._names["source"]:
+                alternatives.append(
+                    rf"\[(?P<source>{self._alternation(self._names['source'])})"
+                    r"\s?[^\(]*\(.*?\)\]"
+                )
+            self._pattern = re.compile("|".join(alternatives) or "(?!)", re.DOTALL)
+        return self._pattern
+
+    def get_tags(self, block: str) -> FrozenSet[Tuple[str, str]]:
+        """Returns the tags that appear in the given block, as (kind, name)."""
+        if block is self._last_block or block == self._last_block:
+            return self._last_tags
+
+        if "::" not in block and "[" not in block:
+            tags: FrozenSet[Tuple[str, str]] = frozenset()
+        else:
+            tags = frozenset(
+                (match.lastgroup, match.group(match.lastgroup))
+                for match in self.pattern.finditer(block)
+                if match.lastgroup
+            )
+
+        self._last_block = block
+        self._last_tags = tags
+        return tags
+
+    def test(self, kind: str, name: str, block: str) -> bool:
+        return (kind, name) in self.get_tags(block)
 
 
 class BaseProcessor(ABC):
     root_config: dict = {}
-    parsers: Iterable[TextParser] = (YAMLParser(), JSONParser(), CSVParser())
+    # parsers tried in order when the format is not specified nor detected, by
+    # default the registered parsers (YAML, JSON, CSV)
+    parsers: Optional[Iterable[TextParser]] = None
+    parse_cache: Optional[ParseCache] = default_parse_cache
+    fragment_cache: Optional[FragmentCache] = default_fragment_cache
 
     @property
     @abstractmethod
@@ -71,20 +208,28 @@ class BaseProcessor(ABC):
     def build_html(self, parent, obj, props) -> None:
         """Builds the HTML for the given input object."""
 
-    def get_parsers(self, props):
+    def get_parsers(self, props, text: Optional[str] = None):
         """
-        Tries to get the best parser by tag property.
+        Tries to get the best parser by tag property, or by the format detected from
+        the extension of the source or the first character of the text. Other
+        parsers are returned after the detected one, as fallback.
         """
-        if props.get("yaml") is True:
-            return [YAMLParser()]
+        for format_name in ("yaml", "json", "csv"):
+            if props.get(format_name) is True:
+                return [get_parser(format_name)]
 
-        if props.get("json") is True:
-            return [JSONParser()]
+        parsers = list(self.parsers if self.parsers is not None else get_parsers())
 
-        if props.get("csv") is True:
-            return [CSVParser()]
+        if text is not None:
+            format_name = detect_format(text, props.get("__source"))
 
-        return self.parsers
+            if format_name is not None:
+                detected = get_parser(format_name)
+                return [detected] + [
+                    parser for parser in parsers if parser is not detected
+                ]
+
+        return parsers
 
     def render_courtesy_error(self, parent, message: str):
         div = etree.SubElement(parent, "div", {"class": "nt-error"})
@@ -92,8 +237,44 @@ class BaseProcessor(ABC):
         p.text = message
 
     def parse(self, text, props):
-        for parser in self.get_parsers(props):
+        """
+        Parses the given text with the first parser that can handle it. Results are
+        cached by text and parsers, and a new copy is returned each time.
+
+        If the limit, offset or columns properties are specified, only the selected
+        items of lists are kept (e.g. reading only the first rows of a CSV text).
+        """
+        parsers = list(self.get_parsers(props, text if isinstance(text, str) else None))
+        selection = RowsSelection.from_props(props)
+
+        if self.parse_cache is None or not isinstance(text, str):
+            return self._parse(text, parsers, selection)
+
+        key = self.parse_cache.get_key(
+            text,
+            ",".join(
+                f"{type(parser).__module__}.{type(parser).__qualname__}"
+                for parser in parsers
+            )
+            + (f":{selection}" if selection is not None else ""),
+        )
+        found, obj = self.parse_cache.get(key)
+
+        if not found:
+            obj = self._parse(text, parsers, selection)
+            self.parse_cache.set(key, obj)
+        return obj
+
+    def _parse(
+        self,
+        text,
+        parsers: Iterable[TextParser],
+        selection: Optional[RowsSelection] = None,
+    ):
+        for parser in parsers:
             try:
+                if selection is not None:
+                    return parser.parse_rows(text, selection)
                 return parser.parse(text)
             except (TypeError, ValueError) as parser_exc:
                 logger.debug(
@@ -104,7 +285,41 @@ class BaseProcessor(ABC):
 
         raise ValueError("The input text could not be parsed.")
 
+    def get_fragment_key(self, data, props) -> Optional[str]:
+        if self.fragment_cache is None or not isinstance(data, str):
+            return None
+
+        processor_type = type(self)
+        return self.fragment_cache.get_fragment_key(
+            f"{processor_type.__module__}.{processor_type.__qualname__}:{self.name}",
+            data,
+            props,
+            self.root_config,
+        )
+
     def render(self, parent, data, props):
+        """
+        Renders the given data in the parent element. Fragments rendered from text
+        are cached by processor, properties and text, and a new copy of the cached
+        elements is appended on subsequent calls with the same input.
+        """
+        key = self.get_fragment_key(data, props)
+
+        if key is not None:
+            assert self.fragment_cache is not None
+            found, elements = self.fragment_cache.get(key)
+
+            if found:
+                parent.extend(elements)
+                return
+
+        children_count = len(parent)
+
+        if self._render(parent, data, props) and key is not None:
+            assert self.fragment_cache is not None
+            self.fragment_cache.set(key, list(parent)[children_count:])
+
+    def _render(self, parent, data, props) -> bool:
         if isinstance(data, str):
             try:
                 obj = self.parse(data, props)
@@ -115,7 +330,7 @@ class BaseProcessor(ABC):
                     f"Could not parse the value of this {self.name} block. "
                     "Please correct the input.",
                 )
-                return
+                return False
         else:
             obj = data
 
@@ -127,6 +342,8 @@ class BaseProcessor(ABC):
                 parent,
                 f"Could not render a {self.name} block. Please correct the input.",
             )
+            return False
+        return True
 
     def get_match(self, pattern, blocks) -> Optional[re.Match]:
         first_block = blocks.pop(0)
@@ -161,6 +378,11 @@ class SourceBlockProcessor(BlockProcessor, BaseProcessor):
 
     _pattern: Optional[re.Pattern] = None
 
+    def __init__(self, parser) -> None:
+        super().__init__(parser)
+        self._tags = TagsDispatcher.of(parser)
+        self._tags.register("source", self.name)
+
     @property
     def pattern(self) -> re.Pattern:
         if self._pattern is None:
@@ -170,10 +392,7 @@ class SourceBlockProcessor(BlockProcessor, BaseProcessor):
         return self._pattern
 
     def test(self, parent, block) -> bool:
-        if self.pattern.search(block):
-            return True
-        else:
-            return False
+        return self._tags.test("source", self.name, block)
 
     data_readers: Iterable[DataReader] = (FileReader(), HTTPDataReader())
 
@@ -214,6 +433,10 @@ class SourceBlockProcessor(BlockProcessor, BaseProcessor):
             data = self.read_from_source(source)
         except ValueError as value_error:
             self.render_courtesy_error(parent, str(value_error))
+        except FailedRequestError as request_error:
+            # e.g. a source that is not cached, in offline mode
+            logger.warning("[%s] could not read the source: %s", self.name, source)
+            self.render_courtesy_error(parent, str(request_error))
         else:
             self.render(parent, data, props)
 
@@ -236,6 +459,12 @@ class EmbeddedBlockProcessor(BlockProcessor, BaseProcessor):
     _start_pattern: Optional[re.Pattern] = None
     _end_pattern: Optional[re.Pattern] = None
 
+    def __init__(self, parser) -> None:
+        super().__init__(parser)
+        self._tags = TagsDispatcher.of(parser)
+        self._tags.register("embedded", self.name)
+        self._closing_tags = ClosingTagsIndex(self.end_pattern)
+
     @property
     def start_pattern(self) -> re.Pattern:
         if self._start_pattern is None:
@@ -251,13 +480,10 @@ class EmbeddedBlockProcessor(BlockProcessor, BaseProcessor):
         return self._end_pattern
 
     def test(self, parent, block) -> bool:
-        if self.start_pattern.search(block):
-            return True
-        else:
-            return False
+        return self._tags.test("embedded", self.name, block)
 
     def find_closing_fragment_index(self, blocks) -> int:
-        return find_closing_fragment_index(self.end_pattern, blocks)
+        return self._closing_tags.find(blocks)
 
     def get_content(self, relevant_blocks):
         raw_text = textwrap.dedent("".join(relevant_blocks))
@@ -289,7 +515,6 @@ class EmbeddedBlockProcessor(BlockProcessor, BaseProcessor):
             ).lstrip()
             blocks.pop(0)
         else:
-            blocks.pop(0)
-            raw_text = self.get_content(pop_to_index(blocks, closing_block_index - 1))
+            raw_text = self.get_content(pop_to_index(blocks, closing_block_index)[1:])
 
         self.render(parent, raw_text, props)
@@ -128,3 +128,41 @@ def read_table(markdown: str, cls: Type[T] = Table) -> Optional[T]:
                 records.append(row)
 
     return cls(headers, records) if headers else None
+
+
+def _to_text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def table_from_items(items: Iterable[Any], cls: Type[T] = Table) -> T:
+    """
+    Creates a table from a list of dictionaries, using their keys as headers in
+    order of appearance, or from a list of lists, using the first one as headers.
+    """
+    items = list(items)
+
+    if not items:
+        return cls([], [])
+
+    if all(isinstance(item, dict) for item in items):
+        headers: Dict[str, None] = {}
+        for item in items:
+            headers.update(dict.fromkeys(item))
+
+        return cls(
+            [_to_text(header) for header in headers],
+            [[_to_text(item.get(header)) for header in headers] for item in items],
+        )
+
+    if all(isinstance(item, (list, tuple)) for item in items):
+        columns_count = len(items[0])
+        return cls(
+            [_to_text(header) for header in items[0]],
+            [
+                [_to_text(value) for value in record[:columns_count]]
+                + [""] * (columns_count - len(record))
+                for record in items[1:]
+            ],
+        )
+
+    raise TypeError("Expected a list of dictionaries or a list of lists.")
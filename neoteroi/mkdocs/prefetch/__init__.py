@@ -0,0 +1,48 @@
+"""
+This module provides a plugin that downloads in advance, concurrently, the remote
+sources referenced by components in all pages, like:
+
+[cards(https://example.com/cards.json)]
+
+so that they are not downloaded one at a time while pages are rendered.
+
+Requests are sent with the HTTP client and the HTTP cache of HTTPDataReader: the
+HTTP cache can be configured with the neoteroi.sources plugin.
+"""
+
+import logging
+from pathlib import Path
+
+from mkdocs.config.config_options import Type
+from mkdocs.plugins import BasePlugin
+from mkdocs.structure.files import Files
+
+from neoteroi.mkdocs.markdown.data.web import (
+    DEFAULT_SOURCE_TAGS,
+    clear_prefetched,
+    extract_http_sources,
+    prefetch,
+)
+
+logger = logging.getLogger("MARKDOWN")
+
+
+class HTTPPrefetchPlugin(BasePlugin):
+    config_scheme = (
+        ("max_concurrency", Type(int, default=8)),
+        ("tags", Type(list, default=list(DEFAULT_SOURCE_TAGS))),
+    )
+
+    def on_files(self, files: Files, *args, **kwargs):
+        # sources are downloaded again at each build, e.g. with mkdocs serve
+        clear_prefetched()
+        urls = []
+
+        for page_file in files.documentation_pages():
+            markdown = Path(page_file.abs_src_path).read_text("utf8")
+            urls.extend(extract_http_sources(markdown, self.config["tags"]))
+
+        if urls:
+            results = prefetch(urls, self.config["max_concurrency"])
+            logger.debug("Prefetched %s of %s remote sources.", len(results), len(urls))
+        return files
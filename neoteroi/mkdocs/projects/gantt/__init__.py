@@ -18,6 +18,10 @@ from .html import GanttHTMLBuilder, GanttViewOptions
 
 
 class BaseGanttProcessor:
+    # Gantt diagrams have unique ids and depend on the current date for plans
+    # without dates, so rendered fragments are not reused
+    fragment_cache = None
+
     @property
     def name(self) -> str:
         return "gantt"
@@ -0,0 +1,104 @@
+"""
+This module provides a plugin that configures how sources referenced by components
+are read, like:
+
+[cards(./cards.yaml)]
+
+[cards(https://example.com/cards.json)]
+
+The plugin sets the page being rendered, so that file sources are resolved relative
+to the page and to the docs folder, and enables the cache of files information for
+the duration of each build.
+
+Responses of remote sources can be stored in a persistent HTTP cache, revalidated
+with conditional requests in subsequent builds, or read only from the cache in
+offline mode. The HTTP cache configured by the plugin is used only during the
+build, then the default one (configured by environment variables) is restored.
+"""
+
+import logging
+from pathlib import Path
+from typing import Optional
+
+from mkdocs.config.config_options import Type
+from mkdocs.plugins import BasePlugin
+from mkdocs.structure.files import Files
+
+from neoteroi.mkdocs.markdown.data.files import (
+    end_build,
+    set_page_context,
+    start_build,
+)
+from neoteroi.mkdocs.markdown.data.web import (
+    HTTPCache,
+    HTTPDataReader,
+    default_http_cache,
+)
+
+logger = logging.getLogger("MARKDOWN")
+
+
+class SourcesPlugin(BasePlugin):
+    config_scheme = (
+        ("cache_dir", Type(str, default="")),
+        ("cache_ttl", Type(int, default=0)),
+        ("offline", Type(bool, default=False)),
+    )
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._previous_http_cache: Optional[HTTPCache] = None
+        self._configured = False
+
+    def _get_http_cache(self) -> Optional[HTTPCache]:
+        cache_dir = self.config.get("cache_dir")
+        cache_ttl = self.config.get("cache_ttl") or 0
+        offline = bool(self.config.get("offline"))
+
+        if not cache_dir and not cache_ttl and not offline:
+            return None
+
+        http_cache = HTTPCache(
+            Path(cache_dir) if cache_dir else default_http_cache.cache_dir,
+            cache_ttl,
+            offline,
+        )
+
+        if http_cache.cache_dir is None:
+            logger.warning(
+                "The HTTP cache is disabled: configure a cache_dir to store "
+                "responses of remote sources."
+            )
+        return http_cache
+
+    def on_config(self, config, *args, **kwargs):
+        self._restore_http_cache()
+        http_cache = self._get_http_cache()
+
+        if http_cache is not None:
+            self._previous_http_cache = HTTPDataReader.http_cache
+            self._configured = True
+            HTTPDataReader.http_cache = http_cache
+        return config
+
+    def _restore_http_cache(self) -> None:
+        if self._configured:
+            HTTPDataReader.http_cache = self._previous_http_cache
+            self._previous_http_cache = None
+            self._configured = False
+
+    def on_files(self, files: Files, *args, **kwargs):
+        start_build()
+        return files
+
+    def on_page_markdown(self, markdown, page, config, *args, **kwargs):
+        set_page_context(Path(page.file.abs_src_path), Path(config["docs_dir"]))
+        return markdown
+
+    def on_post_build(self, *args, **kwargs):
+        end_build()
+        self._restore_http_cache()
+
+    def on_build_error(self, *args, **kwargs):
+        end_build()
+        self._restore_http_cache()
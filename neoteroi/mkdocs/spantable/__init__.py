@@ -16,6 +16,7 @@ from markdown import Extension
 from markdown.blockprocessors import BlockProcessor
 
 from neoteroi.mkdocs.markdown import parse_props
+from neoteroi.mkdocs.markdown.processors import ClosingTagsIndex, pop_to_index
 from neoteroi.mkdocs.markdown.tables import read_table
 from neoteroi.mkdocs.markdown.tables.spantable import Cell, SpanTable
 
@@ -33,27 +34,12 @@ class SpanTableProcessor(BlockProcessor):
         else:
             return False
 
-    def find_closing_fragment_index(self, blocks) -> int:
-        for index, block in enumerate(blocks):
-            if self.END_RE.search(block):
-                return index
-        return -1
-
-    def pop_to_index(self, items, index):
-        """
-        Pops elements from a source list, and yields them up to the given index,
-        included.
+    def __init__(self, parser) -> None:
+        super().__init__(parser)
+        self._closing_tags = ClosingTagsIndex(self.END_RE)
 
-        Example:
-        pop_to_index([1, 2, 3, 4], 2) -> yields 1, 2, 3,
-        removing them from the source list.
-        """
-        i = 0
-
-        while i <= index:
-            block = items.pop(0)
-            yield block + "\n"
-            i += 1
+    def find_closing_fragment_index(self, blocks) -> int:
+        return self._closing_tags.find(blocks)
 
     def read_first_table(self, blocks) -> Optional[SpanTable]:
         """
@@ -81,7 +67,7 @@ class SpanTableProcessor(BlockProcessor):
 
         props = parse_props(blocks[0])
 
-        table_blocks = list(self.pop_to_index(blocks, closing_block_index))
+        table_blocks = pop_to_index(blocks, closing_block_index)
         span_table = self.read_first_table(table_blocks)
         assert span_table is not None, "A table is expected if test() -> True"
 
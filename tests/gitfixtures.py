@@ -0,0 +1,58 @@
+import os
+import subprocess
+from pathlib import Path
+
+import pytest
+
+CHARLIE = "Charlie Brown <charlie@example.org>"
+SALLY = "Sally Brown <sally@example.org>"
+LINUS = "Linus Van Pelt <linus@example.org>"
+
+
+def log_commit(sha: str, date: str, author: str) -> str:
+    """Returns the line describing a commit in the output of read_history."""
+    name, _, email = author.partition(" <")
+    return f"\x1e{sha}\x1f{date}T10:00:00+02:00\x1f{name}\x1f{email.rstrip('>')}"
+
+
+class GitRepository:
+    """
+    Throwaway Git repository used to test features that read the Git history.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+
+    def git(self, *args: str, author: str = "Charlie Brown <charlie@example.org>"):
+        name, _, email = author.partition(" <")
+        env = dict(
+            os.environ,
+            GIT_AUTHOR_NAME=name,
+            GIT_AUTHOR_EMAIL=email.rstrip(">"),
+            GIT_COMMITTER_NAME=name,
+            GIT_COMMITTER_EMAIL=email.rstrip(">"),
+        )
+        return subprocess.check_output(
+            ["git", *args], cwd=str(self.path), env=env
+        ).decode("utf8")
+
+    def write(self, file_path: str, text: str) -> None:
+        full_path = self.path / file_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.write_text(text, encoding="utf8")
+
+    def commit(self, file_path: str, text: str, author: str, message: str = "Edit"):
+        self.write(file_path, text)
+        self.git("add", "--all")
+        self.git("commit", "-q", "-m", message, author=author)
+
+    def head(self) -> str:
+        return self.git("rev-parse", "HEAD").strip()
+
+
+@pytest.fixture()
+def git_repo(tmp_path, monkeypatch):
+    repo = GitRepository(tmp_path)
+    repo.git("init", "-q")
+    monkeypatch.chdir(tmp_path)
+    return repo
@@ -1,14 +1,21 @@
 import textwrap
+from datetime import datetime
 from pathlib import Path
 from unittest.mock import Mock
 
 import pytest
-from mkdocs.structure.files import File
+from mkdocs.structure.files import File, Files
 from mkdocs.structure.pages import Page
 
-from neoteroi.mkdocs.contribs import ContribsPlugin
+from neoteroi.mkdocs.contribs import ContribsPlugin, DefaultContributionsReader
 from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
 from neoteroi.mkdocs.contribs.git import GitContributionsReader
+from neoteroi.mkdocs.contribs.html import (
+    ContribsViewOptions,
+    ContributionStatsRenderer,
+    render_contribution_stats,
+)
+from neoteroi.mkdocs.contribs.identities import IdentityResolver, Mailmap
 from neoteroi.mkdocs.contribs.txt import TXTContributionsReader
 from tests import get_resource_file_path
 
@@ -270,3 +277,214 @@ Lorem ipsum dolor sit amet.
 
 """
     )
+
+
+def test_default_reader_prefetch():
+    git_reader = Mock(ContributionsReader)
+    git_reader.get_contributors.side_effect = lambda file_path: [
+        Contributor("Charlie Brown", "charlie.brown@peanuts.com", len(file_path.name))
+    ]
+    git_reader.get_last_modified_date.return_value = datetime(2022, 10, 4)
+
+    reader = DefaultContributionsReader(git_reader)
+    file_paths = [Path(f"docs/{'a' * i}.md") for i in range(1, 20)]
+    reader.prefetch(file_paths, 4)
+
+    assert git_reader.get_contributors.call_count == len(file_paths)
+
+    for file_path in file_paths:
+        contributors = reader.get_contributors(file_path)
+        assert contributors == [
+            Contributor(
+                "Charlie Brown", "charlie.brown@peanuts.com", len(file_path.name)
+            )
+        ]
+        # the plugin modifies contributors: prefetched items must not be affected
+        contributors[0].count = 0
+        assert reader.get_contributors(file_path)[0].count == len(file_path.name)
+        assert reader.get_last_modified_date(file_path) == datetime(2022, 10, 4)
+
+    # prefetched information is used, Git is not queried again
+    assert git_reader.get_contributors.call_count == len(file_paths)
+    assert git_reader.get_last_modified_date.call_count == len(file_paths)
+
+
+def test_contribs_plugin_prefetch_on_files():
+    plugin = ContribsPlugin()
+    plugin.config = {"max_workers": 2, "exclude": ["excluded/*"]}
+
+    reader_mock = Mock(DefaultContributionsReader)
+    plugin._contribs_reader = reader_mock
+
+    files = Files(
+        [
+            File("index.md", "docs", "site", True),
+            File("excluded/foo.md", "docs", "site", True),
+            File("style.css", "docs", "site", True),
+        ]
+    )
+    assert plugin.on_files(files, config={}) is files
+
+    reader_mock.prefetch.assert_called_once()
+    file_paths, max_workers = reader_mock.prefetch.call_args[0]
+    assert list(file_paths) == [Path("docs/index.md")]
+    assert max_workers == 2
+
+
+def test_identity_resolver_merge_with():
+    resolver = IdentityResolver(
+        [
+            {"email": "charlie@personal.xyz", "merge_with": "charlie@neoteroi.xyz"},
+            {"email": "charlie@neoteroi.xyz", "image": "charlie.png"},
+            {"email": "bot@neoteroi.xyz", "ignore": True},
+        ]
+    )
+    contributors = [
+        Contributor("Charlie Brown", "charlie@personal.xyz", count=3),
+        Contributor("Bot", "bot@neoteroi.xyz", count=10),
+        Contributor("Charlie Brown", "charlie@neoteroi.xyz", count=2),
+        Contributor("Sally Brown", "sally@neoteroi.xyz", count=1),
+    ]
+
+    assert resolver.resolve(contributors) == [
+        Contributor("Charlie Brown", "charlie@neoteroi.xyz", 5, "charlie.png"),
+        Contributor("Sally Brown", "sally@neoteroi.xyz", 1),
+    ]
+    # the given objects are not modified
+    assert contributors[0].count == 3
+
+
+def test_identity_resolver_merge_by_configured_name():
+    resolver = IdentityResolver(
+        [{"email": "charlie@personal.xyz", "name": "Charlie Brown"}]
+    )
+
+    assert resolver.resolve(
+        [
+            Contributor("Charlie Brown", "charlie@neoteroi.xyz", count=2),
+            Contributor("charlie", "charlie@personal.xyz", count=3),
+        ]
+    ) == [Contributor("Charlie Brown", "charlie@neoteroi.xyz", count=5)]
+
+
+def test_identity_resolver_merge_by_configured_name_represented_by_name():
+    resolver = IdentityResolver([{"email": "sb@b.xyz", "name": "Sally Brown"}])
+
+    assert resolver.resolve(
+        [
+            Contributor("SB", "sb@b.xyz", count=2),
+            Contributor("Sally Brown", "sally@a.xyz", count=3),
+        ]
+    ) == [Contributor("Sally Brown", "sally@a.xyz", count=5)]
+
+
+def test_mailmap():
+    mailmap = Mailmap()
+    mailmap.parse(
+        textwrap.dedent(
+            """
+            # comment
+            Charlie Brown <charlie@neoteroi.xyz>
+            <sally@neoteroi.xyz> <sally@personal.xyz>
+            Linus Van Pelt <linus@neoteroi.xyz> <LINUS@personal.xyz>
+            Lucy Van Pelt <lucy@neoteroi.xyz> lucy <lucy@personal.xyz>
+            """
+        )
+    )
+
+    assert mailmap.resolve("charlie", "charlie@neoteroi.xyz") == (
+        "Charlie Brown",
+        "charlie@neoteroi.xyz",
+    )
+    assert mailmap.resolve("Sally", "sally@personal.xyz") == (
+        "Sally",
+        "sally@neoteroi.xyz",
+    )
+    assert mailmap.resolve("linus", "linus@Personal.xyz") == (
+        "Linus Van Pelt",
+        "linus@neoteroi.xyz",
+    )
+    assert mailmap.resolve("lucy", "lucy@personal.xyz") == (
+        "Lucy Van Pelt",
+        "lucy@neoteroi.xyz",
+    )
+    assert mailmap.resolve("Lucy", "lucy@example.xyz") == ("Lucy", "lucy@example.xyz")
+
+
+def test_identity_resolver_mailmap():
+    mailmap = Mailmap()
+    mailmap.parse("Charlie Brown <charlie@neoteroi.xyz> <charlie@personal.xyz>")
+    resolver = IdentityResolver(
+        [{"email": "charlie@neoteroi.xyz", "key": "charlie"}], mailmap
+    )
+
+    assert resolver.resolve(
+        [
+            Contributor("Charlie Brown", "charlie@neoteroi.xyz", count=2),
+            Contributor("charlie", "charlie@personal.xyz", count=3),
+        ]
+    ) == [Contributor("Charlie Brown", "charlie@neoteroi.xyz", count=5, key="charlie")]
+
+
+def test_txt_reader_cache(tmp_path, monkeypatch):
+    page_path = tmp_path / "example.md"
+    txt_path = tmp_path / "example.contribs.txt"
+    txt_path.write_text(
+        "Charlie Brown <charlie.brown@peanuts.com> (3)  # comment\n"
+        "Last modified time: 2022-10-04 21:01:05\n",
+        encoding="utf8",
+    )
+
+    parse_calls = []
+    parse_txt_file = TXTContributionsReader._parse_txt_file
+
+    def parse_txt_file_spy(self, txt_path):
+        parse_calls.append(txt_path)
+        return parse_txt_file(self, txt_path)
+
+    monkeypatch.setattr(TXTContributionsReader, "_parse_txt_file", parse_txt_file_spy)
+
+    reader = TXTContributionsReader()
+    expected_contributors = [
+        Contributor("Charlie Brown", "charlie.brown@peanuts.com", 3)
+    ]
+    assert reader.get_contributors(page_path) == expected_contributors
+    assert reader.get_last_modified_date(page_path) == datetime(2022, 10, 4, 21, 1, 5)
+    assert reader.get_contributors(tmp_path / "other.md") == []
+
+    # a new reader (e.g. after a rebuild in mkdocs serve) reuses parsed files
+    reader = TXTContributionsReader()
+    assert reader.get_contributors(page_path) == expected_contributors
+    assert len(parse_calls) == 1
+
+    txt_path.write_text("Sally Brown <sally.brown@peanuts.com> (1)\n", encoding="utf8")
+
+    reader = TXTContributionsReader()
+    assert reader.get_contributors(page_path) == [
+        Contributor("Sally Brown", "sally.brown@peanuts.com", 1)
+    ]
+    assert reader.get_last_modified_date(page_path) == datetime.min
+    assert len(parse_calls) == 2
+
+
+def test_contribution_stats_renderer():
+    renderer = ContributionStatsRenderer()
+    options = ContribsViewOptions(
+        "Contributors", "Last modified on", True, False, "%Y-%m-%d"
+    )
+    contributors = [Contributor("Charlie Brown", "charlie.brown@peanuts.com", 3)]
+
+    html = renderer.render(contributors, datetime(2022, 10, 4, 10), options)
+
+    assert html == render_contribution_stats(
+        contributors, datetime(2022, 10, 4, 10), options
+    )
+    # the same formatted date and contributors produce the same HTML
+    assert renderer.render(contributors, datetime(2022, 10, 4, 18), options) is html
+    other_html = renderer.render(
+        [Contributor("Charlie Brown", "charlie.brown@peanuts.com", 4)],
+        datetime(2022, 10, 4, 10),
+        options,
+    )
+    assert other_html != html
+    assert (renderer.hits, renderer.misses) == (1, 2)
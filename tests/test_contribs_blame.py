@@ -0,0 +1,124 @@
+from datetime import datetime
+from pathlib import Path
+
+from neoteroi.mkdocs.contribs import ContribsPlugin, blame
+from neoteroi.mkdocs.contribs.blame import (
+    BlameCache,
+    BlameContributionsReader,
+    build_blame_index,
+    read_blame,
+)
+from neoteroi.mkdocs.contribs.domain import Contributor
+
+from .gitfixtures import *  # noqa
+from .gitfixtures import CHARLIE, SALLY
+
+EXAMPLE_BLAME = [
+    "b" * 40 + " 2 2 2",
+    "author Sally Brown",
+    "author-mail <sally@example.org>",
+    "summary Edit",
+    "filename docs/index.md",
+    "c" * 40 + " 1 1 1",
+    "author Charlie Brown",
+    "author-mail <charlie@example.org>",
+    "boundary",
+    "filename docs/index.md",
+    "b" * 40 + " 4 4 1",
+    "filename docs/index.md",
+]
+
+
+def test_read_blame():
+    assert read_blame(EXAMPLE_BLAME) == [
+        ("Sally Brown", "sally@example.org", 3),
+        ("Charlie Brown", "charlie@example.org", 1),
+    ]
+
+
+def test_build_blame_index_cached_by_blob(git_repo, monkeypatch):
+    git_repo.commit("docs/index.md", "One\nTwo\nThree\n", CHARLIE)
+    git_repo.commit("docs/about.md", "About\n", CHARLIE)
+    git_repo.commit("docs/index.md", "One\nTwo\nThree\nFour\n", SALLY)
+
+    cache = BlameCache(Path(".cache"))
+    index = build_blame_index(Path("docs"), cache)
+
+    assert index == {
+        "docs/about.md": [("Charlie Brown", "charlie@example.org", 1)],
+        "docs/index.md": [
+            ("Charlie Brown", "charlie@example.org", 3),
+            ("Sally Brown", "sally@example.org", 1),
+        ],
+    }
+
+    blamed = []
+    blame_file = blame.blame_file
+
+    def blame_file_spy(file_path):
+        blamed.append(file_path.as_posix())
+        return blame_file(file_path)
+
+    monkeypatch.setattr(blame, "blame_file", blame_file_spy)
+    git_repo.commit("docs/about.md", "About\nUs\n", SALLY)
+
+    assert build_blame_index(Path("docs"), cache) == {
+        "docs/about.md": [
+            ("Charlie Brown", "charlie@example.org", 1),
+            ("Sally Brown", "sally@example.org", 1),
+        ],
+        "docs/index.md": index["docs/index.md"],
+    }
+    assert blamed == ["docs/about.md"]
+
+
+def test_build_blame_index_cached_by_path_and_blob(git_repo):
+    git_repo.commit("docs/a.md", "One\nTwo\n", CHARLIE)
+    git_repo.commit("docs/b.md", "One\n", SALLY)
+    git_repo.commit("docs/b.md", "One\nTwo\n", SALLY)
+
+    cache = BlameCache(Path(".cache"))
+    expected_index = {
+        "docs/a.md": [("Charlie Brown", "charlie@example.org", 2)],
+        "docs/b.md": [("Sally Brown", "sally@example.org", 2)],
+    }
+
+    # the two files have the same contents, but different histories
+    assert build_blame_index(Path("docs"), cache) == expected_index
+    assert build_blame_index(Path("docs"), cache) == expected_index
+
+
+def test_contribs_plugin_blame_mode(git_repo):
+    git_repo.commit("docs/index.md", "One\nTwo\n", CHARLIE)
+    git_repo.commit("docs/index.md", "One\nTwo\nThree\n", SALLY)
+    git_repo.commit("docs/index.md", "One\nTwo\nThree.\n", SALLY)
+
+    plugin = ContribsPlugin()
+    plugin.config = {"mode": "blame", "cache_dir": ""}
+    plugin.on_pre_build(config={})
+
+    reader = plugin._contribs_reader
+    assert isinstance(reader._git_reader, BlameContributionsReader)
+    assert reader.get_contributors(Path("docs/index.md")) == [
+        Contributor("Charlie Brown", "charlie@example.org", 2),
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+    last_commit_date = git_repo.git("log", "-1", "--format=%cI").strip()
+    assert reader.get_last_modified_date(
+        Path("docs/index.md")
+    ) == datetime.fromisoformat(last_commit_date)
+
+
+def test_contribs_plugin_blame_mode_ignores_txt_counts(git_repo):
+    git_repo.commit("docs/index.md", "One\nTwo\n", CHARLIE)
+    git_repo.write("docs/index.contribs.txt", "Linus <linus@example.org> (20)")
+
+    plugin = ContribsPlugin()
+    plugin.config = {"mode": "blame", "cache_dir": ""}
+    plugin.on_pre_build(config={})
+
+    # counts of .contribs.txt files are commits, and cannot be mixed with lines
+    assert plugin._contribs_reader.get_contributors(Path("docs/index.md")) == [
+        Contributor("Linus", "linus@example.org", 0),
+        Contributor("Charlie Brown", "charlie@example.org", 2),
+    ]
@@ -0,0 +1,153 @@
+import logging
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from neoteroi.mkdocs.contribs import ContribsPlugin, DefaultContributionsReader
+from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
+from neoteroi.mkdocs.contribs.fallback import FallbackContributionsReader, TimeBudget
+from neoteroi.mkdocs.contribs.git import (
+    AsyncGitContributionsReader,
+    GitContributionsReader,
+)
+
+from .gitfixtures import *  # noqa
+from .gitfixtures import CHARLIE, SALLY
+from .test_contribs_serve import serve_build
+
+
+def test_fallback_reader_on_timeout(git_repo, caplog):
+    git_repo.write("docs/index.contribs.txt", "Sally Brown <sally@example.org> (2)")
+
+    reader = Mock(ContributionsReader)
+    reader.get_last_modified_date.side_effect = subprocess.TimeoutExpired("git", 5)
+    fallback_reader = FallbackContributionsReader(reader, TimeBudget())
+    file_path = Path("docs/index.md")
+
+    assert fallback_reader.get_last_modified_date(file_path) == datetime.min
+    assert fallback_reader.get_contributors(file_path) == [
+        Contributor("Sally Brown", "sally@example.org", 2)
+    ]
+    # the page is not read again after it timed out
+    reader.get_contributors.assert_not_called()
+
+    fallback_reader.log_summary()
+    assert "docs/index.md: timed out after 5s" in caplog.text
+
+
+@pytest.mark.parametrize(
+    "git_reader_type", [GitContributionsReader, AsyncGitContributionsReader]
+)
+def test_prefetch_timeouts_are_not_run_again(git_repo, git_reader_type):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+    git_repo.write("docs/index.contribs.txt", "Sally Brown <sally@example.org> (2)")
+
+    git_reader = git_reader_type(timeout=1e-9)
+    reader = DefaultContributionsReader(git_reader)
+    file_path = Path("docs/index.md")
+    reader.prefetch([file_path], 2)
+
+    git_reader.get_contributors = Mock()
+    git_reader.get_last_modified_date = Mock()
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        reader.get_contributors(file_path)
+    with pytest.raises(subprocess.TimeoutExpired):
+        reader.get_last_modified_date(file_path)
+
+    # pages whose commands timed out while prefetching degrade straight away
+    fallback_reader = FallbackContributionsReader(reader, TimeBudget())
+    assert fallback_reader.get_contributors(file_path) == [
+        Contributor("Sally Brown", "sally@example.org", 2)
+    ]
+    assert fallback_reader.fallbacks == {file_path: "timed out after 1e-09s"}
+    git_reader.get_contributors.assert_not_called()
+    git_reader.get_last_modified_date.assert_not_called()
+
+
+def test_fallback_reader_budget_exceeded_uses_cache(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+    git_repo.commit("docs/other.md", "Other", CHARLIE)
+
+    plugin = ContribsPlugin()
+    plugin.config = {"time_budget": 60}
+    plugin.on_startup(command="serve", dirty=False)
+
+    expected = [Contributor("Charlie Brown", "charlie@example.org", 1)]
+    assert serve_build(plugin) == expected
+    assert isinstance(plugin._contribs_reader, FallbackContributionsReader)
+
+    # the information of the previous commit is used when the budget is exceeded
+    git_repo.commit("docs/index.md", "Hello, World", SALLY)
+    plugin.config["time_budget"] = 1e-9
+    plugin.on_pre_build(config={})
+    # reading another page uses the whole budget
+    plugin._contribs_reader.get_contributors(Path("docs/other.md"))
+    assert plugin._contribs_reader.get_contributors(Path("docs/index.md")) == expected
+    assert plugin._contribs_reader.fallbacks == {
+        Path("docs/index.md"): "time budget exceeded"
+    }
+
+
+def test_fallback_reader_budget_counts_only_time_spent_reading(git_repo):
+    git_repo.write("docs/index.contribs.txt", "Sally Brown <sally@example.org> (2)")
+
+    def get_contributors(file_path):
+        time.sleep(0.05)
+        return [Contributor("Charlie Brown", "charlie@example.org", 1)]
+
+    reader = Mock(ContributionsReader)
+    reader.get_contributors.side_effect = get_contributors
+    budget = TimeBudget(0.04)
+    fallback_reader = FallbackContributionsReader(reader, budget)
+
+    # time spent outside of the reader, e.g. rendering pages, is not counted
+    time.sleep(0.05)
+    assert budget.exceeded is False
+    assert fallback_reader.get_contributors(Path("docs/one.md")) == [
+        Contributor("Charlie Brown", "charlie@example.org", 1)
+    ]
+
+    assert budget.exceeded is True
+    assert fallback_reader.get_contributors(Path("docs/index.md")) == [
+        Contributor("Sally Brown", "sally@example.org", 2)
+    ]
+    assert reader.get_contributors.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "config,expected_fallback",
+    [
+        [{"timeout": 10}, True],
+        [{"time_budget": 60, "executor": "asyncio"}, True],
+        [{}, False],
+        [{"timeout": 10, "mode": "history"}, False],
+    ],
+)
+def test_contribs_plugin_fallback_reader(git_repo, config, expected_fallback):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+
+    plugin = ContribsPlugin()
+    plugin.config = config
+    plugin.on_pre_build(config={})
+
+    assert (
+        isinstance(plugin._contribs_reader, FallbackContributionsReader)
+        is expected_fallback
+    )
+
+
+def test_contribs_plugin_timeout_ignored_in_history_mode(git_repo, caplog):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+
+    plugin = ContribsPlugin()
+    plugin.config = {"timeout": 10, "mode": "history"}
+
+    with caplog.at_level(logging.INFO, logger="MARKDOWN"):
+        plugin.on_pre_build(config={})
+
+    assert "ignored in history mode" in caplog.text
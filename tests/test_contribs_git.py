@@ -0,0 +1,62 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from neoteroi.mkdocs.contribs.domain import Contributor
+from neoteroi.mkdocs.contribs.git import (
+    AsyncGitContributionsReader,
+    GitContributionsReader,
+)
+
+from .gitfixtures import *  # noqa
+from .gitfixtures import CHARLIE, SALLY
+
+
+def test_async_git_reader(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+    git_repo.commit("docs/index.md", "Hello World", SALLY)
+    git_repo.commit("docs/index.md", "Hello World!", SALLY)
+    git_repo.commit("docs/about.md", "About", CHARLIE)
+
+    file_paths = [Path("docs/index.md"), Path("docs/about.md")]
+    git_reader = GitContributionsReader()
+    async_reader = AsyncGitContributionsReader(timeout=30)
+    git_info = async_reader.read_many(file_paths, 2)
+
+    assert list(git_info) == file_paths
+
+    for file_path in file_paths:
+        contributors, last_modified_date = git_info[file_path]
+        assert contributors == git_reader.get_contributors(file_path)
+        assert last_modified_date == git_reader.get_last_modified_date(file_path)
+        assert async_reader.get_contributors(file_path) == contributors
+
+    assert git_info[Path("docs/index.md")][0] == [
+        Contributor("Sally Brown", "sally@example.org", 2),
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+    ]
+
+
+def test_async_git_reader_timeout(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+
+    async_reader = AsyncGitContributionsReader(timeout=1e-9)
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        async_reader.get_contributors(Path("docs/index.md"))
+
+    # files that cannot be read in time are excluded from the results
+    assert async_reader.read_many([Path("docs/index.md")], 1) == {}
+
+
+def test_git_reader_timeout(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+
+    reader = GitContributionsReader(timeout=1e-9)
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        reader.get_contributors(Path("docs/index.md"))
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        reader.get_last_modified_date(Path("docs/index.md"))
@@ -0,0 +1,247 @@
+import json
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from neoteroi.mkdocs.contribs import ContribsPlugin, history
+from neoteroi.mkdocs.contribs.domain import Contributor
+from neoteroi.mkdocs.contribs.git import GitContributionsReader
+from neoteroi.mkdocs.contribs.history import (
+    HistoryCache,
+    HistoryContributionsReader,
+    HistoryIndex,
+    build_history_index,
+    read_head_commit,
+    read_history,
+    update_history_index,
+)
+
+from .gitfixtures import *  # noqa
+from .gitfixtures import CHARLIE, LINUS, SALLY, log_commit
+
+EXAMPLE_LOG = [
+    "\x1ec3\x1f2022-10-04T21:01:05+02:00\x1fCharlie Brown\x1fcharlie@example.org\n",
+    "\n",
+    "M\tdocs/index.md\n",
+    "M\tdocs/about.md\n",
+    "\x1ec2\x1f2022-10-03T10:00:00+02:00\x1fSally Brown\x1fsally@example.org\n",
+    "\n",
+    "M\tdocs/index.md\n",
+    "\x1ec1\x1f2022-10-01T10:00:00+02:00\x1fSally Brown\x1fsally@example.org\n",
+    "\n",
+    "A\tdocs/index.md\n",
+    "A\tdocs/about.md\n",
+]
+
+
+def test_read_history():
+    index = read_history(EXAMPLE_LOG)
+
+    assert len(index) == 2
+    assert "docs/index.md" in index
+    assert Path("docs") / "about.md" in index
+
+    reader = HistoryContributionsReader(index)
+
+    assert reader.get_contributors(Path("docs/index.md")) == [
+        Contributor("Sally Brown", "sally@example.org", 2),
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+    ]
+    assert reader.get_last_modified_date(Path("docs/index.md")) == datetime(
+        2022, 10, 4, 21, 1, 5, tzinfo=timezone(timedelta(hours=2))
+    )
+
+
+def test_history_reader_missing_file():
+    reader = HistoryContributionsReader(read_history(EXAMPLE_LOG))
+
+    assert reader.get_contributors(Path("docs/missing.md")) == []
+    assert reader.get_last_modified_date(Path("docs/missing.md")) == datetime.min
+
+
+def test_build_history_index(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+    git_repo.commit("docs/index.md", "Hello World", SALLY)
+    git_repo.commit("docs/about.md", "About", SALLY)
+    git_repo.commit("README.md", "Outside of docs", SALLY)
+
+    reader = HistoryContributionsReader(build_history_index(Path("docs")))
+
+    assert len(reader.index) == 2
+    assert reader.get_contributors(Path("docs/index.md")) == [
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+    assert reader.get_contributors(Path("docs/about.md")) == [
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+
+
+def test_contribs_plugin_history_mode(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+
+    plugin = ContribsPlugin()
+    plugin.config = {"mode": "history"}
+    plugin.on_pre_build(config={})
+
+    assert isinstance(plugin._contribs_reader._git_reader, HistoryContributionsReader)
+
+
+def test_history_index_serialization():
+    index = read_history(EXAMPLE_LOG, "c3")
+    copy = HistoryIndex.from_dict(json.loads(json.dumps(index.to_dict())))
+
+    assert copy.commit == "c3"
+    assert dict(copy) == dict(index)
+
+
+def test_update_history_index_incremental(git_repo, monkeypatch):
+    cache = HistoryCache(git_repo.path / ".cache")
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+
+    index = update_history_index(Path("docs"), cache)
+    assert index.commit == git_repo.head()
+
+    git_repo.commit("docs/index.md", "Hello World", SALLY)
+    git_repo.commit("docs/about.md", "About", SALLY)
+
+    calls = []
+    original = history.build_history_index
+
+    def build_history_index_spy(*args, **kwargs):
+        calls.append(kwargs.get("since"))
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(history, "build_history_index", build_history_index_spy)
+    index = update_history_index(Path("docs"), cache)
+
+    assert len(calls) == 1
+    assert calls[0] is not None
+    assert index.commit == git_repo.head()
+    assert cache.load(Path("docs")).to_dict() == index.to_dict()
+
+    reader = HistoryContributionsReader(index)
+    assert reader.get_contributors(Path("docs/index.md")) == [
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+    assert reader.get_contributors(Path("docs/about.md")) == [
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+
+
+def test_update_history_index_rewritten_history(git_repo):
+    cache = HistoryCache(git_repo.path / ".cache")
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+    git_repo.commit("docs/index.md", "Hello World", CHARLIE)
+
+    update_history_index(Path("docs"), cache)
+
+    # rewrite the last commit with a different author
+    git_repo.git("reset", "-q", "--hard", "HEAD~1")
+    git_repo.commit("docs/index.md", "Hello World!", SALLY)
+
+    index = update_history_index(Path("docs"), cache)
+    reader = HistoryContributionsReader(index)
+
+    assert reader.get_contributors(Path("docs/index.md")) == [
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+
+
+def test_read_history_renames():
+    index = read_history(
+        [
+            log_commit("c4", "2022-10-04", CHARLIE),
+            "M\tdocs/guide.md",
+            log_commit("c3", "2022-10-03", SALLY),
+            "R090\tdocs/intro.md\tdocs/guide.md",
+            log_commit("c2", "2022-10-02", SALLY),
+            "M\tdocs/intro.md",
+            # a different file that had the name guide.md before the rename
+            "D\tdocs/guide.md",
+            log_commit("c1", "2022-10-01", LINUS),
+            "A\tdocs/intro.md",
+            "A\tdocs/guide.md",
+        ]
+    )
+    reader = HistoryContributionsReader(index)
+
+    assert "docs/intro.md" not in index
+    assert index.aliases.resolve("docs/intro.md") == "docs/guide.md"
+    assert index.aliases.resolve("docs/guide.md") is None
+    assert reader.get_contributors(Path("docs/guide.md")) == [
+        Contributor("Sally Brown", "sally@example.org", 2),
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+        Contributor("Linus Van Pelt", "linus@example.org", 1),
+    ]
+
+
+def test_read_history_swapped_names():
+    index = read_history(
+        [
+            log_commit("c2", "2022-10-02", SALLY),
+            "R100\tdocs/a.md\tdocs/b.md",
+            "R100\tdocs/b.md\tdocs/a.md",
+            log_commit("c1", "2022-10-01", CHARLIE),
+            "M\tdocs/a.md",
+        ]
+    )
+    reader = HistoryContributionsReader(index)
+
+    assert reader.get_contributors(Path("docs/b.md")) == [
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+    assert reader.get_contributors(Path("docs/a.md")) == [
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+
+
+def test_build_history_index_follows_renames(git_repo):
+    git_repo.commit("docs/intro.md", "Lorem ipsum dolor sit amet\n" * 20, CHARLIE)
+    git_repo.git("mv", "docs/intro.md", "docs/guide.md")
+    git_repo.git("commit", "-q", "-m", "Rename", author=SALLY)
+    git_repo.commit("docs/guide.md", "Lorem ipsum dolor sit amet\n" * 21, SALLY)
+
+    index = build_history_index(Path("docs"))
+
+    assert HistoryContributionsReader(index).get_contributors(
+        Path("docs/guide.md")
+    ) == GitContributionsReader().get_contributors(Path("docs/guide.md"))
+
+
+def test_update_history_index_renames(git_repo):
+    cache = HistoryCache(git_repo.path / ".cache")
+    git_repo.commit("docs/intro.md", "Lorem ipsum dolor sit amet\n" * 20, CHARLIE)
+    update_history_index(Path("docs"), cache)
+
+    git_repo.git("mv", "docs/intro.md", "docs/guide.md")
+    git_repo.git("commit", "-q", "-m", "Rename", author=SALLY)
+
+    index = update_history_index(Path("docs"), cache)
+
+    assert "docs/intro.md" not in index
+    assert HistoryContributionsReader(index).get_contributors(
+        Path("docs/guide.md")
+    ) == [
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+
+
+def test_read_head_commit(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+    assert read_head_commit() == git_repo.head()
+
+    # packed references are read running Git
+    git_repo.git("pack-refs", "--all")
+    assert read_head_commit() == git_repo.head()
+
+
+def test_read_head_commit_outside_repository(tmp_path, monkeypatch, capfd):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GIT_CEILING_DIRECTORIES", str(tmp_path.parent))
+    assert read_head_commit() is None
+    # errors of Git are not printed at each build
+    assert capfd.readouterr().err == ""
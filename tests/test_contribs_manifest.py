@@ -0,0 +1,81 @@
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from neoteroi.mkdocs.contribs import ContribsPlugin
+from neoteroi.mkdocs.contribs.__main__ import cli
+from neoteroi.mkdocs.contribs.domain import Contributor
+from neoteroi.mkdocs.contribs.git import GitContributionsReader
+from neoteroi.mkdocs.contribs.history import HistoryContributionsReader, read_history
+from neoteroi.mkdocs.contribs.manifest import (
+    ManifestContributionsReader,
+    create_manifest,
+    read_manifest,
+    write_manifest,
+)
+
+from .gitfixtures import *  # noqa
+from .gitfixtures import CHARLIE, SALLY
+from .test_contribs_history import EXAMPLE_LOG
+
+
+def test_export_manifest(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+    git_repo.commit("docs/index.md", "Hello World", SALLY)
+    git_repo.commit("docs/about.md", "About", SALLY)
+    git_repo.write("docs/new.md", "Not committed, yet")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["export", "--output", "out/contribs.json"])
+
+    assert result.exit_code == 0, result.output
+    assert "Exported 2 pages" in result.output
+
+    manifest = read_manifest(Path("out/contribs.json"))
+    assert manifest["commit"] == git_repo.head()
+
+    reader = ManifestContributionsReader(manifest)
+    git_reader = GitContributionsReader()
+
+    for file_path in (Path("docs/index.md"), Path("docs/about.md")):
+        assert reader.get_contributors(file_path) == git_reader.get_contributors(
+            file_path
+        )
+        assert reader.get_last_modified_date(
+            file_path
+        ) == git_reader.get_last_modified_date(file_path)
+
+    assert reader.get_contributors(Path("docs/new.md")) == []
+    assert reader.get_last_modified_date(Path("docs/new.md")) == datetime.min
+
+    plugin = ContribsPlugin()
+    plugin.config = {"manifest": "out/contribs.json"}
+    plugin.on_pre_build(config={})
+
+    assert isinstance(plugin._contribs_reader, ManifestContributionsReader)
+
+
+def test_export_manifest_default_mode(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+
+    result = CliRunner().invoke(
+        cli, ["export", "--mode", "default", "--output", "contribs.json"]
+    )
+
+    assert result.exit_code == 0, result.output
+    reader = ManifestContributionsReader.from_file(Path("contribs.json"))
+    assert reader.get_contributors(Path("docs/index.md")) == [
+        Contributor("Charlie Brown", "charlie@example.org", 1)
+    ]
+
+
+def test_manifest_msgpack(tmp_path):
+    pytest.importorskip("msgpack")
+    reader = HistoryContributionsReader(read_history(EXAMPLE_LOG))
+    manifest = create_manifest(reader, [Path("docs/index.md")], "c3")
+
+    write_manifest(manifest, tmp_path / "contribs.msgpack")
+
+    assert read_manifest(tmp_path / "contribs.msgpack") == manifest
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from mkdocs.structure.files import File, Files
+from mkdocs.structure.pages import Page
+
+from neoteroi.mkdocs.contribs import ContribsPlugin
+from neoteroi.mkdocs.contribs.domain import Contributor
+from neoteroi.mkdocs.contribs.history import read_history
+from neoteroi.mkdocs.contribs.overview import build_site_overview
+
+from .gitfixtures import *  # noqa
+from .gitfixtures import CHARLIE, LINUS, SALLY, log_commit
+
+
+def test_build_site_overview():
+    index = read_history(
+        [
+            log_commit("c3", "2022-10-06", LINUS),
+            "M\tdocs/guide/one.md",
+            "M\tdocs/index.md",
+            log_commit("c2", "2022-10-05", SALLY),
+            "A\tdocs/guide/one.md",
+            "A\tdocs/guide/deleted.md",
+            log_commit("c1", "2022-10-04", CHARLIE),
+            "A\tdocs/index.md",
+            "A\tdocs/api/two.md",
+        ]
+    )
+    file_paths = [
+        Path("docs/index.md"),
+        Path("docs/guide/one.md"),
+        Path("docs/api/two.md"),
+    ]
+
+    overview = build_site_overview(index, file_paths, recent_pages_count=2)
+
+    # commits that modified several pages are counted once
+    assert overview.total.get_contributors() == [
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+        Contributor("Linus Van Pelt", "linus@example.org", 1),
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+    assert overview.total.pages_count == 3
+    assert list(overview.sections) == ["", "api", "guide"]
+    assert overview.sections["guide"].get_contributors() == [
+        Contributor("Linus Van Pelt", "linus@example.org", 1),
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+    assert overview.sections["api"].last_modified_date == datetime(
+        2022, 10, 4, 10, tzinfo=timezone(timedelta(hours=2))
+    )
+    assert [file_path for file_path, _ in overview.recent_pages] == [
+        "docs/index.md",
+        "docs/guide/one.md",
+    ]
+
+
+def test_contribs_plugin_overview_tag(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+    git_repo.commit("docs/guide/one.md", "One", SALLY)
+
+    plugin = ContribsPlugin()
+    plugin.config = {
+        "mode": "history",
+        "cache_dir": "",
+        "contributors_label": "Contributors",
+        "last_modified_label": "Last modified on",
+        "show_last_modified_time": True,
+        "show_contributors_title": False,
+        "time_format": "%Y-%m-%d",
+    }
+    plugin.on_pre_build(config={})
+    files = Files(
+        [
+            File("index.md", "docs", "site", True),
+            File("guide/one.md", "docs", "site", True),
+            File("guide/contributors.md", "docs", "site", True),
+        ]
+    )
+    plugin.on_files(files, config={})
+
+    page_file = files.get_file_from_path("guide/contributors.md")
+    page = Page("Contributors", page_file, {})
+    result = plugin.on_page_markdown(
+        "# Contributors\n\n::contribs-overview::\n", page=page
+    )
+
+    assert "::contribs-overview::" not in result
+    assert '<div class="nt-contribs-overview">' in result
+    assert "Contributors (2)" in result
+    assert '<p class="nt-contribs-section-title">guide (1)</p>' in result
+    assert "- [guide/one.md](one.md)" in result
+    assert "- [index.md](../index.md)" in result
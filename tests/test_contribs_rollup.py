@@ -0,0 +1,95 @@
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import Mock
+
+from mkdocs.structure.files import File, Files
+
+from neoteroi.mkdocs.contribs import ContribsPlugin
+from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
+from neoteroi.mkdocs.contribs.rollup import RollupContributionsReader, build_path_trie
+
+from .gitfixtures import *  # noqa
+from .gitfixtures import CHARLIE, SALLY
+
+
+def test_section_rollup_not_stacked_by_repeated_on_files(git_repo):
+    git_repo.commit("docs/guide/index.md", "Guide", CHARLIE)
+    git_repo.commit("docs/guide/one.md", "One", SALLY)
+
+    plugin = ContribsPlugin()
+    plugin.config = {"section_rollup": True}
+    plugin.on_startup(command="serve", dirty=False)
+    plugin.on_pre_build(config={})
+    files = Files(
+        [
+            File("guide/index.md", "docs", "site", True),
+            File("guide/one.md", "docs", "site", True),
+        ]
+    )
+    expected = [
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+
+    for _ in range(3):
+        plugin.on_files(files, config={})
+        assert isinstance(plugin._contribs_reader, RollupContributionsReader)
+        assert not isinstance(plugin._contribs_reader.reader, RollupContributionsReader)
+        assert (
+            plugin._contribs_reader.get_contributors(Path("docs/guide/index.md"))
+            == expected
+        )
+
+
+def test_rollup_contributions_reader():
+    information = {
+        "docs/index.md": ([Contributor("Charlie", "charlie@peanuts.com", 1)], 1),
+        "docs/a/index.md": ([Contributor("Sally", "sally@peanuts.com", 2)], 2),
+        "docs/a/one.md": ([Contributor("Charlie", "charlie@peanuts.com", 3)], 5),
+        "docs/a/b/two.md": (
+            [
+                Contributor("Sally", "sally@peanuts.com", 1),
+                Contributor("Linus", "linus@peanuts.com", 4),
+            ],
+            3,
+        ),
+        "docs/c/README.md": ([], 0),
+    }
+
+    def get_last_modified_date(file_path):
+        day = information[file_path.as_posix()][1]
+        return datetime(2022, 10, day) if day else datetime.min
+
+    reader = Mock(ContributionsReader)
+    reader.get_contributors.side_effect = lambda path: information[path.as_posix()][0]
+    reader.get_last_modified_date.side_effect = get_last_modified_date
+
+    file_paths = [Path(file_path) for file_path in information]
+    rollup_reader = RollupContributionsReader(
+        reader, build_path_trie(reader, file_paths)
+    )
+
+    assert rollup_reader.get_contributors(Path("docs/a/index.md")) == [
+        Contributor("Linus", "linus@peanuts.com", 4),
+        Contributor("Charlie", "charlie@peanuts.com", 3),
+        Contributor("Sally", "sally@peanuts.com", 3),
+    ]
+    assert rollup_reader.get_last_modified_date(Path("docs/a/index.md")) == datetime(
+        2022, 10, 5
+    )
+    assert rollup_reader.get_contributors(Path("docs/index.md")) == [
+        Contributor("Charlie", "charlie@peanuts.com", 4),
+        Contributor("Linus", "linus@peanuts.com", 4),
+        Contributor("Sally", "sally@peanuts.com", 3),
+    ]
+    # pages that are not index pages are not aggregated
+    assert rollup_reader.get_contributors(Path("docs/a/b/two.md")) == [
+        Contributor("Linus", "linus@peanuts.com", 4),
+        Contributor("Sally", "sally@peanuts.com", 1),
+    ]
+    # the information of each page is read once
+    assert reader.get_contributors.call_count == len(information) - 1
+    # sections without committed pages
+    assert rollup_reader.get_last_modified_date(Path("docs/c/README.md")) == (
+        datetime.min
+    )
@@ -0,0 +1,105 @@
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from neoteroi.mkdocs.contribs import ContribsPlugin
+from neoteroi.mkdocs.contribs.cache import CachedContributionsReader
+from neoteroi.mkdocs.contribs.domain import ContributionsReader, Contributor
+
+from .gitfixtures import *  # noqa
+from .gitfixtures import CHARLIE, SALLY
+
+
+def serve_build(plugin: ContribsPlugin):
+    plugin.on_pre_build(config={})
+    return plugin._contribs_reader.get_contributors(Path("docs/index.md"))
+
+
+@pytest.mark.parametrize("mode", ["default", "history"])
+def test_serve_cache_reused_across_rebuilds(git_repo, mode):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+
+    plugin = ContribsPlugin()
+    plugin.config = {"mode": mode}
+    plugin.on_startup(command="serve", dirty=False)
+
+    expected = [Contributor("Charlie Brown", "charlie@example.org", 1)]
+    assert serve_build(plugin) == expected
+    assert isinstance(plugin._contribs_reader, CachedContributionsReader)
+    assert serve_build(plugin) == expected
+    assert (plugin._cache.hits, plugin._cache.misses) == (1, 1)
+
+    # a new commit invalidates the cache
+    git_repo.commit("docs/index.md", "Hello, World", SALLY)
+    assert serve_build(plugin) == [
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+    assert (plugin._cache.hits, plugin._cache.misses) == (1, 2)
+
+
+def test_serve_cache_invalidated_by_contribs_txt(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+
+    plugin = ContribsPlugin()
+    plugin.config = {}
+    plugin.on_startup(command="serve", dirty=False)
+
+    assert serve_build(plugin) == [
+        Contributor("Charlie Brown", "charlie@example.org", 1)
+    ]
+
+    git_repo.write("docs/index.contribs.txt", "Linus Van Pelt <linus@example.org> (2)")
+    assert serve_build(plugin) == [
+        Contributor("Linus Van Pelt", "linus@example.org", 2),
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+    ]
+    assert plugin._cache.misses == 2
+
+
+@pytest.mark.parametrize("mode", ["default", "history"])
+def test_serve_without_cache_reads_changes(git_repo, mode):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+
+    plugin = ContribsPlugin()
+    plugin.config = {"mode": mode, "serve_cache": False}
+    plugin.on_startup(command="serve", dirty=False)
+
+    assert serve_build(plugin) == [
+        Contributor("Charlie Brown", "charlie@example.org", 1)
+    ]
+
+    # new commits and new .contribs.txt files are read by the next build
+    git_repo.commit("docs/index.md", "Hello, World", SALLY)
+    git_repo.write("docs/index.contribs.txt", "Linus Van Pelt <linus@example.org> (2)")
+    assert serve_build(plugin) == [
+        Contributor("Linus Van Pelt", "linus@example.org", 2),
+        Contributor("Charlie Brown", "charlie@example.org", 1),
+        Contributor("Sally Brown", "sally@example.org", 1),
+    ]
+
+
+def test_serve_cache_not_used_by_build(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+
+    plugin = ContribsPlugin()
+    plugin.config = {}
+    plugin.on_startup(command="build", dirty=False)
+    plugin.on_pre_build(config={})
+
+    assert not isinstance(plugin._contribs_reader, CachedContributionsReader)
+
+
+def test_contribs_plugin_reader_factory(git_repo):
+    git_repo.commit("docs/index.md", "Hello", CHARLIE)
+    reader = Mock(ContributionsReader)
+    reader.get_contributors.return_value = []
+
+    plugin = ContribsPlugin(reader_factory=lambda: reader)
+    plugin.config = {}
+    plugin.on_pre_build(config={})
+
+    # the reader of each build is created by the factory
+    assert plugin._contribs_reader is reader
+    assert serve_build(plugin) == []
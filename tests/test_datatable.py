@@ -0,0 +1,148 @@
+import json
+import re
+import xml.etree.ElementTree as etree
+
+import markdown
+import pytest
+
+from neoteroi.mkdocs.datatable import DataTableExtension
+from neoteroi.mkdocs.markdown.tables import table_from_items
+
+
+def get_rows(count: int) -> str:
+    return "\n".join(
+        ["title,url"] + [f"Item {index},/items/{index}" for index in range(count)]
+    )
+
+
+def render(text: str, **config) -> etree.Element:
+    html = markdown.markdown(text, extensions=[DataTableExtension(**config)])
+    # the pager script is not valid XML
+    html = re.sub(r"<script>.*?</script>", "", html, flags=re.DOTALL)
+    return etree.fromstring(f"<root>{html}</root>")
+
+
+def test_datatable_server_pagination():
+    root = render(f'::datatable:: csv page-size="2"\n{get_rows(5)}\n::/datatable::')
+
+    element = root.find("div")
+    assert element is not None
+    assert element.get("data-pages") == "3"
+    assert [th.text for th in element.iter("th")] == ["title", "url"]
+
+    bodies = element.findall("table/tbody")
+    assert [len(tbody) for tbody in bodies] == [2, 2, 1]
+    assert [tbody.get("hidden") for tbody in bodies] == [None, "hidden", "hidden"]
+    assert element.find("nav/span").text == "1 / 3"
+    assert element.find("script[@type='application/json']") is None
+
+
+def test_datatable_pager_script():
+    html = markdown.markdown(
+        f'::datatable:: csv page-size="2"\n{get_rows(3)}\n::/datatable::',
+        extensions=[DataTableExtension()],
+    )
+    assert "document.currentScript.parentElement" in html
+
+    html = markdown.markdown(
+        f"::datatable:: csv\n{get_rows(3)}\n::/datatable::",
+        extensions=[DataTableExtension()],
+    )
+    assert "<script" not in html
+
+
+def test_datatable_client_pagination():
+    root = render(
+        f'::datatable:: csv page-size="2" pagination="client"\n'
+        f"{get_rows(5)}\n::/datatable::"
+    )
+
+    element = root.find("div")
+    bodies = element.findall("table/tbody")
+    assert [len(tbody) for tbody in bodies] == [2]
+
+    island = element.find("script[@type='application/json']")
+    assert json.loads(island.text) == [
+        ["Item 2", "/items/2"],
+        ["Item 3", "/items/3"],
+        ["Item 4", "/items/4"],
+    ]
+
+
+def test_datatable_renders_at_most_max_rows(tmp_path):
+    source = tmp_path / "items.csv"
+    source.write_text(get_rows(1000), encoding="utf8")
+
+    root = render(f"[datatable({source})]", page_size=10, max_pages=3)
+
+    element = root.find("div")
+    assert element.get("data-pages") == "3"
+    assert sum(len(tbody) for tbody in element.findall("table/tbody")) == 30
+    assert element.find("p").text == "Only the first 30 rows are displayed."
+
+
+def test_datatable_list_of_lists_headers_are_not_rows(tmp_path):
+    source = tmp_path / "items.json"
+    source.write_text(
+        json.dumps(
+            [["title", "url"]] + [[f"Item {i}", f"/items/{i}"] for i in range(5)]
+        ),
+        encoding="utf8",
+    )
+
+    root = render(f"[datatable({source})]", page_size=2, max_pages=2)
+
+    element = root.find("div")
+    assert [th.text for th in element.iter("th")] == ["title", "url"]
+    assert sum(len(tbody) for tbody in element.findall("table/tbody")) == 4
+    assert element.find("p").text == "Only the first 4 rows are displayed."
+
+    # offsets skip rows, not headers
+    root = render(f'[datatable offset="3"({source})]')
+
+    assert [th.text for th in root.iter("th")] == ["title", "url"]
+    assert [td.text for td in root.iter("td")] == [
+        "Item 3",
+        "/items/3",
+        "Item 4",
+        "/items/4",
+    ]
+
+
+def test_datatable_cells_are_not_processed_as_markdown():
+    root = render("::datatable:: csv\na,b\n*x*,<y>\n::/datatable::")
+
+    assert [td.text for td in root.iter("td")] == ["*x*", "<y>"]
+
+
+@pytest.mark.parametrize(
+    "props", ['pagination="pages"', 'page-size="0"', 'page-size="ten"']
+)
+def test_datatable_invalid_options(props):
+    root = render(f"::datatable:: csv {props}\na,b\n1,2\n::/datatable::")
+
+    assert root.find("div").get("class") == "nt-error"
+
+
+@pytest.mark.parametrize(
+    "items,expected_headers,expected_records",
+    [
+        [[], (), ()],
+        [
+            [{"a": 1, "b": None}, {"b": 2, "c": True}],
+            ("a", "b", "c"),
+            (("1", "", ""), ("", "2", "True")),
+        ],
+        [[["a", "b"], [1, 2, 3], [4]], ("a", "b"), (("1", "2"), ("4", ""))],
+    ],
+)
+def test_table_from_items(items, expected_headers, expected_records):
+    table = table_from_items(items)
+
+    assert table.headers == expected_headers
+    assert table.records == expected_records
+
+
+def test_table_from_items_invalid():
+    with pytest.raises(TypeError):
+        table_from_items([{"a": 1}, "b"])
@@ -0,0 +1,106 @@
+import os
+
+import pytest
+from mkdocs.structure.files import File, Files
+from mkdocs.structure.pages import Page
+
+from neoteroi.mkdocs.markdown.data import files
+from neoteroi.mkdocs.markdown.data.files import (
+    FileReader,
+    end_build,
+    read_mapped_file,
+    set_page_context,
+    start_build,
+)
+from neoteroi.mkdocs.sources import SourcesPlugin
+
+
+@pytest.fixture
+def docs_dir(tmp_path):
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "shared.yaml").write_text("- shared\n", encoding="utf8")
+    (tmp_path / "guide").mkdir()
+    (tmp_path / "guide" / "local.yaml").write_text("- local\n", encoding="utf8")
+    yield tmp_path
+    end_build()
+    files.content_cache.clear()
+
+
+def test_file_reader_resolves_relative_to_page_and_docs_dir(docs_dir):
+    reader = FileReader()
+    assert reader.test("local.yaml") is False
+
+    set_page_context(docs_dir / "guide" / "index.md", docs_dir)
+
+    assert reader.read("local.yaml") == "- local\n"
+    assert reader.read("./local.yaml") == "- local\n"
+    assert reader.read("data/shared.yaml") == "- shared\n"
+    assert reader.test("missing.yaml") is False
+    assert reader.test("guide") is False
+
+
+def test_file_reader_caches_stat_results_per_build(docs_dir, monkeypatch):
+    calls = []
+    stat = os.stat
+
+    def counting_stat(path):
+        calls.append(path)
+        return stat(path)
+
+    monkeypatch.setattr(files.os, "stat", counting_stat)
+    set_page_context(docs_dir / "guide" / "index.md", docs_dir)
+    start_build()
+
+    reader = FileReader()
+    for _ in range(3):
+        assert reader.test("local.yaml")
+        assert reader.read("local.yaml") == "- local\n"
+
+    # the current working directory and the page folder are checked once
+    assert len(calls) == 2
+
+    # the next build checks files again
+    start_build()
+    reader.test("local.yaml")
+    assert len(calls) == 4
+
+
+def test_file_reader_content_cache_invalidated_by_mtime(docs_dir):
+    file_path = docs_dir / "guide" / "local.yaml"
+    set_page_context(file_path, docs_dir)
+    reader = FileReader()
+
+    assert reader.read("local.yaml") == "- local\n"
+    assert reader.read("local.yaml") == "- local\n"
+
+    file_path.write_text("- changed\n", encoding="utf8")
+    os.utime(file_path, ns=(1, 1))
+    assert reader.read("local.yaml") == "- changed\n"
+
+
+def test_file_reader_reads_large_files_with_mmap(docs_dir, monkeypatch):
+    file_path = docs_dir / "large.csv"
+    file_path.write_bytes("a,b\r\nà,è\r\n".encode("utf8"))
+
+    monkeypatch.setattr(files, "MMAP_THRESHOLD", 1)
+    assert FileReader().read(str(file_path)) == "a,b\nà,è\n"
+    assert read_mapped_file(file_path) == "a,b\nà,è\n"
+
+
+def test_file_sources_plugin(docs_dir):
+    plugin = SourcesPlugin()
+    page_file = File("guide/index.md", str(docs_dir), str(docs_dir / "site"), True)
+    files_ = Files([page_file])
+    page = Page(None, page_file, {})
+
+    assert plugin.on_files(files_, config={}) is files_
+    assert files.stat_cache.enabled is True
+
+    plugin.on_page_markdown("", page, {"docs_dir": str(docs_dir)})
+    assert files.page_context.page_dir == docs_dir / "guide"
+    assert files.page_context.docs_dir == docs_dir
+    assert FileReader().read("local.yaml") == "- local\n"
+
+    plugin.on_post_build(config={})
+    assert files.stat_cache.enabled is False
+    assert files.page_context.page_dir is None
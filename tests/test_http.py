@@ -1,11 +1,20 @@
+import httpx
 import markdown
 import pytest
+from mkdocs.structure.files import File, Files
 
+from neoteroi.mkdocs.markdown.data import web
 from neoteroi.mkdocs.markdown.data.web import (
     FailedRequestError,
+    HTTPCache,
     HTTPDataReader,
+    clear_prefetched,
     ensure_success,
+    extract_http_sources,
+    prefetch,
 )
+from neoteroi.mkdocs.prefetch import HTTPPrefetchPlugin
+from neoteroi.mkdocs.sources import SourcesPlugin
 from neoteroi.mkdocs.timeline import TimelineExtension
 from tests.test_timeline import EXAMPLE_1
 
@@ -36,3 +45,191 @@ def test_timeline_from_url():
     """
     html = markdown.markdown(example, extensions=[TimelineExtension(priority=100)])
     assert html.strip() == EXAMPLE_1.strip()
+
+
+def test_extract_http_sources():
+    markdown_text = f"""
+[cards(./cards.yaml)]
+
+[timeline json({BASE_URL}/timeline-1.json)]
+
+[link]({BASE_URL}/not-a-source.json)
+
+[gantt({BASE_URL}/gantt.yaml)] [cards({BASE_URL}/timeline-1.json)]
+
+[datatable page-size="20"({BASE_URL}/items.csv)]
+"""
+    assert extract_http_sources(markdown_text) == [
+        f"{BASE_URL}/timeline-1.json",
+        f"{BASE_URL}/gantt.yaml",
+        f"{BASE_URL}/items.csv",
+    ]
+
+
+def test_prefetch(monkeypatch):
+    clear_prefetched()
+    results = prefetch(
+        [f"{BASE_URL}/timeline-1.json", f"{BASE_URL}/missing-file.json"],
+        max_concurrency=2,
+    )
+
+    # failed requests are not prefetched, they fail again when read
+    assert list(results) == [f"{BASE_URL}/timeline-1.json"]
+
+    def get(url):
+        raise AssertionError("Prefetched sources must not be requested again")
+
+    reader = HTTPDataReader()
+    monkeypatch.setattr(reader, "get", get)
+    assert '"title": "Zero"' in reader.read(f"{BASE_URL}/timeline-1.json")
+    clear_prefetched()
+
+
+def test_prefetch_plugin(tmp_path):
+    (tmp_path / "index.md").write_text(
+        f"# Example\n\n[timeline({BASE_URL}/timeline-1.json)]\n", encoding="utf8"
+    )
+    plugin = HTTPPrefetchPlugin()
+    plugin.config = {"max_concurrency": 4, "tags": ["timeline"]}
+
+    files = Files([File("index.md", str(tmp_path), str(tmp_path / "site"), True)])
+    assert plugin.on_files(files, config={}) is files
+    assert list(web._prefetched) == [f"{BASE_URL}/timeline-1.json"]
+    clear_prefetched()
+
+
+class RecordingHTTPDataReader(HTTPDataReader):
+    def __init__(self, http_cache) -> None:
+        self.http_cache = http_cache
+        self.responses = []
+
+    def get(self, url, headers=None):
+        response = super().get(url, headers)
+        self.responses.append(response)
+        return response
+
+
+def test_http_cache_revalidation(tmp_path):
+    url = f"{BASE_URL}/timeline-1.json"
+    reader = RecordingHTTPDataReader(HTTPCache(tmp_path))
+
+    text = reader.read(url)
+    assert '"title": "Zero"' in text
+    assert reader.responses[0].status_code == 200
+
+    item = reader.http_cache.get(url)
+    assert item is not None
+    assert item.body == text
+    assert item.etag or item.last_modified
+
+    # the second request is conditional, and the cached body is reused
+    assert reader.read(url) == text
+    assert reader.responses[1].status_code == 304
+    assert reader.responses[1].request.headers.get("If-None-Match") == item.etag
+
+
+def test_http_cache_ttl(tmp_path):
+    url = f"{BASE_URL}/timeline-1.json"
+    reader = RecordingHTTPDataReader(HTTPCache(tmp_path, ttl=60))
+
+    text = reader.read(url)
+    assert reader.read(url) == text
+    assert len(reader.responses) == 1
+
+
+def test_http_cache_offline(tmp_path):
+    url = f"{BASE_URL}/timeline-1.json"
+    text = RecordingHTTPDataReader(HTTPCache(tmp_path)).read(url)
+
+    reader = RecordingHTTPDataReader(HTTPCache(tmp_path, offline=True))
+    assert reader.read(url) == text
+
+    with pytest.raises(FailedRequestError):
+        reader.read(f"{BASE_URL}/missing-file.json")
+    assert reader.responses == []
+
+
+class NoValidatorsHTTPDataReader(RecordingHTTPDataReader):
+    def get(self, url, headers=None):
+        response = httpx.Response(
+            200, text="[1, 2, 3]", request=httpx.Request("GET", url, headers=headers)
+        )
+        self.responses.append(response)
+        return response
+
+
+def test_http_cache_stores_responses_without_validators(tmp_path):
+    url = f"{BASE_URL}/no-validators.json"
+    reader = NoValidatorsHTTPDataReader(HTTPCache(tmp_path))
+
+    assert reader.read(url) == "[1, 2, 3]"
+    item = reader.http_cache.get(url)
+    assert item is not None
+    assert item.body == "[1, 2, 3]"
+
+    # stale responses without validators are requested again, unconditionally
+    assert reader.read(url) == "[1, 2, 3]"
+    assert len(reader.responses) == 2
+    assert "If-None-Match" not in reader.responses[1].request.headers
+    assert "If-Modified-Since" not in reader.responses[1].request.headers
+
+    reader = RecordingHTTPDataReader(HTTPCache(tmp_path, offline=True))
+    assert reader.read(url) == "[1, 2, 3]"
+    assert reader.responses == []
+
+
+def test_http_cache_offline_miss_is_rendered_as_error(tmp_path, monkeypatch):
+    monkeypatch.setattr(HTTPDataReader, "http_cache", HTTPCache(tmp_path, offline=True))
+    clear_prefetched()
+
+    html = markdown.markdown(
+        f"[timeline({BASE_URL}/timeline-1.json)]",
+        extensions=[TimelineExtension()],
+    )
+    assert '<div class="nt-error">' in html
+    assert "offline mode is on" in html
+
+
+def test_prefetch_with_http_cache(tmp_path, monkeypatch):
+    url = f"{BASE_URL}/timeline-1.json"
+    text = RecordingHTTPDataReader(HTTPCache(tmp_path)).read(url)
+
+    monkeypatch.setattr(HTTPDataReader, "http_cache", HTTPCache(tmp_path, offline=True))
+    clear_prefetched()
+    assert prefetch([url, f"{BASE_URL}/missing-file.json"]) == {url: text}
+    clear_prefetched()
+
+
+def test_sources_plugin_http_cache(tmp_path):
+    default_cache = HTTPDataReader.http_cache
+    plugin = SourcesPlugin()
+    plugin.config = {"cache_dir": str(tmp_path), "cache_ttl": 30, "offline": False}
+
+    plugin.on_config({})
+    http_cache = HTTPDataReader.http_cache
+    assert http_cache is not None
+    assert http_cache.cache_dir == tmp_path
+    assert http_cache.ttl == 30
+
+    # the HTTP cache is configured only for the duration of the build
+    plugin.on_post_build(config={})
+    assert HTTPDataReader.http_cache is default_cache
+
+
+def test_prefetch_uses_the_client_of_the_reader(monkeypatch):
+    monkeypatch.setattr(HTTPDataReader, "http_cache", None)
+    requested = []
+
+    def handler(request):
+        requested.append(str(request.url))
+        return httpx.Response(200, text="[1]")
+
+    reader = HTTPDataReader()
+    reader.http_client = httpx.Client(transport=httpx.MockTransport(handler))
+    clear_prefetched()
+
+    assert prefetch(["https://example.com/one.json"], reader=reader) == {
+        "https://example.com/one.json": "[1]"
+    }
+    assert requested == ["https://example.com/one.json"]
+    clear_prefetched()
@@ -1,15 +1,35 @@
 import re
 import xml.etree.ElementTree as etree
+from datetime import date, datetime, timedelta, timezone
 from xml.etree.ElementTree import tostring as xml_to_str
 
 import markdown
 import pytest
 from markdown.blockparser import BlockParser
+from markdown.util import AtomicString
 
+from neoteroi.mkdocs.markdown.data import text
+from neoteroi.mkdocs.markdown.data.cache import (
+    TYPE_KEY,
+    ParseCache,
+    get_default_cache_dir,
+)
+from neoteroi.mkdocs.markdown.data.text import (
+    CSVParser,
+    RowsSelection,
+    TextParser,
+    detect_format,
+    get_parser,
+    register_parser,
+)
+from neoteroi.mkdocs.markdown.fragments import FragmentCache
 from neoteroi.mkdocs.markdown.processors import (
+    ClosingTagsIndex,
     EmbeddedBlockProcessor,
     SourceBlockProcessor,
+    TagsDispatcher,
     find_closing_fragment_index,
+    pop_to_index,
 )
 
 
@@ -94,6 +114,32 @@ def test_find_closing_fragment_index(pattern, blocks, expected_result):
     assert index == expected_result
 
 
+def test_pop_to_index():
+    items = ["1", "2", "3", "4"]
+    assert pop_to_index(items, 2) == ["1\n", "2\n", "3\n"]
+    assert items == ["4"]
+
+
+def test_closing_tags_index():
+    index = ClosingTagsIndex(re.compile("::/mock::"))
+    blocks = ["::mock::", "a", "::/mock::", "b", "::mock::", "c", "d\n::/mock::"]
+
+    assert index.find(blocks) == 2
+    pop_to_index(blocks, 2)
+    assert index.find(blocks) == 3
+
+    # blocks inserted at the start of the list, and a modified first block
+    blocks.insert(0, "e\n::/mock::")
+    assert index.find(blocks) == 0
+    blocks[0] = "e"
+    assert index.find(blocks) == 4
+
+    # blocks modified in other ways cause the index to be rebuilt
+    blocks[4] = "d"
+    assert index.find(blocks) == -1
+    assert index.find(["::/mock::"]) == 0
+
+
 def test_renders_courtesy_page_for_invalid_source():
     example = """
     [mock(./file-that-does-not-exist.json)]
@@ -171,3 +217,298 @@ def test_get_match():
 
     match = processor.get_match(processor.pattern, ["\n\n[mock(./foo.json)]", "\n"])
     assert match is not None
+
+
+@pytest.mark.parametrize(
+    "block,expected_tags",
+    [
+        ["Lorem ipsum dolor sit amet.", set()],
+        ["::mock:: format=yaml\n- a: 1", {("embedded", "mock")}],
+        ["  [mock(./example.yaml)]", {("source", "mock")}],
+        ["[mock json(./example.json)]", {("source", "mock")}],
+        ["[link](https://example.com) ::other::", set()],
+        [
+            "::mock-cards::\n::mock::",
+            {("embedded", "mock"), ("embedded", "mock-cards")},
+        ],
+        [
+            "[mock-cards(x)] and [mock(y)]",
+            {("source", "mock"), ("source", "mock-cards")},
+        ],
+    ],
+)
+def test_tags_dispatcher(block, expected_tags):
+    dispatcher = TagsDispatcher()
+    for kind in ("source", "embedded"):
+        dispatcher.register(kind, "mock")
+        dispatcher.register(kind, "mock-cards")
+
+    assert dispatcher.get_tags(block) == expected_tags
+
+
+def test_tags_dispatcher_shared_by_parser():
+    parser = BlockParser(markdown.Markdown())
+    embedded_processor = MockEmbeddedProcessor(parser)
+    source_processor = MockSourceBlockProcessor(parser)
+
+    dispatcher = TagsDispatcher.of(parser)
+    assert embedded_processor._tags is dispatcher
+    assert source_processor._tags is dispatcher
+
+    block = "::mock::\n- a: 1"
+    assert embedded_processor.test(None, block) is True
+    assert source_processor.test(None, block) is False
+    # the block is scanned once for all processors
+    assert dispatcher.get_tags(block) is dispatcher.get_tags(block)
+
+
+def test_parse_cache_returns_copies(monkeypatch):
+    processor = MockSourceBlockProcessor(BlockParser(markdown.Markdown()))
+    monkeypatch.setattr(processor, "parse_cache", ParseCache())
+    text = "- title: Example\n  items: [1, 2]\n"
+
+    obj = processor.parse(text, {})
+    obj[0]["title"] = "Modified"
+
+    assert processor.parse(text, {}) == [{"title": "Example", "items": [1, 2]}]
+    assert processor.parse(text, {}) is not processor.parse(text, {})
+    assert (processor.parse_cache.hits, processor.parse_cache.misses) == (3, 1)
+
+    # the parser choice is part of the key
+    assert processor.parse('{"a": 1}', {"json": True}) == {"a": 1}
+    assert processor.parse_cache.misses == 2
+
+
+def test_parse_cache_lru_eviction():
+    cache = ParseCache(max_size=2)
+    keys = [cache.get_key(str(i), "yaml") for i in range(3)]
+
+    for i, key in enumerate(keys):
+        cache.set(key, i)
+    cache.get(keys[1])
+
+    assert len(cache) == 2
+    assert cache.get(keys[0]) == (False, None)
+    assert cache.get(keys[1]) == (True, 1)
+    assert cache.get(keys[2]) == (True, 2)
+
+
+def test_parse_cache_disk_tier(tmp_path):
+    cache = ParseCache(cache_dir=tmp_path)
+    key = cache.get_key("a: 1", "yaml")
+    cache.set(key, {"a": 1})
+
+    # a new cache, e.g. in the next build, reads items stored on disk
+    assert ParseCache(cache_dir=tmp_path).get(key) == (True, {"a": 1})
+
+
+def test_parse_cache_json_values(tmp_path):
+    cache = ParseCache(cache_dir=tmp_path)
+    key = cache.get_key("example", "yaml")
+    value = {
+        "date": date(2022, 10, 4),
+        "time": datetime(2022, 10, 4, 10, tzinfo=timezone(timedelta(hours=2))),
+        "items": [1, 2.5, None, True, "a"],
+        "pairs": (("a", 1),),
+        "set": {1, 2},
+        "binary": b"\x00\x01",
+        1: "key that is not a string",
+        TYPE_KEY: "key used to describe types",
+    }
+    cache.set(key, value)
+
+    assert [path.suffix for path in tmp_path.iterdir()] == [".json"]
+    assert ParseCache(cache_dir=tmp_path).get(key) == (True, value)
+
+
+def test_parse_cache_does_not_store_other_objects(tmp_path):
+    cache = ParseCache(cache_dir=tmp_path)
+    key = cache.get_key("example", "custom")
+    cache.set(key, [object()])
+
+    assert cache.get(key) == (False, None)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_default_cache_dir_read_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEOTEROI_CACHE_DIR", str(tmp_path))
+    assert get_default_cache_dir("parse") == tmp_path / "parse"
+
+    monkeypatch.delenv("NEOTEROI_CACHE_DIR")
+    assert get_default_cache_dir("parse") is None
+
+
+def test_fragment_cache_grafts_copies(monkeypatch):
+    processor = MockEmbeddedProcessor(BlockParser(markdown.Markdown()))
+    monkeypatch.setattr(processor, "fragment_cache", FragmentCache())
+    text = "- title: Example\n"
+
+    first = etree.Element("div")
+    processor.render(first, text, {"class": "a"})
+    assert processor.last_obj == [{"title": "Example"}]
+
+    processor.last_obj = None
+    second = etree.Element("div")
+    processor.render(second, text, {"class": "a"})
+
+    # the fragment is not built again, and a new copy of the elements is grafted
+    assert processor.last_obj is None
+    assert xml_to_str(second) == xml_to_str(first)
+    assert second[0] is not first[0]
+    assert processor.fragment_cache.hits == 1
+
+    # properties are part of the key
+    processor.render(etree.Element("div"), text, {"class": "b"})
+    assert processor.last_obj == [{"title": "Example"}]
+
+
+def test_fragment_cache_ignores_failures(monkeypatch):
+    processor = MockEmbeddedProcessor(BlockParser(markdown.Markdown()))
+    monkeypatch.setattr(processor, "fragment_cache", FragmentCache())
+
+    processor.render(etree.Element("div"), "1", {})
+    assert len(processor.fragment_cache) == 0
+
+
+def test_fragment_cache_memory_bound_and_disk_tier(tmp_path):
+    cache = FragmentCache(cache_dir=tmp_path, max_bytes=200)
+    keys = [cache.get_fragment_key("mock", str(i), {}, {}) for i in range(3)]
+
+    for i, key in enumerate(keys):
+        element = etree.Element("p", {"class": "nt-mock"})
+        element.text = "x" * 100 + str(i)
+        cache.set(key, [element])
+
+    assert len(cache) == 1
+
+    # a new cache, e.g. in the next build, reads fragments stored on disk; the disk
+    # tier is bounded by the same size, deleting the least recently used files
+    found, elements = FragmentCache(cache_dir=tmp_path).get(keys[2])
+    assert found is True
+    assert elements[0].text == "x" * 100 + "2"
+    assert FragmentCache(cache_dir=tmp_path).get(keys[0]) == (False, None)
+    assert len(list(tmp_path.iterdir())) == 1
+
+
+def test_fragment_cache_preserves_atomic_strings():
+    cache = FragmentCache()
+    key = cache.get_fragment_key("mock", "text", {}, {})
+    element = etree.Element("div")
+    etree.SubElement(element, "code").text = AtomicString("*a*")
+    etree.SubElement(element, "p").text = "*b*"
+
+    cache.set(key, [element])
+    assert element.find("code").attrib == {}
+
+    found, elements = cache.get(key)
+    assert found is True
+    assert isinstance(elements[0].find("code").text, AtomicString)
+    assert not isinstance(elements[0].find("p").text, AtomicString)
+
+
+@pytest.mark.parametrize(
+    "value,source,expected_format",
+    [
+        ["a: 1", "./example.yaml", "yaml"],
+        ["a: 1", "./example.YML", "yaml"],
+        ["{}", "https://example.com/data.csv?version=1", "csv"],
+        ['{"a": 1}', None, "json"],
+        ["  \n[1, 2]", "", "json"],
+        ["- a: 1", None, None],
+        ["", None, None],
+        [" \t\n", None, None],
+        ["a,b\n1,2", "./example.txt", None],
+    ],
+)
+def test_detect_format(value, source, expected_format):
+    assert detect_format(value, source) == expected_format
+
+
+@pytest.mark.parametrize(
+    "value,props,expected_result",
+    [
+        ["a,b\n1,2", {"__source": "./example.csv"}, [{"a": "1", "b": "2"}]],
+        ['[{"a": 1}]', {}, [{"a": 1}]],
+        # YAML flow sequences are detected as JSON, YAML is used as fallback
+        ["[a, b]", {}, ["a", "b"]],
+    ],
+)
+def test_parse_detects_format(value, props, expected_result):
+    processor = MockEmbeddedProcessor(BlockParser(markdown.Markdown()))
+
+    assert processor.parse(value, props) == expected_result
+
+
+def test_register_parser(monkeypatch):
+    class TOMLLikeParser(TextParser):
+        def parse(self, text):
+            return dict(line.split(" = ") for line in text.splitlines())
+
+    monkeypatch.setattr(text, "_parsers", dict(text._parsers))
+    monkeypatch.setattr(text, "_extensions", dict(text._extensions))
+    register_parser("toml", TOMLLikeParser(), [".toml"])
+
+    assert detect_format("a = 1", "example.toml") == "toml"
+    assert isinstance(get_parser("csv"), CSVParser)
+
+    processor = MockEmbeddedProcessor(BlockParser(markdown.Markdown()))
+    assert processor.parse("a = 1", {"__source": "example.toml"}) == {"a": "1"}
+
+
+CSV_TEXT = "title,url,notes\nA,a.html,x\n\nB,b.html\nC,c.html,z,extra\nD,d.html,w\n"
+
+
+def test_csv_iter_rows_matches_dict_reader():
+    parser = CSVParser()
+    assert list(parser.iter_rows(CSV_TEXT)) == parser.parse(CSV_TEXT)
+
+
+@pytest.mark.parametrize(
+    "props,expected_result",
+    [
+        [{"limit": "2"}, ["A", "B"]],
+        [{"offset": "1", "limit": "2"}, ["B", "C"]],
+        [{"offset": "3"}, ["D"]],
+        [{"limit": "0"}, []],
+    ],
+)
+def test_rows_selection(props, expected_result):
+    selection = RowsSelection.from_props(props)
+    assert selection is not None
+
+    rows = list(CSVParser().iter_rows(CSV_TEXT, selection))
+    assert [row["title"] for row in rows] == expected_result
+    assert selection.apply(CSVParser().parse(CSV_TEXT)) == rows
+
+
+def test_csv_iter_rows_is_lazy_and_projects_columns():
+    rows = CSVParser().iter_rows(
+        CSV_TEXT, RowsSelection(columns=["url", "title", "missing"])
+    )
+    assert next(rows) == {"url": "a.html", "title": "A"}
+    assert next(rows) == {"url": "b.html", "title": "B"}
+
+
+@pytest.mark.parametrize(
+    "props", [{"limit": "ten"}, {"offset": "-1"}, {"limit": True}, {"offset": False}]
+)
+def test_rows_selection_invalid_props(props):
+    with pytest.raises(ValueError):
+        RowsSelection.from_props(props)
+
+
+def test_parse_with_rows_selection():
+    processor = MockSourceBlockProcessor(BlockParser(markdown.Markdown()))
+
+    assert processor.parse(
+        CSV_TEXT, {"__source": "./links.csv", "limit": "1", "columns": "title,url"}
+    ) == [{"title": "A", "url": "a.html"}]
+    assert processor.parse(
+        '[{"a": 1, "b": 2}, {"a": 3, "b": 4}]', {"offset": "1", "columns": "b"}
+    ) == [{"b": 4}]
+    # the first item of a list of lists contains headers, and is always kept
+    assert processor.parse(
+        '[["a", "b"], [1, 2], [3, 4], [5, 6]]', {"offset": "1", "limit": "1"}
+    ) == [["a", "b"], [3, 4]]
+    # selections do not apply to objects that are not lists
+    assert processor.parse('{"a": 1}', {"limit": "1"}) == {"a": 1}